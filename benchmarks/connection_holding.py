@@ -0,0 +1,73 @@
+"""
+Compare holding a pooled connection for the whole request with borrowing
+one per query through ``ConnectionProvider``.
+
+Each simulated request runs one short query plus non-database work (auth,
+hashing, serialization, a slow client) that used to happen while the
+connection was checked out.
+
+    DATABASE_URL=postgresql://... python -m benchmarks.connection_holding
+"""
+import argparse
+import asyncio
+import time
+
+from src.core.database import PoolStats, database
+from src.core.settings import settings
+
+QUERY = "SELECT pg_sleep($1)"
+
+
+async def held_request(query_seconds: float, work_seconds: float) -> None:
+    async with database.get_connection() as connection:
+        await asyncio.sleep(work_seconds / 2)
+        await connection.fetchval(QUERY, query_seconds)
+        await asyncio.sleep(work_seconds / 2)
+
+
+async def lazy_request(query_seconds: float, work_seconds: float) -> None:
+    provider = database.provider()
+    await asyncio.sleep(work_seconds / 2)
+    await provider.fetchval(QUERY, query_seconds)
+    await asyncio.sleep(work_seconds / 2)
+
+
+async def run(handler, requests: int, concurrency: int, query_ms: float, work_ms: float) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await handler(query_ms / 1000, work_ms / 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return time.perf_counter() - started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--query-ms", type=float, default=2.0)
+    parser.add_argument("--work-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    await database.connect()
+    try:
+        pool_size = settings.DB_POOL_MAX_SIZE
+        print(f"pool max_size={pool_size}, {args.requests} requests, "
+              f"concurrency={args.concurrency}, query={args.query_ms}ms, other work={args.work_ms}ms")
+
+        for name, handler in (("held per request", held_request), ("lazy per query", lazy_request)):
+            database._stats[database.pool] = PoolStats("primary")
+            elapsed = await run(handler, args.requests, args.concurrency, args.query_ms, args.work_ms)
+            throughput = args.requests / elapsed
+            p99 = database.pool_stats()[0]["acquire_latency"]["p99_ms"]
+            print(f"{name:>17}: {elapsed:6.2f}s  {throughput:8.1f} req/s  "
+                  f"{throughput / pool_size:7.1f} req/s per connection  acquire p99 {p99}ms")
+    finally:
+        await database.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,172 @@
+"""
+Peak memory of parsing and validating a large import file, streaming versus
+reading the whole upload into memory first.
+
+Generates a synthetic file (1 GB by default), then runs each mode in its own
+process and reports peak RSS. With --database the streaming run also loads
+the rows through ImportService inside a rolled-back transaction.
+
+    python -m benchmarks.import_memory --size-mb 1024 --format json
+    python -m benchmarks.import_memory --size-mb 200 --format csv --legacy
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+GENRES = ["Fiction", "Mystery", "Fantasy", "Romance", "Thriller"]
+
+
+def generate(path: str, size_mb: int, file_format: str) -> int:
+    target = size_mb * 1024 * 1024
+    rows = 0
+    with open(path, "w", encoding="utf-8", newline="") as out:
+        writer = None
+        if file_format == "json":
+            out.write('{"books": [\n')
+        else:
+            writer = csv.DictWriter(
+                out, fieldnames=["title", "content", "description", "published_year", "genre"]
+            )
+            writer.writeheader()
+
+        while out.tell() < target:
+            row = {
+                "title": f"Synthetic book {rows}",
+                "content": f"Generated content for synthetic book number {rows}. " * 4,
+                "description": "Memory benchmark row",
+                "published_year": str(1900 + rows % 120),
+                "genre": GENRES[rows % len(GENRES)],
+            }
+            if file_format == "json":
+                out.write(("," if rows else "") + json.dumps(row) + "\n")
+            else:
+                writer.writerow(row)
+            rows += 1
+
+        if file_format == "json":
+            out.write("]}\n")
+    return rows
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+CONTENT_TYPES = {"json": "application/json", "csv": "text/csv"}
+
+
+async def validate(rows) -> int:
+    from src.core.settings import settings
+    from src.services.import_validation import validate_in_pool
+
+    records, _ = await validate_in_pool(
+        rows, settings.IMPORT_VALIDATION_WORKERS, settings.IMPORT_VALIDATION_CHUNK_SIZE
+    )
+    return len(records)
+
+
+async def run_stream(path: str, file_format: str, with_database: bool) -> None:
+    from src.services.import_parsers import open_rows
+    from src.services.import_service import ImportService
+
+    with open(path, "rb") as stream:
+        rows = open_rows(stream, CONTENT_TYPES[file_format], path)
+        if not with_database:
+            count = 0
+            offset = 0
+            async for batch in ImportService.read_batches(rows):
+                count += await validate(list(enumerate(batch, start=offset + 1)))
+                offset += len(batch)
+        else:
+            from src.core.database import database
+
+            class Rollback(Exception):
+                pass
+
+            await database.connect()
+            provider = database.provider()
+            try:
+                async with provider.transaction():
+                    service = ImportService(provider)
+                    errors = []
+                    count = 0
+                    offset = 0
+                    async for batch in service.read_batches(rows):
+                        counts = await service.import_batch(batch, offset, errors)
+                        count += counts["inserted"] + counts["updated"]
+                        offset += len(batch)
+                    raise Rollback()
+            except Rollback:
+                pass
+            finally:
+                await database.disconnect()
+    print(f"rows={count}")
+
+
+async def run_legacy(path: str, file_format: str) -> None:
+    with open(path, "rb") as stream:
+        content = stream.read()
+    text = content.decode("utf-8")
+    if file_format == "json":
+        data = json.loads(text)
+        rows = data if isinstance(data, list) else data.get("books", [])
+    else:
+        rows = [dict(row) for row in csv.DictReader(io.StringIO(text))]
+
+    count = await validate(list(enumerate(rows, start=1)))
+    print(f"rows={count}")
+
+
+def child(args) -> None:
+    started = time.perf_counter()
+    if args.mode == "stream":
+        asyncio.run(run_stream(args.file, args.format, args.database))
+    else:
+        asyncio.run(run_legacy(args.file, args.format))
+    print(f"seconds={time.perf_counter() - started:.1f}")
+    print(f"peak_rss_mb={peak_rss_mb():.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--format", choices=["json", "csv"], default="json")
+    parser.add_argument("--legacy", action="store_true",
+                        help="also measure read-everything parsing (needs several times the file size in RAM)")
+    parser.add_argument("--database", action="store_true",
+                        help="load rows into DATABASE_URL (rolled back) instead of only validating")
+    parser.add_argument("--mode", choices=["stream", "legacy"], help=argparse.SUPPRESS)
+    parser.add_argument("--file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        child(args)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, f"books.{args.format}")
+        rows = generate(path, args.size_mb, args.format)
+        print(f"generated {os.path.getsize(path) / 1024 / 1024:.0f} MB, {rows} rows ({args.format})")
+
+        modes = ["stream"] + (["legacy"] if args.legacy else [])
+        for mode in modes:
+            command = [sys.executable, "-m", "benchmarks.import_memory", "--mode", mode,
+                       "--file", path, "--format", args.format]
+            if args.database:
+                command.append("--database")
+            output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+            stats = dict(line.split("=", 1) for line in output.split())
+            print(f"{mode:>7}: {stats['rows']} rows in {stats['seconds']}s, peak RSS {stats['peak_rss_mb']} MB")
+
+
+if __name__ == "__main__":
+    main()
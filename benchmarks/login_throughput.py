@@ -0,0 +1,83 @@
+"""
+Login throughput and event-loop responsiveness with bcrypt run inline on
+the event loop versus on the bounded password hashing pool.
+
+Each simulated login verifies a password against a bcrypt hash of cost
+``BCRYPT_ROUNDS``; meanwhile a probe measures how long other requests on the
+same worker would stall. No database is needed.
+
+    DATABASE_URL=... python -m benchmarks.login_throughput --logins 40 --concurrency 20
+"""
+import argparse
+import asyncio
+import time
+
+from src.core.metrics import latency_percentiles
+from src.core.security import password_hasher, pwd_context
+from src.core.settings import settings
+
+PASSWORD = "correct horse battery staple"
+
+
+async def inline_login(hashed_password: str) -> None:
+    pwd_context.verify_and_update(PASSWORD, hashed_password)
+
+
+async def pooled_login(hashed_password: str) -> None:
+    await password_hasher.verify_and_update(PASSWORD, hashed_password)
+
+
+async def probe_loop_lag(lags, interval: float = 0.01) -> None:
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+
+async def measure(name: str, login, hashed_password: str, logins: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    lags = []
+
+    async def one():
+        async with semaphore:
+            await login(hashed_password)
+
+    probe = asyncio.create_task(probe_loop_lag(lags))
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    # Let the probe record the stall it was stuck in
+    await asyncio.sleep(0.02)
+    probe.cancel()
+
+    lag = latency_percentiles(lags)
+    print(f"{name:>7}: {logins / elapsed:6.1f} logins/s, "
+          f"loop lag p50 {lag['p50_ms']:7.1f}ms p99 {lag['p99_ms']:7.1f}ms "
+          f"max {lag['max_ms']:7.1f}ms")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    hashed_password = pwd_context.hash(PASSWORD)
+    print(f"bcrypt rounds={settings.BCRYPT_ROUNDS}, "
+          f"hash workers={settings.PASSWORD_HASH_WORKERS}, {args.logins} logins, "
+          f"concurrency={args.concurrency}")
+
+    try:
+        await measure("inline", inline_login, hashed_password, args.logins, args.concurrency)
+        await measure("pool", pooled_login, hashed_password, args.logins, args.concurrency)
+        stats = password_hasher.stats()
+        print(f"pool queue wait p50 {stats['queue_wait']['p50_ms']}ms, "
+              f"p99 {stats['queue_wait']['p99_ms']}ms; "
+              f"hash time p50 {stats['hash_time']['p50_ms']}ms")
+    finally:
+        password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+"""
+Memory and per-request cost of the rate limiter when a million distinct
+client IPs show up, as in a scan. The run spans two windows, so the limiter
+holds its worst case: ``max_keys`` keys in each. The previous
+list-of-timestamps-per-IP limiter is measured alongside for comparison.
+Exits non-zero if the limiter's memory exceeds --max-mb.
+
+    DATABASE_URL=... python -m benchmarks.rate_limiter_memory --clients 1000000 --max-keys 100000
+"""
+import argparse
+import ipaddress
+import sys
+import time
+import tracemalloc
+
+from src.core.rate_limit import SlidingWindowCounter
+
+
+class ListLimiter:
+    """The previous algorithm: one list of request timestamps per IP, never evicted"""
+
+    def __init__(self, limit: int, window: int):
+        self.limit = limit
+        self.window = window
+        self.requests = {}
+
+    def hit(self, key: str) -> bool:
+        now = int(time.time())
+        timestamps = [ts for ts in self.requests.get(key, []) if ts > now - self.window]
+        self.requests[key] = timestamps
+        if len(timestamps) >= self.limit:
+            return False
+        timestamps.append(now)
+        return True
+
+
+HEAVY_HITTER = "203.0.113.7"
+
+
+def client_ips(count: int):
+    """
+    Fresh address strings, as each request brings its own; every tenth
+    request comes from one heavy hitter that must stay limited
+    """
+    first = int(ipaddress.IPv4Address("10.0.0.0"))
+    for offset in range(count):
+        if offset % 10 == 0:
+            yield HEAVY_HITTER
+        else:
+            yield str(ipaddress.IPv4Address(first + offset))
+
+
+class HalfwayClock:
+    """Steps into the next window halfway through the run, so both windows hold keys"""
+
+    def __init__(self, clients: int, window: float):
+        self.clients = clients
+        self.window = window
+        self.calls = 0
+
+    def __call__(self) -> float:
+        self.calls += 1
+        return 0.0 if self.calls <= self.clients // 2 else self.window
+
+
+def measure(name: str, make_limiter, clients: int) -> float:
+    ips = list(client_ips(clients))
+    limiter = make_limiter()
+    started = time.perf_counter()
+    allowed = heavy_allowed = 0
+    for ip in ips:
+        if limiter.hit(ip):
+            allowed += 1
+            heavy_allowed += ip == HEAVY_HITTER
+    elapsed = time.perf_counter() - started
+    del ips, limiter
+
+    # Memory is traced on a second run, where only strings the limiter
+    # keeps stay allocated
+    tracemalloc.start()
+    limiter = make_limiter()
+    for ip in client_ips(clients):
+        limiter.hit(ip)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:>15}: {elapsed / clients * 1e6:5.2f}us/request, {allowed} allowed "
+          f"({heavy_allowed} from the heavy hitter), "
+          f"{current / 2**20:6.1f}MB held, {peak / 2**20:6.1f}MB peak")
+    return peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=1_000_000)
+    parser.add_argument("--max-keys", type=int, default=100_000)
+    parser.add_argument("--max-mb", type=float, default=64)
+    args = parser.parse_args()
+
+    print(f"{args.clients} distinct client IPs, max_keys={args.max_keys}")
+
+    peak_mb = measure(
+        "sliding window",
+        lambda: SlidingWindowCounter(
+            10, 60, args.max_keys, clock=HalfwayClock(args.clients, 60)
+        ),
+        args.clients,
+    )
+    measure("timestamp lists", lambda: ListLimiter(10, 60), args.clients)
+
+    if peak_mb > args.max_mb:
+        print(f"FAIL: sliding window peaked at {peak_mb:.1f}MB, cap is {args.max_mb}MB")
+        sys.exit(1)
+    print(f"OK: sliding window stayed under {args.max_mb}MB")
+
+
+if __name__ == "__main__":
+    main()
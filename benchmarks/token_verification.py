@@ -0,0 +1,50 @@
+"""
+Cost of verifying an access token with each JWT backend, cold (full decode
+and signature check) and through the verified-token cache, as paid by every
+authenticated request. No database is needed.
+
+    DATABASE_URL=... python -m benchmarks.token_verification --iterations 20000
+"""
+import argparse
+import time
+from uuid import uuid4
+
+from src.core import security
+from src.core.jwt_backends import BACKENDS, get_backend
+
+
+def per_call_us(func, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    claims = {"sub": str(uuid4()), "username": "reader"}
+    for name in BACKENDS:
+        try:
+            backend = get_backend(name)
+        except ValueError as e:
+            print(f"{name:>6}: skipped ({e})")
+            continue
+
+        security.jwt_backend = backend
+        token = security.create_access_token(claims)
+
+        def cold():
+            security.token_cache.clear()
+            security.verify_token(token)
+
+        security.token_cache.clear()
+        cold_us = per_call_us(cold, args.iterations)
+        cached_us = per_call_us(lambda: security.verify_token(token), args.iterations)
+        print(f"{name:>6}: verify {cold_us:6.1f}us cold, {cached_us:5.2f}us cached")
+
+
+if __name__ == "__main__":
+    main()
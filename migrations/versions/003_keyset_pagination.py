@@ -0,0 +1,23 @@
+from alembic import op
+
+revision = "003_keyset_pagination"
+down_revision = "002_add_users_table"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.execute("""
+        CREATE INDEX books_title_id_idx ON books (title, id);
+        CREATE INDEX books_year_id_idx ON books (published_year, id);
+        CREATE INDEX books_author_id_idx ON books (author_id);
+
+        CREATE INDEX authors_name_id_idx ON authors (last_name, first_name, id);
+    """)
+
+def downgrade():
+    op.execute("""
+        DROP INDEX IF EXISTS authors_name_id_idx;
+        DROP INDEX IF EXISTS books_author_id_idx;
+        DROP INDEX IF EXISTS books_year_id_idx;
+        DROP INDEX IF EXISTS books_title_id_idx;
+    """)
@@ -0,0 +1,68 @@
+from alembic import op
+
+revision = "004_books_search"
+down_revision = "003_keyset_pagination"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.execute("""
+        ALTER TABLE books ADD COLUMN search_vector tsvector;
+
+        CREATE FUNCTION books_search_vector(
+            p_title TEXT, p_description TEXT, p_content TEXT, p_author_id UUID
+        ) RETURNS tsvector AS $$
+            SELECT setweight(to_tsvector('english', coalesce(p_title, '')), 'A')
+                || setweight(to_tsvector('english', coalesce(
+                       (SELECT first_name || ' ' || last_name FROM authors WHERE id = p_author_id),
+                       ''
+                   )), 'B')
+                || setweight(to_tsvector('english', coalesce(p_description, '')), 'C')
+                || setweight(to_tsvector('english', coalesce(p_content, '')), 'D')
+        $$ LANGUAGE sql STABLE;
+
+        CREATE FUNCTION books_search_vector_refresh() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := books_search_vector(
+                NEW.title, NEW.description, NEW.content, NEW.author_id
+            );
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER books_search_vector_trg
+            BEFORE INSERT OR UPDATE OF title, description, content, author_id ON books
+            FOR EACH ROW EXECUTE FUNCTION books_search_vector_refresh();
+
+        CREATE FUNCTION authors_search_vector_refresh() RETURNS trigger AS $$
+        BEGIN
+            UPDATE books
+            SET search_vector = books_search_vector(title, description, content, author_id)
+            WHERE author_id = NEW.id;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER authors_search_vector_trg
+            AFTER UPDATE OF first_name, last_name ON authors
+            FOR EACH ROW
+            WHEN (OLD.first_name IS DISTINCT FROM NEW.first_name
+                  OR OLD.last_name IS DISTINCT FROM NEW.last_name)
+            EXECUTE FUNCTION authors_search_vector_refresh();
+
+        UPDATE books
+        SET search_vector = books_search_vector(title, description, content, author_id);
+
+        CREATE INDEX books_search_vector_idx ON books USING gin (search_vector);
+    """)
+
+def downgrade():
+    op.execute("""
+        DROP TRIGGER IF EXISTS authors_search_vector_trg ON authors;
+        DROP TRIGGER IF EXISTS books_search_vector_trg ON books;
+        DROP FUNCTION IF EXISTS authors_search_vector_refresh();
+        DROP FUNCTION IF EXISTS books_search_vector_refresh();
+        DROP INDEX IF EXISTS books_search_vector_idx;
+        ALTER TABLE books DROP COLUMN IF EXISTS search_vector;
+        DROP FUNCTION IF EXISTS books_search_vector(TEXT, TEXT, TEXT, UUID);
+    """)
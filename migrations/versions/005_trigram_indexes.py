@@ -0,0 +1,26 @@
+from alembic import op
+
+revision = "005_trigram_indexes"
+down_revision = "004_books_search"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.execute("""
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+        CREATE INDEX books_title_trgm_idx ON books USING gin (title gin_trgm_ops);
+        CREATE INDEX authors_first_name_trgm_idx ON authors USING gin (first_name gin_trgm_ops);
+        CREATE INDEX authors_last_name_trgm_idx ON authors USING gin (last_name gin_trgm_ops);
+        CREATE INDEX authors_full_name_trgm_idx
+            ON authors USING gin (LOWER(first_name || ' ' || last_name) gin_trgm_ops);
+    """)
+
+def downgrade():
+    op.execute("""
+        DROP INDEX IF EXISTS authors_full_name_trgm_idx;
+        DROP INDEX IF EXISTS authors_last_name_trgm_idx;
+        DROP INDEX IF EXISTS authors_first_name_trgm_idx;
+        DROP INDEX IF EXISTS books_title_trgm_idx;
+        DROP EXTENSION IF EXISTS pg_trgm;
+    """)
@@ -0,0 +1,35 @@
+from alembic import op
+
+revision = "006_import_jobs"
+down_revision = "005_trigram_indexes"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.execute("""
+        CREATE TABLE import_jobs (
+            id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+            status VARCHAR(20) NOT NULL DEFAULT 'pending',
+            filename VARCHAR(255),
+            content_type VARCHAR(100) NOT NULL,
+            file_path TEXT NOT NULL,
+            created_by UUID REFERENCES users(id) ON DELETE SET NULL,
+            last_committed_row INTEGER NOT NULL DEFAULT 0,
+            success_count INTEGER NOT NULL DEFAULT 0,
+            error_count INTEGER NOT NULL DEFAULT 0,
+            errors JSONB NOT NULL DEFAULT '[]',
+            error_message TEXT,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            started_at TIMESTAMPTZ,
+            finished_at TIMESTAMPTZ,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CONSTRAINT chk_import_jobs_status
+                CHECK (status IN ('pending', 'running', 'completed', 'failed'))
+        );
+
+        CREATE INDEX import_jobs_unfinished_idx ON import_jobs (created_at)
+            WHERE status IN ('pending', 'running');
+    """)
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS import_jobs;")
@@ -0,0 +1,79 @@
+from alembic import op
+
+revision = "007_import_fingerprints"
+down_revision = "006_import_jobs"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.execute("""
+        ALTER TABLE books
+            ADD COLUMN import_key UUID,
+            ADD COLUMN import_fingerprint UUID;
+
+        CREATE FUNCTION book_import_key(title TEXT, author_id UUID, published_year INTEGER)
+        RETURNS UUID
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE
+        AS $$
+            SELECT md5(
+                lower(title)
+                || '|' || COALESCE(author_id::text, '')
+                || '|' || COALESCE(published_year::text, '')
+            )::uuid
+        $$;
+
+        CREATE FUNCTION book_import_fingerprint(
+            title TEXT, content TEXT, description TEXT,
+            published_year INTEGER, genre TEXT, author_id UUID
+        )
+        RETURNS UUID
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE
+        AS $$
+            SELECT md5(ROW(title, content, description, published_year, genre, author_id)::text)::uuid
+        $$;
+
+        -- Key every existing book so the first re-import matches the catalog;
+        -- of books that already share a key only the oldest gets it
+        UPDATE books
+        SET import_key = CASE WHEN keyed.rank = 1 THEN keyed.import_key END,
+            import_fingerprint = book_import_fingerprint(
+                books.title, books.content, books.description,
+                books.published_year, books.genre, books.author_id
+            )
+        FROM (
+            SELECT id,
+                   book_import_key(title, author_id, published_year) AS import_key,
+                   row_number() OVER (
+                       PARTITION BY book_import_key(title, author_id, published_year)
+                       ORDER BY created_at, id
+                   ) AS rank
+            FROM books
+        ) keyed
+        WHERE books.id = keyed.id;
+
+        CREATE UNIQUE INDEX books_import_key_idx ON books (import_key)
+            WHERE import_key IS NOT NULL;
+
+        ALTER TABLE import_jobs
+            ADD COLUMN mode VARCHAR(10) NOT NULL DEFAULT 'skip',
+            ADD COLUMN updated_count INTEGER NOT NULL DEFAULT 0,
+            ADD COLUMN skipped_count INTEGER NOT NULL DEFAULT 0,
+            ADD CONSTRAINT chk_import_jobs_mode CHECK (mode IN ('skip', 'upsert'));
+    """)
+
+def downgrade():
+    op.execute("""
+        ALTER TABLE import_jobs
+            DROP CONSTRAINT IF EXISTS chk_import_jobs_mode,
+            DROP COLUMN IF EXISTS skipped_count,
+            DROP COLUMN IF EXISTS updated_count,
+            DROP COLUMN IF EXISTS mode;
+
+        DROP INDEX IF EXISTS books_import_key_idx;
+        DROP FUNCTION IF EXISTS book_import_fingerprint(TEXT, TEXT, TEXT, INTEGER, TEXT, UUID);
+        DROP FUNCTION IF EXISTS book_import_key(TEXT, UUID, INTEGER);
+
+        ALTER TABLE books
+            DROP COLUMN IF EXISTS import_fingerprint,
+            DROP COLUMN IF EXISTS import_key;
+    """)
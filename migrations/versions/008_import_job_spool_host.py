@@ -0,0 +1,16 @@
+from alembic import op
+
+revision = "008_import_job_spool_host"
+down_revision = "007_import_fingerprints"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.execute("""
+        ALTER TABLE import_jobs ADD COLUMN spool_host TEXT;
+    """)
+
+def downgrade():
+    op.execute("""
+        ALTER TABLE import_jobs DROP COLUMN IF EXISTS spool_host;
+    """)
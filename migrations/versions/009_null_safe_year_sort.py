@@ -0,0 +1,18 @@
+from alembic import op
+
+revision = "009_null_safe_year_sort"
+down_revision = "008_import_job_spool_host"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.execute("""
+        CREATE INDEX books_year_sort_idx ON books ((COALESCE(published_year, 2147483647)), id);
+        DROP INDEX IF EXISTS books_year_id_idx;
+    """)
+
+def downgrade():
+    op.execute("""
+        CREATE INDEX books_year_id_idx ON books (published_year, id);
+        DROP INDEX IF EXISTS books_year_sort_idx;
+    """)
@@ -1,8 +1,7 @@
 from fastapi import APIRouter, Depends, status
-import asyncpg
 
 from src.core.deps import get_current_user
-from src.core.database import get_db
+from src.core.database import ConnectionProvider, get_db
 from src.services.auth_service import AuthService
 from src.schemas.user import UserCreate, UserLogin, User, Token
 
@@ -11,7 +10,7 @@ router = APIRouter(prefix="/auth", tags=["authentication"])
 
 @router.post("/register", response_model=User, status_code=status.HTTP_201_CREATED)
 async def register_user(
-    user_data: UserCreate, connection: asyncpg.Connection = Depends(get_db)
+    user_data: UserCreate, connection: ConnectionProvider = Depends(get_db)
 ):
     """Register a new user"""
     service = AuthService(connection)
@@ -20,7 +19,7 @@ async def register_user(
 
 @router.post("/login", response_model=Token)
 async def login_user(
-    login_data: UserLogin, connection: asyncpg.Connection = Depends(get_db)
+    login_data: UserLogin, connection: ConnectionProvider = Depends(get_db)
 ):
     """Authenticate user and return JWT token"""
     service = AuthService(connection)
@@ -1,10 +1,10 @@
 from fastapi import APIRouter, Depends, Query, status
-import asyncpg
+from typing import Optional
 from uuid import UUID
-from src.core.database import get_db
+from src.core.database import ConnectionProvider, get_read_db, get_write_db
 from src.services.author_service import AuthorService
 from src.schemas.author import Author, AuthorCreate, AuthorUpdate
-from src.schemas.pagination import PaginatedResponse
+from src.schemas.pagination import CountMode, PaginatedResponse
 from src.core.deps import get_current_user
 
 router = APIRouter(prefix="/authors", tags=["authors"])
@@ -13,7 +13,7 @@ router = APIRouter(prefix="/authors", tags=["authors"])
 @router.post("/", response_model=Author, status_code=status.HTTP_201_CREATED)
 async def create_author(
     author_data: AuthorCreate,
-    connection: asyncpg.Connection = Depends(get_db),
+    connection: ConnectionProvider = Depends(get_write_db),
     current_user=Depends(get_current_user),
 ):
     """Create a new author"""
@@ -25,11 +25,17 @@ async def create_author(
 async def get_authors(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
-    connection: asyncpg.Connection = Depends(get_db),
+    cursor: Optional[str] = Query(
+        None, description="Keyset cursor from next_cursor/prev_cursor; overrides page"
+    ),
+    count: CountMode = Query(
+        CountMode.exact, description="Total count: exact, estimated or none"
+    ),
+    connection: ConnectionProvider = Depends(get_read_db),
 ):
     """Get all authors with pagination"""
     service = AuthorService(connection)
-    return await service.get_authors(page, size)
+    return await service.get_authors(page, size, cursor, count)
 
 
 @router.get("/search", response_model=PaginatedResponse[Author])
@@ -37,28 +43,19 @@ async def search_authors(
     q: str = Query(..., min_length=1, description="Search term"),
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
-    connection: asyncpg.Connection = Depends(get_db),
+    count: CountMode = Query(
+        CountMode.exact, description="Total count: exact, estimated or none"
+    ),
+    connection: ConnectionProvider = Depends(get_read_db),
 ):
     """Search authors by name"""
     service = AuthorService(connection)
-    offset = (page - 1) * size
-    authors = await service.author_repo.search(q, size, offset)
-    total = await service.author_repo.connection.fetchval(
-        "SELECT COUNT(*) FROM authors WHERE LOWER(first_name || ' ' || last_name) LIKE LOWER($1)",
-        f"%{q}%",
-    )
-
-    return PaginatedResponse(
-        items=[Author(**author) for author in authors],
-        total=total,
-        page=page,
-        size=size,
-    )
+    return await service.search_authors(q, page, size, count)
 
 
 @router.get("/{author_id}", response_model=Author)
 async def get_author_by_id(
-    author_id: UUID, connection: asyncpg.Connection = Depends(get_db)
+    author_id: UUID, connection: ConnectionProvider = Depends(get_read_db)
 ):
     """Get a specific author by ID"""
     service = AuthorService(connection)
@@ -69,7 +66,7 @@ async def get_author_by_id(
 async def update_author(
     author_id: UUID,
     author_data: AuthorUpdate,
-    connection: asyncpg.Connection = Depends(get_db),
+    connection: ConnectionProvider = Depends(get_write_db),
     current_user=Depends(get_current_user)
 ):
     """Update an author"""
@@ -80,7 +77,7 @@ async def update_author(
 @router.delete("/{author_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_author(
     author_id: UUID,
-    connection: asyncpg.Connection = Depends(get_db),
+    connection: ConnectionProvider = Depends(get_write_db),
     current_user=Depends(get_current_user),
 ):
     """Delete an author"""
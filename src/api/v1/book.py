@@ -1,58 +1,135 @@
-from fastapi import APIRouter, Depends, Query, status, UploadFile, File, HTTPException
-from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request, Response, status, UploadFile, File, HTTPException
+from fastapi.responses import StreamingResponse
+from src.core.responses import ClosingStreamingResponse
+from typing import List, Optional, Union
 from uuid import UUID
-import asyncpg
-from src.core.database import get_db
+from src.core.database import ConnectionProvider, get_db, get_read_db, get_write_db
 from src.core.deps import get_current_user
 from src.schemas.user import User
 from src.services.book_service import BookService
+from src.services.export_service import MEDIA_TYPES, ExportService, accepts_gzip
 from src.services.import_service import ImportService
+from src.services.import_jobs import import_job_runner, to_import_job
+from src.repositories.import_job import ImportJobRepository
+from src.schemas.import_job import ImportJob
 from src.schemas.book import (
     Book,
     BookCreate,
     BookUpdate,
     BookFilters,
+    BookSearchResult,
     BulkImportResponse,
+    ExportFormat,
+    Genre,
+    ImportMode,
 )
-from src.schemas.pagination import PaginatedResponse
+from src.schemas.pagination import CountMode, PaginatedResponse
 
 router = APIRouter(prefix="/books", tags=["books"])
 
 
 @router.post("/", response_model=Book, status_code=status.HTTP_201_CREATED)
 async def create_book(
-    book_data: BookCreate, connection: asyncpg.Connection = Depends(get_db),
+    book_data: BookCreate, connection: ConnectionProvider = Depends(get_write_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Create a new book"""
+    """
+    Create a new book. Creating a book with the same title, author and year
+    as an existing one is allowed and makes a second copy; only the first
+    copy is matched by later imports.
+    """
     service = BookService(connection)
     return await service.create_book(book_data)
 
 
-@router.get("/", response_model=PaginatedResponse[Book])
-async def get_books(
+def book_filters(
     title: Optional[str] = Query(None, description="Filter by title"),
     author: Optional[str] = Query(None, description="Filter by author name"),
+    genre: Optional[List[Genre]] = Query(None, description="Filter by genre, repeatable"),
     year_from: Optional[int] = Query(None, description="Filter from year"),
     year_to: Optional[int] = Query(None, description="Filter to year"),
+) -> BookFilters:
+    """Book filter query parameters shared by listing and export"""
+    return BookFilters(
+        title=title,
+        author=author,
+        genres=genre,
+        year_from=year_from,
+        year_to=year_to,
+    )
+
+
+@router.get("/", response_model=PaginatedResponse[Book])
+async def get_books(
+    filters: BookFilters = Depends(book_filters),
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
     sort_by: str = Query("title", description="Sort by: title, year, author"),
     sort_order: str = Query("asc", regex="^(asc|desc)$"),
-    connection: asyncpg.Connection = Depends(get_db),
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor from next_cursor/prev_cursor; overrides page. "
+                    "Not available with sort_by=author",
+    ),
+    count: CountMode = Query(
+        CountMode.exact, description="Total count: exact, estimated or none"
+    ),
+    connection: ConnectionProvider = Depends(get_read_db),
 ):
     """Get books with filtering, pagination, and sorting"""
-    filters = BookFilters(
-        title=title, author=author, year_from=year_from, year_to=year_to
+    service = BookService(connection)
+    return await service.get_books(
+        filters, page, size, sort_by, sort_order, cursor, count
     )
 
+
+@router.get("/search", response_model=PaginatedResponse[BookSearchResult])
+async def search_books(
+    q: str = Query(..., min_length=1, description="Search terms (web search syntax)"),
+    page: int = Query(1, ge=1),
+    size: int = Query(20, ge=1, le=100),
+    count: CountMode = Query(
+        CountMode.exact, description="Total count: exact, estimated or none"
+    ),
+    connection: ConnectionProvider = Depends(get_read_db),
+):
+    """Full-text search over books, ranked by relevance"""
     service = BookService(connection)
-    return await service.get_books(filters, page, size, sort_by, sort_order)
+    return await service.search_books(q, page, size, count)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_books(
+    request: Request,
+    export_format: ExportFormat = Query(
+        ExportFormat.csv, alias="format", description="csv, ndjson or json"
+    ),
+    filters: BookFilters = Depends(book_filters),
+    connection: ConnectionProvider = Depends(get_read_db),
+):
+    """
+    Stream every book matching the filters; gzip-encoded when the client
+    sends Accept-Encoding: gzip
+    """
+    compress = accepts_gzip(request.headers.get("accept-encoding"))
+    headers = {
+        "Content-Disposition": f'attachment; filename="books.{export_format.value}"',
+        "Vary": "Accept-Encoding",
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+
+    service = ExportService(connection)
+    return ClosingStreamingResponse(
+        service.export_books(filters, export_format, compress),
+        media_type=MEDIA_TYPES[export_format],
+        headers=headers,
+    )
 
 
 @router.get("/{book_id}", response_model=Book)
 async def get_book_by_id(
-    book_id: UUID, connection: asyncpg.Connection = Depends(get_db)
+    book_id: UUID, connection: ConnectionProvider = Depends(get_read_db)
 ):
     """Get a specific book by ID"""
     service = BookService(connection)
@@ -63,7 +140,7 @@ async def get_book_by_id(
 async def update_book(
     book_id: UUID,
     book_data: BookUpdate,
-    connection: asyncpg.Connection = Depends(get_db),
+    connection: ConnectionProvider = Depends(get_write_db),
     current_user: User = Depends(get_current_user),
 ):
     """Update a book"""
@@ -73,7 +150,7 @@ async def update_book(
 
 @router.delete("/{book_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_book(
-        book_id: UUID, connection: asyncpg.Connection = Depends(get_db),
+        book_id: UUID, connection: ConnectionProvider = Depends(get_write_db),
         current_user: User = Depends(get_current_user),
 ):
     """Delete a book"""
@@ -81,16 +158,43 @@ async def delete_book(
     await service.delete_book(book_id)
 
 
-@router.post("/import", response_model=BulkImportResponse)
+@router.post("/import", response_model=Union[ImportJob, BulkImportResponse])
 async def import_books(
-    file: UploadFile = File(...), connection: asyncpg.Connection = Depends(get_db),
+    response: Response,
+    file: UploadFile = File(...),
+    background: bool = Query(
+        False, description="Queue the import as a background job and return it (202)"
+    ),
+    mode: ImportMode = Query(
+        ImportMode.skip,
+        description="Rows imported before: skip them, or upsert to update changed ones",
+    ),
+    connection: ConnectionProvider = Depends(get_write_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Import books from CSV or JSON file"""
-    if file.content_type not in ["application/json", "text/csv"]:
-        raise HTTPException(
-            status_code=400, detail="Only JSON and CSV files are supported"
+    """Import books from a CSV, JSON or NDJSON file, optionally gzip or zstd-compressed"""
+    if background:
+        response.status_code = status.HTTP_202_ACCEPTED
+        return await import_job_runner.enqueue_upload(
+            connection, file, current_user.id, mode
         )
 
-    service = ImportService(connection)
+    service = ImportService(connection, mode)
     return await service.import_from_file(file)
+
+
+@router.get("/import/{job_id}", response_model=ImportJob)
+async def get_import_job(
+    job_id: UUID,
+    connection: ConnectionProvider = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Get progress, throughput and errors of a background import"""
+    job = await ImportJobRepository(connection).get_by_id(job_id)
+    # Other users' jobs are reported as missing so job ids can't be probed
+    if not job or job["created_by"] != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Import job with id {job_id} not found",
+        )
+    return to_import_job(job)
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends
+from src.core.cache import user_cache
+from src.core.database import database
+from src.core.deps import get_current_user
+from src.core.security import password_hasher, token_cache
+from src.schemas.pool import CacheStatus, PasswordHasherStatus, PoolStatsResponse
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+
+@router.get("/pool", response_model=PoolStatsResponse)
+async def get_pool_stats(current_user=Depends(get_current_user)):
+    """Connection pool occupancy, waiting acquirers and acquire latency"""
+    return PoolStatsResponse(pools=database.pool_stats())
+
+
+@router.get("/password-hasher", response_model=PasswordHasherStatus)
+async def get_password_hasher_stats(current_user=Depends(get_current_user)):
+    """bcrypt thread pool load: running and queued hashes, queue wait and hash time"""
+    return PasswordHasherStatus(**password_hasher.stats())
+
+
+@router.get("/user-cache", response_model=CacheStatus)
+async def get_user_cache_stats(current_user=Depends(get_current_user)):
+    """Authenticated-user cache size, hit ratio, evictions and invalidations"""
+    return CacheStatus(**user_cache.stats())
+
+
+@router.get("/token-cache", response_model=CacheStatus)
+async def get_token_cache_stats(current_user=Depends(get_current_user)):
+    """Verified-token cache size, hit ratio and evictions"""
+    return CacheStatus(**token_cache.stats())
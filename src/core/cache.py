@@ -0,0 +1,102 @@
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from src.core.settings import settings
+
+
+class TTLCache:
+    """
+    Process-local LRU cache whose entries also expire ``ttl`` seconds after
+    they were stored.
+
+    Writers call ``invalidate`` after changing the underlying data. A load
+    that was already in flight when an invalidation happened is not stored,
+    so a slow read can't put back the value it just replaced. Other
+    processes only see the change once their own copy expires, so ``ttl``
+    is the staleness they tolerate; ``ttl <= 0`` disables caching.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._invalidations = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_size > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value``; ``ttl`` can only shorten the cache's own TTL"""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if not self.enabled or ttl <= 0:
+            return
+        self._entries[key] = (self._clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_load(
+        self, key: Hashable, load: Callable[[], Awaitable[Optional[Any]]]
+    ) -> Optional[Any]:
+        """Cached value for ``key``, else ``await load()``; ``None`` results aren't cached"""
+        if not self.enabled:
+            return await load()
+
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        invalidations = self._invalidations
+        value = await load()
+        if value is not None and invalidations == self._invalidations:
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        self._invalidations += 1
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._invalidations += 1
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self._invalidations,
+        }
+
+
+# User models by id for request authentication, invalidated by UserRepository
+user_cache = TTLCache(settings.USER_CACHE_MAX_SIZE, settings.USER_CACHE_TTL_SECONDS)
@@ -0,0 +1,106 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from src.core.exceptions import http_400_bad_request
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """Decoded keyset position: the sort key and id of a boundary row"""
+
+    key: List[Any]
+    id: UUID
+    direction: str = "next"
+
+    @property
+    def backwards(self) -> bool:
+        return self.direction == "prev"
+
+
+def encode_cursor(
+    sort_by: str, sort_order: str, key: List[Any], row_id: Any, direction: str
+) -> str:
+    """Encode a keyset position into an opaque, URL-safe token"""
+    payload = {
+        "s": sort_by,
+        "o": sort_order.lower(),
+        "k": key,
+        "i": str(row_id),
+        "d": direction,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(
+    token: str, sort_by: str, sort_order: str, key_length: int = 1
+) -> Cursor:
+    """Decode a cursor token, rejecting tampered tokens or ones minted for another sort"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        cursor = Cursor(
+            key=list(payload["k"]), id=UUID(payload["i"]), direction=payload["d"]
+        )
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise http_400_bad_request("Invalid pagination cursor")
+
+    if cursor.direction not in ("next", "prev") or len(cursor.key) != key_length:
+        raise http_400_bad_request("Invalid pagination cursor")
+
+    if payload.get("s") != sort_by or payload.get("o") != sort_order.lower():
+        raise http_400_bad_request(
+            "Cursor does not match the requested sort",
+            {"sort_by": payload.get("s"), "sort_order": payload.get("o")},
+        )
+
+    return cursor
+
+
+def paginate_rows(
+    rows: List[Dict[str, Any]],
+    size: int,
+    cursor: Optional[Cursor],
+    page: int,
+    sort_key: Callable[[Dict[str, Any]], List[Any]],
+    sort_by: str,
+    sort_order: str,
+) -> Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]:
+    """
+    Trim a page fetched with ``size + 1`` rows and build its next/prev cursors.
+
+    Rows fetched for a backwards cursor arrive in reverse order and are
+    flipped back here so callers always see the requested sort order.
+    """
+    has_more = len(rows) > size
+    rows = rows[:size]
+
+    if cursor is not None and cursor.backwards:
+        rows.reverse()
+        has_next, has_prev = True, has_more
+    else:
+        has_next = has_more
+        has_prev = cursor is not None or page > 1
+
+    if not rows:
+        return rows, None, None
+
+    next_cursor = None
+    if has_next:
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            sort_by, sort_order, sort_key(last), last["id"], "next"
+        )
+
+    prev_cursor = None
+    if has_prev:
+        first = rows[0]
+        prev_cursor = encode_cursor(
+            sort_by, sort_order, sort_key(first), first["id"], "prev"
+        )
+
+    return rows, next_cursor, prev_cursor
@@ -1,53 +1,301 @@
+import asyncio
 import asyncpg
+import itertools
+import orjson
+import time
+from collections import deque
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from fastapi import Depends, Request, Response
+from typing import AsyncGenerator, Dict, List, Any, Optional
+from src.core.metrics import latency_percentiles
 from src.core.settings import settings
 import logging
 
 
 logger = logging.getLogger(__name__)
 
+READ_PRIMARY_COOKIE = "db_read_primary_until"
+
+
+def _encode_json(value: Any) -> str:
+    return orjson.dumps(value).decode("utf-8")
+
+
+async def init_connection(connection: asyncpg.Connection) -> None:
+    """Runs once per new pooled connection: register fast codecs"""
+    for json_type in ("json", "jsonb"):
+        await connection.set_type_codec(
+            json_type,
+            encoder=_encode_json,
+            decoder=orjson.loads,
+            schema="pg_catalog",
+        )
+
+
+class PoolStats:
+    """Acquire counters and a rolling window of acquire latencies for one pool"""
+
+    def __init__(self, name: str, samples: int = 1024):
+        self.name = name
+        self.waiting = 0
+        self.acquired_total = 0
+        self.acquire_timeouts = 0
+        self._latencies: deque = deque(maxlen=samples)
+
+    def record(self, seconds: float) -> None:
+        self.acquired_total += 1
+        self._latencies.append(seconds)
+
+    def latency_percentiles(self) -> Dict[str, float]:
+        return latency_percentiles(self._latencies)
+
+    def snapshot(self, pool: asyncpg.Pool) -> Dict[str, Any]:
+        size = pool.get_size()
+        idle = pool.get_idle_size()
+        return {
+            "name": self.name,
+            "min_size": pool.get_min_size(),
+            "max_size": pool.get_max_size(),
+            "size": size,
+            "in_use": size - idle,
+            "idle": idle,
+            "waiting": self.waiting,
+            "acquired_total": self.acquired_total,
+            "acquire_timeouts": self.acquire_timeouts,
+            "acquire_latency": self.latency_percentiles(),
+        }
+
 
 class Database:
     def __init__(self):
         self.pool: asyncpg.Pool | None = None
+        self.replica_pools: List[asyncpg.Pool] = []
+        self._replica_cycle = None
+        self._stats: Dict[asyncpg.Pool, PoolStats] = {}
+
+    async def _create_pool(
+        self, name: str, dsn: str, min_size: int, max_size: int
+    ) -> asyncpg.Pool:
+        pool = await asyncpg.create_pool(
+            dsn,
+            min_size=min_size,
+            max_size=max_size,
+            max_queries=settings.DB_POOL_MAX_QUERIES,
+            max_inactive_connection_lifetime=settings.DB_POOL_MAX_INACTIVE_CONNECTION_LIFETIME,
+            statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+            command_timeout=settings.DB_COMMAND_TIMEOUT,
+            timeout=settings.DB_CONNECT_TIMEOUT,
+            init=init_connection,
+        )
+        self._stats[pool] = PoolStats(name)
+        return pool
 
     async def connect(self) -> None:
         try:
-            self.pool = await asyncpg.create_pool(
+            self.pool = await self._create_pool(
+                "primary",
                 settings.DATABASE_URL,
-                min_size=1,
-                max_size=10,
-                command_timeout=60,
+                settings.DB_POOL_MIN_SIZE,
+                settings.DB_POOL_MAX_SIZE,
             )
             logger.info("Connected to database")
+
+            for index, replica_url in enumerate(settings.DATABASE_REPLICA_URLS):
+                self.replica_pools.append(
+                    await self._create_pool(
+                        f"replica-{index}",
+                        replica_url,
+                        settings.DB_REPLICA_POOL_MIN_SIZE,
+                        settings.DB_REPLICA_POOL_MAX_SIZE,
+                    )
+                )
+            if self.replica_pools:
+                self._replica_cycle = itertools.cycle(self.replica_pools)
+                logger.info(f"Connected to {len(self.replica_pools)} read replica(s)")
+
             return self.pool
 
         except Exception as e:
             logger.error(f"Failed to connect to database: {e}")
+            await self.disconnect()
             raise
 
     async def disconnect(self) -> None:
+        for replica_pool in self.replica_pools:
+            await replica_pool.close()
+        self.replica_pools = []
+        self._replica_cycle = None
+        self._stats = {}
+
         if self.pool:
             await self.pool.close()
+            self.pool = None
             logger.info(f"Disconnected from database")
 
+    def read_pool(self) -> asyncpg.Pool:
+        """Next replica pool in round-robin order, or the primary without replicas"""
+        if self._replica_cycle is None:
+            return self.pool
+        return next(self._replica_cycle)
+
     @asynccontextmanager
-    async def get_connection(self) -> AsyncGenerator[asyncpg.Connection, None]:
+    async def get_connection(
+        self, readonly: bool = False
+    ) -> AsyncGenerator[asyncpg.Connection, None]:
+        if not self.pool:
+            raise RuntimeError("Database pool is not initialized.")
+
+        pool = self.read_pool() if readonly else self.pool
+        async with self.acquire_from(pool) as connection:
+            yield connection
+
+    @asynccontextmanager
+    async def acquire_from(
+        self, pool: asyncpg.Pool
+    ) -> AsyncGenerator[asyncpg.Connection, None]:
+        """Borrow a connection from ``pool``, recording acquire statistics"""
+        stats = self._stats.get(pool) or PoolStats("unknown")
+
+        stats.waiting += 1
+        started = time.perf_counter()
+        try:
+            connection = await pool.acquire(timeout=settings.DB_ACQUIRE_TIMEOUT)
+        except asyncio.TimeoutError:
+            stats.acquire_timeouts += 1
+            logger.error(f"Timed out acquiring a connection from the {stats.name} pool")
+            raise
+        finally:
+            stats.waiting -= 1
+        stats.record(time.perf_counter() - started)
+
+        try:
+            yield connection
+        except Exception as e:
+            logger.error(f"Database connection error: {e}")
+            raise
+        finally:
+            await pool.release(connection)
+
+    def provider(self, readonly: bool = False) -> "ConnectionProvider":
+        """Lazy connection provider bound to the primary or to one read pool"""
         if not self.pool:
             raise RuntimeError("Database pool is not initialized.")
+        return ConnectionProvider(self, self.read_pool() if readonly else self.pool)
+
+    def pool_stats(self) -> List[Dict[str, Any]]:
+        """Live occupancy and acquire latency of every pool"""
+        pools = [self.pool] + self.replica_pools if self.pool else []
+        return [self._stats[pool].snapshot(pool) for pool in pools]
+
+
+class ConnectionProvider:
+    """
+    Connection-like handle that borrows from the pool only while a query runs.
+
+    ``fetch``/``fetchrow``/``fetchval``/``execute`` each take a connection for
+    the single statement and hand it straight back, so time spent on auth,
+    hashing, serialization or slow clients doesn't hold a pool slot.
+    ``transaction()`` and ``acquire()`` pin one connection for the block;
+    queries issued inside it (including through repositories) reuse it.
 
-        async with self.pool.acquire() as connection:
+    Pins belong to the task that made them. Other tasks sharing the provider
+    (e.g. under ``asyncio.gather``) borrow their own connections, so they
+    never interleave statements with another task's transaction, and their
+    queries are not part of it.
+    """
+
+    def __init__(self, db: Database, pool: asyncpg.Pool):
+        self._database = db
+        self._pool = pool
+        self._pinned: Dict[Optional[asyncio.Task], asyncpg.Connection] = {}
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncGenerator[asyncpg.Connection, None]:
+        """Pin a connection for an explicit unit of work"""
+        task = asyncio.current_task()
+        pinned = self._pinned.get(task)
+        if pinned is not None:
+            yield pinned
+            return
+
+        async with self._database.acquire_from(self._pool) as connection:
+            self._pinned[task] = connection
             try:
                 yield connection
-            except Exception as e:
-                logger.error(f"Database connection error: {e}")
-                raise
+            finally:
+                del self._pinned[task]
+
+    @asynccontextmanager
+    async def transaction(self, **kwargs) -> AsyncGenerator[asyncpg.Connection, None]:
+        """Pin a connection and open a transaction (or savepoint) on it"""
+        async with self.acquire() as connection:
+            async with connection.transaction(**kwargs):
+                yield connection
+
+    async def fetch(self, query: str, *args, **kwargs) -> List[asyncpg.Record]:
+        async with self.acquire() as connection:
+            return await connection.fetch(query, *args, **kwargs)
+
+    async def fetchrow(self, query: str, *args, **kwargs) -> Optional[asyncpg.Record]:
+        async with self.acquire() as connection:
+            return await connection.fetchrow(query, *args, **kwargs)
+
+    async def fetchval(self, query: str, *args, **kwargs) -> Any:
+        async with self.acquire() as connection:
+            return await connection.fetchval(query, *args, **kwargs)
+
+    async def execute(self, query: str, *args, **kwargs) -> str:
+        async with self.acquire() as connection:
+            return await connection.execute(query, *args, **kwargs)
+
+    async def executemany(self, command: str, args, **kwargs) -> None:
+        async with self.acquire() as connection:
+            return await connection.executemany(command, args, **kwargs)
+
+    async def copy_records_to_table(self, table_name: str, **kwargs) -> str:
+        async with self.acquire() as connection:
+            return await connection.copy_records_to_table(table_name, **kwargs)
 
 
 database = Database()
 
 
-async def get_db() -> AsyncGenerator[asyncpg.Connection, None]:
-    async with database.get_connection() as connection:
-        yield connection
+def reads_from_primary(request: Request) -> bool:
+    """Whether the client wrote recently and must read its own writes"""
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_db() -> ConnectionProvider:
+    """Provider for the primary"""
+    return database.provider()
+
+
+async def get_write_db(
+    response: Response, connection: ConnectionProvider = Depends(get_db)
+) -> ConnectionProvider:
+    """
+    Provider for the primary, for routes that change data. The client's
+    reads are then pinned to the primary for READ_YOUR_WRITES_SECONDS, so
+    replica lag can't hide a write it just made. FastAPI only copies this
+    cookie onto a response the route returned, so requests that fail with
+    an error don't get it.
+    """
+    window = settings.READ_YOUR_WRITES_SECONDS
+    if window > 0:
+        response.set_cookie(
+            READ_PRIMARY_COOKIE,
+            str(time.time() + window),
+            max_age=window,
+            httponly=True,
+            samesite="lax",
+        )
+
+    return connection
+
+
+async def get_read_db(request: Request) -> ConnectionProvider:
+    """Provider for read-only routes: a replica unless the client wrote recently"""
+    return database.provider(readonly=not reads_from_primary(request))
@@ -1,6 +1,5 @@
 from fastapi import Depends, HTTPException, status
-import asyncpg
-from src.core.database import get_db
+from src.core.database import ConnectionProvider, get_db
 from src.core.security import get_current_user_token
 from src.schemas.user import TokenData, User
 from src.services.auth_service import AuthService
@@ -8,7 +7,7 @@ from src.services.auth_service import AuthService
 
 async def get_current_user(
     token_data: TokenData = Depends(get_current_user_token),
-    connection: asyncpg.Connection = Depends(get_db),
+    connection: ConnectionProvider = Depends(get_db),
 ) -> User:
     """Get current authenticated user"""
     auth_service = AuthService(connection)
@@ -0,0 +1,117 @@
+import logging
+import os
+import secrets
+import time
+from typing import Callable, Dict, Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+class KeyRing:
+    """
+    JWT signing keys by ``kid``. Tokens are signed with the active key and
+    carry its kid in the header; any key in the ring verifies, so a key can
+    be introduced before it signs and kept after it stops signing until the
+    tokens it issued have expired.
+    """
+
+    def __init__(self, keys: Dict[str, str], active_kid: Optional[str] = None):
+        if not keys:
+            raise ValueError("A key ring needs at least one key")
+        self.keys = dict(keys)
+        # Defaults to the most recently added key
+        self.active_kid = active_kid or next(reversed(self.keys))
+        if self.active_kid not in self.keys:
+            raise ValueError(f"Active key {self.active_kid!r} is not in the key ring")
+
+    @property
+    def signing_key(self) -> str:
+        return self.keys[self.active_kid]
+
+    def get(self, kid: str) -> Optional[str]:
+        return self.keys.get(kid)
+
+    @classmethod
+    def from_file(cls, path: str) -> "KeyRing":
+        """Load ``{"active_kid": "...", "keys": {"<kid>": "<secret>", ...}}``"""
+        with open(path, "rb") as key_file:
+            data = orjson.loads(key_file.read())
+        if not isinstance(data, dict) or not isinstance(data.get("keys"), dict):
+            raise ValueError(f"{path} must contain a \"keys\" object")
+        return cls(data["keys"], data.get("active_kid"))
+
+
+class KeyStore:
+    """
+    Holds the current KeyRing. With a key file, the file is re-read when its
+    modification time changes, checked at most every ``reload_seconds``, so
+    keys rotate without a restart. A file that fails to load keeps the
+    previous keys.
+    """
+
+    def __init__(
+        self,
+        ring: KeyRing,
+        path: Optional[str] = None,
+        reload_seconds: float = 30.0,
+        on_reload: Optional[Callable[[], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ring = ring
+        self.path = path
+        self.reload_seconds = reload_seconds
+        self.on_reload = on_reload
+        self._clock = clock
+        self._checked_at = clock()
+        self._mtime = os.stat(path).st_mtime_ns if path else None
+
+    def current(self) -> KeyRing:
+        if self.path and self._clock() - self._checked_at >= self.reload_seconds:
+            self._checked_at = self._clock()
+            self._reload_if_changed()
+        return self.ring
+
+    def _reload_if_changed(self) -> None:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+            if mtime == self._mtime:
+                return
+            ring = KeyRing.from_file(self.path)
+        except (OSError, ValueError) as e:
+            logger.error(f"Keeping current JWT keys, could not reload {self.path}: {e}")
+            return
+
+        self._mtime = mtime
+        self.ring = ring
+        logger.info(f"Reloaded {len(ring.keys)} JWT key(s), signing with {ring.active_kid!r}")
+        if self.on_reload:
+            self.on_reload()
+
+
+def load_key_store(settings, on_reload: Optional[Callable[[], None]] = None) -> KeyStore:
+    """
+    Keys from JWT_KEYS_FILE, else JWT_SIGNING_KEYS, else SECRET_KEY (kid
+    "default"). Without any, a random key is generated for this process
+    only: fine for a single dev worker, but its tokens fail on every other
+    worker and after a restart.
+    """
+    if settings.JWT_KEYS_FILE:
+        return KeyStore(
+            KeyRing.from_file(settings.JWT_KEYS_FILE),
+            settings.JWT_KEYS_FILE,
+            settings.JWT_KEYS_RELOAD_SECONDS,
+            on_reload,
+        )
+    if settings.JWT_SIGNING_KEYS:
+        return KeyStore(KeyRing(settings.JWT_SIGNING_KEYS, settings.JWT_ACTIVE_KID))
+    if settings.SECRET_KEY:
+        return KeyStore(KeyRing({"default": settings.SECRET_KEY}))
+
+    logger.warning(
+        "No JWT signing keys configured (JWT_KEYS_FILE, JWT_SIGNING_KEYS or "
+        "SECRET_KEY); using a random per-process key. Tokens will not verify "
+        "on other workers or after a restart."
+    )
+    return KeyStore(KeyRing({f"dev-{secrets.token_hex(4)}": secrets.token_urlsafe(32)}))
@@ -0,0 +1,19 @@
+from typing import Dict, Iterable
+
+
+def latency_percentiles(seconds: Iterable[float]) -> Dict[str, float]:
+    """p50/p90/p99/max in milliseconds of latency samples given in seconds"""
+    samples = sorted(seconds)
+    if not samples:
+        return {"p50_ms": 0.0, "p90_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+
+    def percentile(fraction: float) -> float:
+        index = min(len(samples) - 1, int(fraction * len(samples)))
+        return round(samples[index] * 1000, 3)
+
+    return {
+        "p50_ms": percentile(0.50),
+        "p90_ms": percentile(0.90),
+        "p99_ms": percentile(0.99),
+        "max_ms": round(samples[-1] * 1000, 3),
+    }
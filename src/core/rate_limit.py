@@ -1,34 +1,89 @@
 import time
+from collections import OrderedDict
+from typing import Callable, Dict
 from fastapi import Request
 from starlette.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
 
+class SlidingWindowCounter:
+    """
+    Sliding-window-counter rate limit, O(1) per request.
+
+    A key's rate is its count in the current fixed window plus the previous
+    window's count, weighted by how much of the previous window the sliding
+    window still overlaps. Counts are kept in one dict per window, so at
+    rollover the older dict is dropped as a whole and a key idle for a full
+    window is gone without any scan.
+
+    At most ``max_keys`` keys are counted per window, so memory holds at
+    most two windows of that many keys. Once the current window is full,
+    the key that has gone longest without a request is evicted to make
+    room. A flood of new keys thus never locks out legitimate clients; at
+    worst an evicted key starts counting again from its previous window.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        window: float,
+        max_keys: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._clock = clock
+        self._index = int(clock() // window)
+        self._current: "OrderedDict[str, int]" = OrderedDict()
+        self._previous: Dict[str, int] = {}
+        self.evictions = 0
+
+    def _advance(self, now: float) -> float:
+        """Roll the windows forward to ``now``; returns how far into the current one it is (0..1)"""
+        index, offset = divmod(now, self.window)
+        index = int(index)
+        if index != self._index:
+            self._previous = self._current if index == self._index + 1 else {}
+            self._current = OrderedDict()
+            self._index = index
+        return offset / self.window
+
+    def hit(self, key: str) -> bool:
+        """Count a request from ``key`` if it is within the limit; refused requests aren't counted"""
+        elapsed = self._advance(self._clock())
+        current = self._current.get(key, 0)
+        if current:
+            # Refused requests still count as activity, so a client being
+            # limited is never the one evicted
+            self._current.move_to_end(key)
+        if self._previous.get(key, 0) * (1 - elapsed) + current + 1 > self.limit:
+            return False
+
+        if not current and len(self._current) >= self.max_keys:
+            self._current.popitem(last=False)
+            self.evictions += 1
+
+        self._current[key] = current + 1
+        return True
+
+    def __len__(self) -> int:
+        return len(self._current) + len(self._previous)
+
+
 class RateLimiterMiddleware(BaseHTTPMiddleware):
     """
     Limits requests per IP within a given time window.
     """
-    def __init__(self, app, max_requests: int = 100, window: int = 60):
+    def __init__(self, app, max_requests: int = 100, window: int = 60, max_keys: int = 100_000):
         super().__init__(app)
-        self.max_requests = max_requests
-        self.window = window
-        self.requests = {}
+        self.limiter = SlidingWindowCounter(max_requests, window, max_keys)
 
     async def dispatch(self, request: Request, call_next):
-        ip = request.client.host
-        now = int(time.time())
-        window_start = now - self.window
-
-        if ip not in self.requests:
-            self.requests[ip] = []
-        self.requests[ip] = [ts for ts in self.requests[ip] if ts > window_start]
-
-        if len(self.requests[ip]) >= self.max_requests:
+        if not self.limiter.hit(request.client.host):
             return JSONResponse(
                 status_code=429,
                 content={"error": "Too Many Requests", "message": "Rate limit exceeded"},
             )
 
-        self.requests[ip].append(now)
-
         return await call_next(request)
@@ -0,0 +1,43 @@
+import anyio
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+
+class ClosingStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for bodies that hold resources, such as a pinned
+    connection with an open transaction.
+
+    Starlette cancels the response when the client disconnects. If that lands
+    inside the generator the cleanup awaits (ROLLBACK, returning the
+    connection) are cancelled too and the connection is left idle in
+    transaction. Here each chunk is produced under a shield, so cancellation
+    only interrupts ``send``, and the generator is then closed explicitly.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            with anyio.CancelScope(shield=True):
+                await self.body_iterator.aclose()
+
+    async def stream_response(self, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        while True:
+            with anyio.CancelScope(shield=True):
+                try:
+                    chunk = await self.body_iterator.__anext__()
+                except StopAsyncIteration:
+                    break
+            if not isinstance(chunk, bytes):
+                chunk = chunk.encode(self.charset)
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
@@ -1,21 +1,43 @@
+import asyncio
+import hashlib
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
-from jose import JWTError, jwt
+from typing import Any, Callable, Dict, Optional, Tuple
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-import secrets
 from uuid import UUID
 
+from src.core.cache import TTLCache
+from src.core.jwt_backends import InvalidTokenError, get_backend
+from src.core.keys import load_key_store
+from src.core.metrics import latency_percentiles
 from src.core.settings import settings
 from ..schemas.user import TokenData
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Pinning min/max to the configured cost makes any other cost "needs update",
+# so changing BCRYPT_ROUNDS rehashes passwords as users log in
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
 
-SECRET_KEY = getattr(settings, "SECRET_KEY", secrets.token_urlsafe(32))
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+jwt_backend = get_backend(settings.JWT_BACKEND)
+
+# Verified tokens by SHA-256 digest; each entry expires with its token
+token_cache = TTLCache(settings.TOKEN_CACHE_MAX_SIZE, ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+# Reloading the key file may retire keys, so drop tokens verified with them
+key_store = load_key_store(settings, on_reload=token_cache.clear)
+
 security = HTTPBearer()
 
 
@@ -29,6 +51,95 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHasher:
+    """
+    Runs bcrypt on a bounded thread pool so a burst of logins can't stall the
+    event loop (bcrypt releases the GIL while hashing). At most ``workers``
+    hashes run at once; beyond ``max_pending`` in-flight requests new ones
+    are rejected with a 503 instead of queueing without bound.
+    """
+
+    def __init__(self, workers: int, max_pending: int, samples: int = 1024):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._queue_waits: deque = deque(maxlen=samples)
+        self._run_times: deque = deque(maxlen=samples)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password-hash"
+            )
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many authentication requests, try again shortly",
+                headers={"Retry-After": "1"},
+            )
+
+        submitted = time.perf_counter()
+
+        def timed() -> Tuple[Any, float, float]:
+            started = time.perf_counter()
+            result = func(*args)
+            return result, started, time.perf_counter()
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, started, finished = await loop.run_in_executor(
+                self._get_executor(), timed
+            )
+        finally:
+            self.pending -= 1
+            self.completed += 1
+
+        # Recorded on the loop thread so stats() never sees a deque mid-append
+        self._queue_waits.append(started - submitted)
+        self._run_times.append(finished - started)
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self.run(pwd_context.hash, password)
+
+    async def verify_and_update(
+        self, password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """Verify a password; also returns a new hash if the stored one is outdated"""
+        return await self.run(pwd_context.verify_and_update, password, hashed_password)
+
+    def stats(self) -> Dict[str, Any]:
+        running = min(self.pending, self.workers)
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "running": running,
+            "queued": self.pending - running,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "queue_wait": latency_percentiles(self._queue_waits),
+            "hash_time": latency_percentiles(self._run_times),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING
+)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
@@ -41,14 +152,31 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         )
 
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    key_ring = key_store.current()
+    encoded_jwt = jwt_backend.encode(
+        to_encode, key_ring.signing_key, ALGORITHM, headers={"kid": key_ring.active_kid}
+    )
     return encoded_jwt
 
 
 def verify_token(token: str) -> Optional[TokenData]:
-    """Verify and decode JWT token"""
+    """
+    Verify and decode JWT token against the key named by its ``kid``
+    header. A token seen before is answered from ``token_cache`` without
+    checking its signature again.
+    """
+    digest = hashlib.sha256(token.encode()).digest()
+    token_data = token_cache.get(digest)
+    if token_data is not None:
+        return token_data
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        kid = jwt_backend.get_unverified_header(token).get("kid")
+        key = key_store.current().get(kid) if isinstance(kid, str) else None
+        if key is None:
+            return None
+
+        payload = jwt_backend.decode(token, key, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
         username: str = payload.get("username")
 
@@ -56,10 +184,14 @@ def verify_token(token: str) -> Optional[TokenData]:
             return None
 
         token_data = TokenData(user_id=UUID(user_id), username=username)
-        return token_data
-    except JWTError:
+    except (InvalidTokenError, ValueError):
         return None
 
+    expires_at = payload.get("exp")
+    if isinstance(expires_at, (int, float)):
+        token_cache.set(digest, token_data, ttl=expires_at - time.time())
+    return token_data
+
 
 async def get_current_user_token(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -72,7 +204,6 @@ async def get_current_user_token(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    print("Received credentials:", credentials)
 
     token_data = verify_token(token)
     if token_data is None:
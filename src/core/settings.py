@@ -1,7 +1,11 @@
+import os
+import socket
+import tempfile
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    DATABASE_REPLICA_URLS: list[str] = []
     ENV: str | None = None
     POSTGRES_HOST: str | None = None
     POSTGRES_PORT: int | None = None
@@ -9,7 +13,64 @@ class Settings(BaseSettings):
     POSTGRES_USER: str | None = None
     POSTGRES_PASSWORD: str | None = None
 
-    ALLOWED_FILE_TYPES: list[str] = ["application/json"]
+    DB_POOL_MIN_SIZE: int = 1
+    DB_POOL_MAX_SIZE: int = 10
+    DB_REPLICA_POOL_MIN_SIZE: int = 1
+    DB_REPLICA_POOL_MAX_SIZE: int = 10
+    DB_POOL_MAX_QUERIES: int = 50000
+    DB_POOL_MAX_INACTIVE_CONNECTION_LIFETIME: float = 300.0
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_ACQUIRE_TIMEOUT: float | None = 30
+    DB_COMMAND_TIMEOUT: float = 60
+    DB_CONNECT_TIMEOUT: float = 10
+    READ_YOUR_WRITES_SECONDS: int = 5
+
+    IMPORT_BATCH_SIZE: int = 5000
+    IMPORT_WORKERS: int = 2
+    # Leaves a core for the event loop; 0 validates inline
+    IMPORT_VALIDATION_WORKERS: int = min(4, (os.cpu_count() or 1) - 1)
+    IMPORT_VALIDATION_CHUNK_SIZE: int = 1000
+    IMPORT_SPOOL_DIR: str = os.path.join(tempfile.gettempdir(), "book-imports")
+    # Identifies the spool directory's machine; only jobs spooled here are
+    # resumed here. Set it to something stable if the hostname isn't.
+    IMPORT_SPOOL_HOST: str = socket.gethostname()
+    IMPORT_JOB_MAX_ERRORS: int = 1000
+
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = min(4, os.cpu_count() or 1)
+    # Logins beyond this many in-flight hash operations get a 503
+    PASSWORD_HASH_MAX_PENDING: int = 256
+
+    # JWT signing keys, first found wins: a key file
+    # {"active_kid": ..., "keys": {kid: secret}} re-read when it changes,
+    # then {kid: secret} with JWT_ACTIVE_KID (default: the last key) signing,
+    # then a single SECRET_KEY. Without any, each process makes up its own.
+    JWT_KEYS_FILE: str | None = None
+    JWT_KEYS_RELOAD_SECONDS: float = 30
+    JWT_SIGNING_KEYS: dict[str, str] = {}
+    JWT_ACTIVE_KID: str | None = None
+    SECRET_KEY: str | None = None
+    # "jose" (python-jose) or "pyjwt"
+    JWT_BACKEND: str = "jose"
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+
+    USER_CACHE_MAX_SIZE: int = 10000
+    # How long another process may keep serving a changed or deactivated
+    # user; 0 disables the cache
+    USER_CACHE_TTL_SECONDS: float = 30
+
+    RATE_LIMIT_REQUESTS: int = 10
+    RATE_LIMIT_WINDOW_SECONDS: int = 60
+    # Client IPs counted per window; two windows are kept. When full, the
+    # least recently seen IP is evicted, so a scan can't lock new clients out.
+    RATE_LIMIT_MAX_KEYS: int = 100_000
+
+    EXPORT_PREFETCH_ROWS: int = 1000
+    EXPORT_CHUNK_SIZE: int = 64 * 1024
+    EXPORT_GZIP_LEVEL: int = 6
+
+    # Upload formats accepted by the importer, plain or gzip/zstd-compressed
+    ALLOWED_FILE_TYPES: list[str] = ["application/json", "text/csv", "application/x-ndjson"]
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
 
@@ -5,9 +5,14 @@ from contextlib import asynccontextmanager
 import logging
 from src.core.database import database
 from src.core.rate_limit import RateLimiterMiddleware
+from src.core.security import password_hasher
+from src.core.settings import settings
+from src.services.import_jobs import import_job_runner
+from src.services.import_validation import shutdown_validation_pool
 from src.api.v1.author import router as author_router
 from src.api.v1.book import router as book_router
 from src.api.v1.auth import router as auth_router
+from src.api.v1.internal import router as internal_router
 
 
 logging.basicConfig(level=logging.INFO)
@@ -32,8 +37,13 @@ async def lifespan(app: FastAPI):
                 logger.error("Max database connection retries reached")
                 raise
 
+    await import_job_runner.start()
+
     yield
 
+    await import_job_runner.stop()
+    shutdown_validation_pool()
+    password_hasher.shutdown()
     await database.disconnect()
     logger.info("Application shutdown complete")
 
@@ -49,13 +59,15 @@ app.add_middleware(
 
 app.add_middleware(
     RateLimiterMiddleware,
-    max_requests=10,
-    window=60,
+    max_requests=settings.RATE_LIMIT_REQUESTS,
+    window=settings.RATE_LIMIT_WINDOW_SECONDS,
+    max_keys=settings.RATE_LIMIT_MAX_KEYS,
 )
 
 app.include_router(book_router)
 app.include_router(author_router)
 app.include_router(auth_router)
+app.include_router(internal_router)
 
 
 @app.get("/health")
@@ -1,7 +1,10 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 from .base import BaseRepository
+from .filters import compile_author_search
+from ..core.cursor import Cursor
 from ..schemas.author import AuthorCreate, AuthorUpdate
+from ..schemas.pagination import CountMode
 
 
 class AuthorRepository(BaseRepository):
@@ -16,21 +19,83 @@ class AuthorRepository(BaseRepository):
             query, author_data.first_name, author_data.last_name, author_data.biography
         )
 
+    async def upsert_names(
+        self, first_names: List[str], last_names: List[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Get or create authors by name in one statement. The no-op DO UPDATE
+        makes existing rows come back through RETURNING; names must be distinct.
+        """
+        query = """
+            INSERT INTO authors (first_name, last_name)
+            SELECT * FROM unnest($1::varchar[], $2::varchar[])
+            ON CONFLICT (first_name, last_name)
+            DO UPDATE SET first_name = EXCLUDED.first_name
+            RETURNING id, first_name, last_name
+        """
+        return await self.fetch_all(query, first_names, last_names)
+
     async def get_by_id(self, author_id: UUID) -> Optional[Dict[str, Any]]:
         query = "SELECT * FROM authors WHERE id = $1"
         return await self.fetch_one(query, author_id)
 
-    async def get_all(self, limit: int = 20, offset: int = 0) -> List[Dict[str, Any]]:
+    async def get_by_ids(self, author_ids: List[UUID]) -> List[Dict[str, Any]]:
+        query = "SELECT * FROM authors WHERE id = ANY($1::uuid[])"
+        return await self.fetch_all(query, author_ids)
+
+    @staticmethod
+    def sort_key(author: Dict[str, Any]) -> List[Any]:
+        """Cursor key of an author row (authors are always listed by name)"""
+        return [author["last_name"], author["first_name"]]
+
+    @staticmethod
+    def _page_order_by(direction: str = "ASC") -> str:
+        """Name order over the columns of a page subquery"""
+        return f"page.last_name {direction}, page.first_name {direction}, page.id {direction}"
+
+    def _build_page_query(
+        self, limit: int, offset: int, cursor: Optional[Cursor]
+    ) -> Tuple[str, str, List[Any]]:
+        if cursor:
+            comparison, direction = (
+                ("<", "DESC") if cursor.backwards else (">", "ASC")
+            )
+            query = f"""
+                SELECT * FROM authors
+                WHERE (last_name, first_name, id) {comparison} ($1, $2, $3)
+                ORDER BY last_name {direction}, first_name {direction}, id {direction}
+                LIMIT $4
+            """
+            return query, self._page_order_by(direction), [*cursor.key, cursor.id, limit]
+
         query = """
             SELECT * FROM authors 
-            ORDER BY last_name, first_name 
+            ORDER BY last_name, first_name, id
             LIMIT $1 OFFSET $2
         """
-        return await self.fetch_all(query, limit, offset)
+        return query, self._page_order_by(), [limit, offset]
 
-    async def get_total_count(self) -> int:
-        query = "SELECT COUNT(*) FROM authors"
-        return await self.connection.fetchval(query)
+    async def get_page(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        cursor: Optional[Cursor] = None,
+        count_mode: CountMode = CountMode.exact,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Get a page of authors together with the total, see ``CountMode``"""
+        query, order_by, params = self._build_page_query(limit, offset, cursor)
+        filtered_query = "SELECT 1 FROM authors"
+
+        if count_mode == CountMode.exact:
+            return await self.fetch_page_with_count(
+                query, filtered_query, order_by, *params
+            )
+
+        authors = await self.fetch_all(query, *params)
+        if count_mode == CountMode.estimated:
+            return authors, await self.estimate_count(filtered_query)
+
+        return authors, None
 
     async def update(
         self, author_id: UUID, author_data: AuthorUpdate
@@ -51,7 +116,7 @@ class AuthorRepository(BaseRepository):
         values.append(author_id)
 
         query = f"""
-            UPDATE authors 
+            UPDATE authors
             SET {', '.join(update_fields)}, updated_at = CURRENT_TIMESTAMP
             WHERE id = ${param_count}
             RETURNING *
@@ -59,17 +124,42 @@ class AuthorRepository(BaseRepository):
         return await self.fetch_one(query, *values)
 
     async def delete(self, author_id: UUID) -> bool:
-        query = "DELETE FROM authors WHERE id = $1"
-        result = await self.execute(query, author_id)
-        return "DELETE 1" in result
+        query = "DELETE FROM authors WHERE id = $1 RETURNING id"
+        return await self.connection.fetchval(query, author_id) is not None
 
     async def search(
         self, search_term: str, limit: int = 20, offset: int = 0
     ) -> List[Dict[str, Any]]:
-        query = """
+        authors, _ = await self.search_page(
+            search_term, limit, offset, CountMode.none
+        )
+        return authors
+
+    async def search_page(
+        self,
+        search_term: str,
+        limit: int = 20,
+        offset: int = 0,
+        count_mode: CountMode = CountMode.exact,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Substring search on the full name, see ``compile_author_search``"""
+        compiler = compile_author_search(search_term)
+        filtered_query = f"SELECT 1 FROM authors WHERE {compiler.sql}"
+        filter_params = list(compiler.params)
+        query = f"""
             SELECT * FROM authors 
-            WHERE LOWER(first_name || ' ' || last_name) LIKE LOWER($1)
-            ORDER BY last_name, first_name
-            LIMIT $2 OFFSET $3
+            WHERE {compiler.sql}
+            ORDER BY last_name, first_name, id
+            LIMIT {compiler.param(limit)} OFFSET {compiler.param(offset)}
         """
-        return await self.fetch_all(query, f"%{search_term}%", limit, offset)
+
+        if count_mode == CountMode.exact:
+            return await self.fetch_page_with_count(
+                query, filtered_query, self._page_order_by(), *compiler.params
+            )
+
+        authors = await self.fetch_all(query, *compiler.params)
+        if count_mode == CountMode.estimated:
+            return authors, await self.estimate_count(filtered_query, *filter_params)
+
+        return authors, None
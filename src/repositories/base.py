@@ -1,12 +1,13 @@
-from typing import Any, Dict, List, Optional
-import asyncpg
+from typing import Any, Dict, List, Optional, Tuple
+import json
 import logging
+from src.core.database import ConnectionProvider
 
 logger = logging.getLogger(__name__)
 
 
 class BaseRepository:
-    def __init__(self, connection: asyncpg.Connection):
+    def __init__(self, connection: ConnectionProvider):
         self.connection = connection
 
     async def fetch_all(self, query: str, *args) -> List[Dict[str, Any]]:
@@ -20,3 +21,38 @@ class BaseRepository:
     async def execute(self, query: str, *args) -> str:
         """Execute command and return status"""
         return await self.connection.execute(query, *args)
+
+    async def fetch_page_with_count(
+        self, page_query: str, filtered_query: str, order_by: str, *args
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Fetch a page and the row count of the full filtered set in one round
+        trip. The total row survives even when the page itself is empty.
+
+        A join doesn't keep the order of the page subquery, so ``order_by``
+        repeats the page's sort over its output columns (``page.<column>``).
+        """
+        query = f"""
+            SELECT page.*, total.total_count
+            FROM (SELECT COUNT(*) AS total_count FROM ({filtered_query}) filtered) total
+            LEFT JOIN LATERAL ({page_query}) page ON true
+            ORDER BY {order_by}
+        """
+        rows = await self.connection.fetch(query, *args)
+        total = rows[0]["total_count"] if rows else 0
+
+        items = []
+        for row in rows:
+            if row["id"] is None:
+                continue
+            item = dict(row)
+            item.pop("total_count")
+            items.append(item)
+        return items, total
+
+    async def estimate_count(self, query: str, *args) -> int:
+        """Planner row estimate for a query, without executing it"""
+        plan = await self.connection.fetchval(f"EXPLAIN (FORMAT JSON) {query}", *args)
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
@@ -1,19 +1,136 @@
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any, Tuple
+import asyncpg
 from uuid import UUID
 from .base import BaseRepository
-from ..schemas.book import BookCreate, BookUpdate, BookFilters
+from ..core.cursor import Cursor
+from .filters import compile_book_filters
+from ..schemas.book import BookCreate, BookUpdate, BookFilters, ImportMode
+from ..schemas.pagination import CountMode
+
+
+BOOK_COLUMNS = (
+    "id, title, content, description, published_year, genre, author_id, "
+    "created_at, updated_at"
+)
+
+JOINED_BOOK_COLUMNS = """
+    b.id, b.title, b.content, b.description, b.published_year, b.genre,
+    b.created_at, b.updated_at,
+    a.id as author_id, a.first_name, a.last_name, a.biography,
+    a.created_at as author_created_at, a.updated_at as author_updated_at
+"""
+
+IMPORT_STAGING_TABLE = "books_import_staging"
+
+IMPORT_STAGING_COLUMNS = (
+    "row_number", "title", "content", "description", "published_year", "genre", "author_id"
+)
+
+# Identity of a book (same title, author and year) and a hash of its
+# content, as md5 stored in a uuid; the SQL functions come from migration 007
+IMPORT_KEY_SQL = "book_import_key(s.title, s.author_id, s.published_year)"
+IMPORT_FINGERPRINT_SQL = (
+    "book_import_fingerprint(s.title, s.content, s.description, s.published_year, s.genre, s.author_id)"
+)
+
+# SQL types of the book columns a create or update binds
+BOOK_PARAM_TYPES = {
+    "title": "text",
+    "content": "text",
+    "description": "text",
+    "published_year": "integer",
+    "genre": "text",
+    "author_id": "uuid",
+}
+
+IMPORT_CONFLICT_ACTIONS = {
+    ImportMode.skip: "DO NOTHING",
+    ImportMode.upsert: """
+        DO UPDATE SET
+            title = EXCLUDED.title,
+            content = EXCLUDED.content,
+            description = EXCLUDED.description,
+            published_year = EXCLUDED.published_year,
+            genre = EXCLUDED.genre,
+            author_id = EXCLUDED.author_id,
+            import_fingerprint = EXCLUDED.import_fingerprint,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE books.import_fingerprint IS DISTINCT FROM EXCLUDED.import_fingerprint
+    """,
+}
+
+
+def _create_book_query() -> str:
+    # Each parameter appears in several places, so it is typed explicitly
+    title, content, description, year, genre, author_id = (
+        f"${position}::{pg_type}"
+        for position, pg_type in enumerate(BOOK_PARAM_TYPES.values(), start=1)
+    )
+    values = f"{title}, {content}, {description}, {year}, {genre}, {author_id}"
+    import_key = f"book_import_key({title}, {author_id}, {year})"
+    import_fingerprint = f"book_import_fingerprint({values})"
+    columns = (
+        "title, content, description, published_year, genre, author_id, "
+        "import_key, import_fingerprint"
+    )
+    # The keyless insert only runs when the keyed one hit a conflict
+    return f"""
+        WITH keyed AS (
+            INSERT INTO books ({columns})
+            VALUES ({values}, {import_key}, {import_fingerprint})
+            ON CONFLICT (import_key) WHERE import_key IS NOT NULL DO NOTHING
+            RETURNING *
+        ), unkeyed AS (
+            INSERT INTO books ({columns})
+            SELECT {values}, NULL, {import_fingerprint}
+            WHERE NOT EXISTS (SELECT 1 FROM keyed)
+            RETURNING *
+        ), b AS (
+            SELECT * FROM keyed
+            UNION ALL
+            SELECT * FROM unkeyed
+        )
+        SELECT {JOINED_BOOK_COLUMNS}
+        FROM b
+        LEFT JOIN authors a ON b.author_id = a.id
+    """
+
+
+CREATE_BOOK_QUERY = _create_book_query()
+
+SEARCH_HEADLINE_OPTIONS = (
+    "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=25, MinWords=8"
+)
+
+
+# What html.escape replaces, as SQL literals ("&" first)
+HTML_ESCAPES = (
+    ("'&'", "'&amp;'"),
+    ("'<'", "'&lt;'"),
+    ("'>'", "'&gt;'"),
+    ("'\"'", "'&quot;'"),
+    ("''''", "'&#x27;'"),
+)
+
+
+def _html_escape_sql(expression: str) -> str:
+    """HTML-escape a text expression in SQL, so a snippet's only markup is its <mark> tags"""
+    for char, entity in HTML_ESCAPES:
+        expression = f"replace({expression}, {char}, {entity})"
+    return expression
 
 
 class BookRepository(BaseRepository):
 
     async def create(self, book_data: BookCreate) -> Dict[str, Any]:
-        query = """
-            INSERT INTO books (title, content, description, published_year, genre, author_id)
-            VALUES ($1, $2, $3, $4, $5, $6)
-            RETURNING *
-            """
+        """
+        Insert and return the joined row in one statement; a missing author
+        raises ForeignKeyViolationError. The book gets its import key, so a
+        later import of the same book matches it. If another book already
+        holds that key, the book is still created, without a key.
+        """
         return await self.fetch_one(
-            query,
+            CREATE_BOOK_QUERY,
             book_data.title,
             book_data.content,
             book_data.description,
@@ -23,129 +140,217 @@ class BookRepository(BaseRepository):
         )
 
     async def get_by_id(self, book_id: UUID) -> Optional[Dict[str, Any]]:
-        query = """
-            SELECT b.*, 
-                   a.id as author_id, a.first_name, a.last_name, a.biography,
-                   a.created_at as author_created_at, a.updated_at as author_updated_at
+        query = f"""
+            SELECT {JOINED_BOOK_COLUMNS}
             FROM books b
             LEFT JOIN authors a ON b.author_id = a.id
             WHERE b.id = $1
             """
         return await self.fetch_one(query, book_id)
 
-    async def get_all(
+    # published_year is nullable and a keyset row comparison with NULL is
+    # never true, so the year sorts on this stand-in instead (NULLs last
+    # ascending); books_year_sort_idx indexes the same expression
+    NULL_YEAR_SORT = 2147483647
+
+    SORT_COLUMNS = {
+        "title": "b.title",
+        "year": f"COALESCE(b.published_year, {NULL_YEAR_SORT})",
+        "author": "COALESCE(a.last_name, '')",
+    }
+    # Author order is an expression over the joined authors table that no
+    # index can serve, so it is paged by OFFSET only; a keyset would still
+    # sort the whole filtered join on every page
+    OFFSET_ONLY_SORTS = {"author"}
+    # The same sort keys over the columns of a page subquery
+    PAGE_SORT_COLUMNS = {
+        "title": "page.title",
+        "year": f"COALESCE(page.published_year, {NULL_YEAR_SORT})",
+        "author": "COALESCE(page.last_name, '')",
+    }
+
+    @classmethod
+    def sort_key(cls, book: Dict[str, Any], sort_by: str) -> List[Any]:
+        """Cursor key of a joined book row for a keyset sort option"""
+        if sort_by == "year":
+            year = book["published_year"]
+            return [cls.NULL_YEAR_SORT if year is None else year]
+        return [book["title"]]
+
+    def _build_page_query(
         self,
         filters: BookFilters,
-        limit: int = 20,
-        offset: int = 0,
-        sort_by: str = "title",
-        sort_order: str = "asc",
-    ) -> List[Dict[str, Any]]:
-        where_conditions = ["1=1"]
-        params = []
-        param_count = 0
-
-        if filters.title:
-            param_count += 1
-            where_conditions.append(f"b.title ILIKE ${param_count}")
-            params.append(f"%{filters.title}%")
+        limit: int,
+        offset: int,
+        sort_by: str,
+        sort_order: str,
+        cursor: Optional[Cursor],
+    ) -> Tuple[str, str, str, List[Any], List[Any]]:
+        """
+        Build the page query, the query for the whole filtered set that
+        totals are counted over and the page's sort over its output columns.
+        With a cursor the page is located by a keyset predicate on
+        (sort key, id) instead of OFFSET; a backwards cursor returns rows in
+        reverse sort order.
 
-        if filters.author:
-            param_count += 1
-            where_conditions.append(
-                f"(a.first_name ILIKE ${param_count} OR a.last_name ILIKE ${param_count})"
-            )
-            params.append(f"%{filters.author}%")
+        The filtered query ignores the cursor and only uses the leading filter
+        parameters, so both can share one parameter list.
+        """
+        compiler = compile_book_filters(filters)
+        filtered_query = f"SELECT 1 FROM books b WHERE {compiler.sql}"
+        filter_params = list(compiler.params)
 
-        if filters.year_from:
-            param_count += 1
-            where_conditions.append(
-                f"EXTRACT(YEAR FROM b.published_year) >= ${param_count}"
-            )
-            params.append(filters.year_from)
+        sort_column = self.SORT_COLUMNS.get(sort_by, "b.title")
+        descending = sort_order.lower() == "desc"
 
-        if filters.year_to:
-            param_count += 1
-            where_conditions.append(
-                f"EXTRACT(YEAR FROM b.published_year) <= ${param_count}"
+        if cursor:
+            if cursor.backwards:
+                descending = not descending
+            compiler.where(
+                f"({sort_column}, b.id) {'<' if descending else '>'} ({{}}, {{}})",
+                cursor.key[0],
+                cursor.id,
             )
-            params.append(filters.year_to)
+            offset = 0
 
-        valid_sorts = {
-            "title": "b.title",
-            "year": "b.published_year",
-            "author": "a.last_name",
-        }
-        sort_column = valid_sorts.get(sort_by, "b.title")
-        sort_direction = "DESC" if sort_order.lower() == "desc" else "ASC"
-
-        param_count += 1
-        params.append(limit)
-        param_count += 1
-        params.append(offset)
+        sort_direction = "DESC" if descending else "ASC"
 
         query = f"""
-            SELECT b.*, 
-                   a.id as author_id, a.first_name, a.last_name, a.biography,
-                   a.created_at as author_created_at, a.updated_at as author_updated_at
+            SELECT {JOINED_BOOK_COLUMNS}
             FROM books b
             LEFT JOIN authors a ON b.author_id = a.id
-            WHERE {' AND '.join(where_conditions)}
-            ORDER BY {sort_column} {sort_direction}
-            LIMIT ${param_count - 1} OFFSET ${param_count}
+            WHERE {compiler.sql}
+            ORDER BY {sort_column} {sort_direction}, b.id {sort_direction}
+            LIMIT {compiler.param(limit)} OFFSET {compiler.param(offset)}
         """
+        page_sort_column = self.PAGE_SORT_COLUMNS.get(sort_by, "page.title")
+        order_by = f"{page_sort_column} {sort_direction}, page.id {sort_direction}"
+        return query, filtered_query, order_by, compiler.params, filter_params
 
-        return await self.fetch_all(query, *params)
-
-    async def get_total_count(self, filters: BookFilters) -> int:
-        where_conditions = ["1=1"]
-        params = []
-        param_count = 0
+    async def get_page(
+        self,
+        filters: BookFilters,
+        limit: int = 20,
+        offset: int = 0,
+        sort_by: str = "title",
+        sort_order: str = "asc",
+        cursor: Optional[Cursor] = None,
+        count_mode: CountMode = CountMode.exact,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Get a page of books together with the filtered total.
 
-        if filters.title:
-            param_count += 1
-            where_conditions.append(f"b.title ILIKE ${param_count}")
-            params.append(f"%{filters.title}%")
+        ``exact`` counts in the same statement as the page, ``estimated``
+        asks the planner instead of counting and ``none`` skips the total.
+        """
+        query, filtered_query, order_by, params, filter_params = self._build_page_query(
+            filters, limit, offset, sort_by, sort_order, cursor
+        )
 
-        if filters.author:
-            param_count += 1
-            where_conditions.append(
-                f"(a.first_name ILIKE ${param_count} OR a.last_name ILIKE ${param_count})"
+        if count_mode == CountMode.exact:
+            return await self.fetch_page_with_count(
+                query, filtered_query, order_by, *params
             )
-            params.append(f"%{filters.author}%")
 
-        if filters.year_from:
-            param_count += 1
-            where_conditions.append(
-                f"EXTRACT(YEAR FROM b.published_year) >= ${param_count}"
-            )
-            params.append(filters.year_from)
+        books = await self.fetch_all(query, *params)
+        if count_mode == CountMode.estimated:
+            return books, await self.estimate_count(filtered_query, *filter_params)
 
-        if filters.year_to:
-            param_count += 1
-            where_conditions.append(
-                f"EXTRACT(YEAR FROM b.published_year) <= ${param_count}"
-            )
-            params.append(filters.year_to)
+        return books, None
 
+    async def stream_filtered(
+        self, filters: BookFilters, prefetch: int = 1000
+    ) -> AsyncIterator[asyncpg.Record]:
+        """
+        Iterate every book matching ``filters`` through a server-side cursor,
+        ``prefetch`` rows per round trip. The cursor lives in a read-only
+        REPEATABLE READ transaction, so the export sees one snapshot and the
+        connection stays pinned until iteration ends.
+        """
+        compiler = compile_book_filters(filters)
         query = f"""
-            SELECT COUNT(*) FROM books b
+            SELECT {JOINED_BOOK_COLUMNS}
+            FROM books b
             LEFT JOIN authors a ON b.author_id = a.id
-            WHERE {' AND '.join(where_conditions)}
+            WHERE {compiler.sql}
+            ORDER BY b.id
         """
+        async with self.connection.transaction(
+            isolation="repeatable_read", readonly=True
+        ) as connection:
+            async for record in connection.cursor(
+                query, *compiler.params, prefetch=prefetch
+            ):
+                yield record
 
-        return await self.connection.fetchval(query, *params)
+    async def search(
+        self,
+        search_query: str,
+        limit: int = 20,
+        offset: int = 0,
+        count_mode: CountMode = CountMode.exact,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Full-text search over title, author name, description and content.
+        Rows come back by relevance with a ``rank`` and a highlighted snippet;
+        snippets are only built for the rows of the requested page.
+        """
+        query = f"""
+            SELECT page.*,
+                   ts_headline(
+                       'english',
+                       {_html_escape_sql("concat_ws(' ', page.description, page.content)")},
+                       websearch_to_tsquery('english', $1),
+                       '{SEARCH_HEADLINE_OPTIONS}'
+                   ) AS highlight
+            FROM (
+                SELECT {JOINED_BOOK_COLUMNS},
+                       ts_rank_cd(b.search_vector, q.query) AS rank
+                FROM books b
+                CROSS JOIN websearch_to_tsquery('english', $1) AS q(query)
+                LEFT JOIN authors a ON b.author_id = a.id
+                WHERE b.search_vector @@ q.query
+                ORDER BY rank DESC, b.id
+                LIMIT $2 OFFSET $3
+            ) page
+            ORDER BY page.rank DESC, page.id
+        """
+        filtered_query = """
+            SELECT 1 FROM books b
+            WHERE b.search_vector @@ websearch_to_tsquery('english', $1)
+        """
+
+        if count_mode == CountMode.exact:
+            return await self.fetch_page_with_count(
+                query, filtered_query, "page.rank DESC, page.id",
+                search_query, limit, offset
+            )
+
+        books = await self.fetch_all(query, search_query, limit, offset)
+        if count_mode == CountMode.estimated:
+            return books, await self.estimate_count(filtered_query, search_query)
+
+        return books, None
 
     async def update(
         self, book_id: UUID, book_data: BookUpdate
     ) -> Optional[Dict[str, Any]]:
+        """
+        Update the given fields and re-derive the import key and fingerprint
+        from the updated row, so later imports match the book as edited. The
+        key is left NULL when another book already holds it, as in ``create``.
+        """
         update_fields = []
         values = []
         param_count = 0
+        # Post-update value of every identity column: the new parameter, or
+        # the current column. Parameters appear twice, so they are typed.
+        updated = {column: f"books.{column}" for column in BOOK_PARAM_TYPES}
 
         for field, value in book_data.model_dump(exclude_unset=True).items():
             param_count += 1
-            update_fields.append(f"{field} = ${param_count}")
+            updated[field] = f"${param_count}::{BOOK_PARAM_TYPES[field]}"
+            update_fields.append(f"{field} = {updated[field]}")
             values.append(value)
 
         if not update_fields:
@@ -154,16 +359,118 @@ class BookRepository(BaseRepository):
         param_count += 1
         values.append(book_id)
 
+        import_key = (
+            f"book_import_key({updated['title']}, {updated['author_id']}, {updated['published_year']})"
+        )
+        import_fingerprint = (
+            f"book_import_fingerprint({updated['title']}, {updated['content']}, "
+            f"{updated['description']}, {updated['published_year']}, "
+            f"{updated['genre']}, {updated['author_id']})"
+        )
         query = f"""
-            UPDATE books 
-            SET {', '.join(update_fields)}, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ${param_count}
-            RETURNING *
+            WITH b AS (
+                UPDATE books
+                SET {', '.join(update_fields)},
+                    import_key = CASE
+                        WHEN EXISTS (
+                            SELECT 1 FROM books other
+                            WHERE other.import_key = {import_key} AND other.id <> books.id
+                        ) THEN NULL
+                        ELSE {import_key}
+                    END,
+                    import_fingerprint = {import_fingerprint},
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = ${param_count}
+                RETURNING *
+            )
+            SELECT {JOINED_BOOK_COLUMNS}
+            FROM b
+            LEFT JOIN authors a ON b.author_id = a.id
         """
-        await self.execute(query, *values)
-        return await self.get_by_id(book_id)
+        return await self.fetch_one(query, *values)
 
     async def delete(self, book_id: UUID) -> bool:
-        query = "DELETE FROM books WHERE id = $1"
-        result = await self.execute(query, book_id)
-        return "DELETE 1" in result
+        query = "DELETE FROM books WHERE id = $1 RETURNING id"
+        return await self.connection.fetchval(query, book_id) is not None
+
+    async def create_import_staging(self) -> None:
+        """Session-local staging table for bulk imports, dropped on commit"""
+        await self.execute(f"""
+            CREATE TEMP TABLE IF NOT EXISTS {IMPORT_STAGING_TABLE} (
+                row_number INTEGER NOT NULL,
+                title VARCHAR(200) NOT NULL,
+                content TEXT NOT NULL,
+                description TEXT,
+                published_year INTEGER NOT NULL,
+                genre VARCHAR(50) NOT NULL,
+                author_id UUID
+            ) ON COMMIT DROP
+        """)
+
+    async def copy_to_import_staging(self, records: List[Tuple]) -> None:
+        """Stream validated rows into the staging table with COPY"""
+        await self.connection.copy_records_to_table(
+            IMPORT_STAGING_TABLE, records=records, columns=IMPORT_STAGING_COLUMNS
+        )
+
+    async def merge_import_staging(
+        self, first_row: int, last_row: int, mode: ImportMode = ImportMode.skip
+    ) -> Dict[str, Any]:
+        """
+        Move staged rows ``first_row``..``last_row`` into books with one
+        INSERT ... SELECT. Rows whose author doesn't exist are skipped and
+        reported back by row number.
+
+        Every row is tagged with an import key and a content fingerprint. A
+        row whose key is already in books is skipped, or with ``upsert``
+        overwrites that book only if its fingerprint changed, so unchanged
+        rows are never rewritten. Within the range the last row for a key wins.
+        """
+        query = f"""
+            WITH staged AS (
+                SELECT s.*,
+                       (s.author_id IS NULL OR a.id IS NOT NULL) AS author_exists,
+                       {IMPORT_KEY_SQL} AS import_key,
+                       {IMPORT_FINGERPRINT_SQL} AS import_fingerprint
+                FROM {IMPORT_STAGING_TABLE} s
+                LEFT JOIN authors a ON a.id = s.author_id
+                WHERE s.row_number BETWEEN $1 AND $2
+            ),
+            latest AS (
+                SELECT DISTINCT ON (import_key) *
+                FROM staged
+                WHERE author_exists
+                ORDER BY import_key, row_number DESC
+            ),
+            written AS (
+                INSERT INTO books (
+                    title, content, description, published_year, genre, author_id,
+                    import_key, import_fingerprint
+                )
+                SELECT title, content, description, published_year, genre, author_id,
+                       import_key, import_fingerprint
+                FROM latest
+                ORDER BY row_number
+                ON CONFLICT (import_key) WHERE import_key IS NOT NULL
+                {IMPORT_CONFLICT_ACTIONS[mode]}
+                RETURNING (xmax = 0) AS inserted
+            )
+            SELECT
+                (SELECT COUNT(*) FILTER (WHERE inserted) FROM written) AS inserted_count,
+                (SELECT COUNT(*) FILTER (WHERE NOT inserted) FROM written) AS updated_count,
+                COUNT(*) FILTER (WHERE author_exists)
+                    - (SELECT COUNT(*) FROM written) AS skipped_count,
+                COALESCE(
+                    array_agg(row_number ORDER BY row_number) FILTER (WHERE NOT author_exists),
+                    '{{}}'
+                ) AS missing_author_rows,
+                COALESCE(
+                    array_agg(author_id ORDER BY row_number) FILTER (WHERE NOT author_exists),
+                    '{{}}'
+                ) AS missing_author_ids
+            FROM staged
+        """
+        return await self.fetch_one(query, first_row, last_row)
+
+    async def clear_import_staging(self) -> None:
+        await self.execute(f"TRUNCATE {IMPORT_STAGING_TABLE}")
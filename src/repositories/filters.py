@@ -0,0 +1,94 @@
+from typing import Any, Iterable, List, Optional
+from ..schemas.book import BookFilters
+
+
+class FilterCompiler:
+    """
+    Builds a WHERE clause with positional parameters.
+
+    Only plain, index-friendly predicates are emitted (equality, ranges,
+    ``= ANY`` lists, ILIKE for the trigram indexes) and the SQL text depends
+    on which filters are present, never on their values. Each filter shape
+    therefore maps to one statement text that asyncpg prepares once and
+    keeps in its per-connection statement cache.
+    """
+
+    def __init__(self):
+        self.conditions: List[str] = []
+        self.params: List[Any] = []
+
+    def param(self, value: Any) -> str:
+        """Bind a value and return its placeholder"""
+        self.params.append(value)
+        return f"${len(self.params)}"
+
+    def equals(self, column: str, value: Any) -> "FilterCompiler":
+        if value is not None:
+            self.conditions.append(f"{column} = {self.param(value)}")
+        return self
+
+    def range(
+        self, column: str, low: Optional[Any] = None, high: Optional[Any] = None
+    ) -> "FilterCompiler":
+        if low is not None:
+            self.conditions.append(f"{column} >= {self.param(low)}")
+        if high is not None:
+            self.conditions.append(f"{column} <= {self.param(high)}")
+        return self
+
+    def any_of(
+        self, column: str, values: Optional[Iterable[Any]], pg_type: str
+    ) -> "FilterCompiler":
+        """IN-list as a single array parameter, so the text doesn't vary with its length"""
+        if values:
+            self.conditions.append(
+                f"{column} = ANY({self.param(list(values))}::{pg_type}[])"
+            )
+        return self
+
+    def contains(self, column: str, term: Optional[str]) -> "FilterCompiler":
+        """Case-insensitive substring match, served by the trigram indexes"""
+        if term:
+            self.conditions.append(f"{column} ILIKE {self.param(f'%{term}%')}")
+        return self
+
+    def where(self, sql: str, *values: Any) -> "FilterCompiler":
+        """Add a raw predicate; ``{}`` placeholders are replaced by bound values"""
+        placeholders = [self.param(value) for value in values]
+        self.conditions.append(sql.format(*placeholders))
+        return self
+
+    @property
+    def sql(self) -> str:
+        return " AND ".join(self.conditions) if self.conditions else "TRUE"
+
+
+def compile_book_filters(filters: BookFilters) -> FilterCompiler:
+    """Compile ``BookFilters`` against ``books b``"""
+    compiler = FilterCompiler()
+    compiler.contains("b.title", filters.title)
+
+    if filters.author:
+        compiler.where(
+            "b.author_id IN (SELECT id FROM authors "
+            "WHERE first_name ILIKE {0} OR last_name ILIKE {0})",
+            f"%{filters.author}%",
+        )
+
+    compiler.any_of(
+        "b.genre",
+        [genre.value for genre in filters.genres] if filters.genres else None,
+        "varchar",
+    )
+    compiler.range("b.published_year", filters.year_from, filters.year_to)
+    return compiler
+
+
+def compile_author_search(search_term: str) -> FilterCompiler:
+    """
+    Compile a full-name search against ``authors``. The predicate matches
+    the authors_full_name_trgm_idx expression exactly.
+    """
+    return FilterCompiler().where(
+        "LOWER(first_name || ' ' || last_name) LIKE LOWER({})", f"%{search_term}%"
+    )
@@ -0,0 +1,111 @@
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from src.repositories.base import BaseRepository
+from src.schemas.book import ImportMode
+from src.schemas.import_job import ImportJobStatus
+
+
+class ImportJobRepository(BaseRepository):
+
+    async def create(
+        self,
+        filename: Optional[str],
+        content_type: str,
+        file_path: str,
+        created_by: Optional[UUID],
+        mode: ImportMode = ImportMode.skip,
+        spool_host: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        query = """
+            INSERT INTO import_jobs (filename, content_type, file_path, created_by, mode, spool_host)
+            VALUES ($1, $2, $3, $4, $5, $6)
+            RETURNING *
+        """
+        return await self.fetch_one(
+            query, filename, content_type, file_path, created_by, mode.value, spool_host
+        )
+
+    async def get_by_id(self, job_id: UUID) -> Optional[Dict[str, Any]]:
+        query = "SELECT * FROM import_jobs WHERE id = $1"
+        return await self.fetch_one(query, job_id)
+
+    async def get_unfinished(self, spool_host: str) -> List[Dict[str, Any]]:
+        """
+        Jobs that were queued or interrupted, oldest first, whose upload was
+        spooled on ``spool_host`` or whose host wasn't recorded
+        """
+        query = """
+            SELECT id, file_path, spool_host FROM import_jobs
+            WHERE status IN ('pending', 'running')
+              AND (spool_host = $1 OR spool_host IS NULL)
+            ORDER BY created_at
+        """
+        return await self.fetch_all(query, spool_host)
+
+    async def mark_running(self, job_id: UUID) -> Optional[Dict[str, Any]]:
+        """Claim an unfinished job; returns None if it already finished"""
+        query = """
+            UPDATE import_jobs
+            SET status = 'running',
+                started_at = COALESCE(started_at, CURRENT_TIMESTAMP),
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = $1 AND status IN ('pending', 'running')
+            RETURNING *
+        """
+        return await self.fetch_one(query, job_id)
+
+    async def commit_batch(
+        self,
+        job_id: UUID,
+        last_committed_row: int,
+        success_count: int,
+        errors: List[str],
+        max_errors: int,
+        updated_count: int = 0,
+        skipped_count: int = 0,
+    ) -> None:
+        """
+        Record a batch's progress. Called inside the batch's transaction, so
+        ``last_committed_row`` always matches the rows actually in books.
+        Only the first ``max_errors`` messages are kept; the count is exact.
+        """
+        query = """
+            UPDATE import_jobs
+            SET last_committed_row = $2,
+                success_count = success_count + $3,
+                error_count = error_count + $4,
+                updated_count = updated_count + $7,
+                skipped_count = skipped_count + $8,
+                errors = CASE
+                    WHEN jsonb_array_length(errors) >= $6 THEN errors
+                    ELSE errors || (
+                        SELECT COALESCE(jsonb_agg(e), '[]')
+                        FROM (SELECT e FROM jsonb_array_elements($5::jsonb) e
+                              LIMIT $6 - jsonb_array_length(errors)) limited
+                    )
+                END,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = $1
+        """
+        await self.execute(
+            query,
+            job_id,
+            last_committed_row,
+            success_count,
+            len(errors),
+            errors,
+            max_errors,
+            updated_count,
+            skipped_count,
+        )
+
+    async def finish(
+        self, job_id: UUID, status: ImportJobStatus, error_message: Optional[str] = None
+    ) -> None:
+        query = """
+            UPDATE import_jobs
+            SET status = $2, error_message = $3,
+                finished_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+            WHERE id = $1
+        """
+        await self.execute(query, job_id, status.value, error_message)
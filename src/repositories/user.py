@@ -1,28 +1,54 @@
 from typing import List, Optional, Dict, Any
 from uuid import UUID
+from src.core.cache import user_cache
 from src.repositories.base import BaseRepository
 from src.schemas.user import UserCreate, UserUpdate
 
 
 class UserRepository(BaseRepository):
 
-    async def create(
+    async def create_unique(
         self, user_data: UserCreate, hashed_password: str
     ) -> Dict[str, Any]:
-        """Create a new user with hashed password"""
+        """
+        Insert a user unless the username or email is taken, in a single
+        statement. Returns ``{"user": <row or None>, "username_taken": bool,
+        "email_taken": bool}``; the flags are only meaningful without a row.
+        """
         query = """
-            INSERT INTO users (username, email, full_name, hashed_password, is_active)
-            VALUES ($1, $2, $3, $4, $5)
-            RETURNING id, username, email, full_name, is_active, created_at, updated_at
+            WITH inserted AS (
+                INSERT INTO users (username, email, full_name, hashed_password, is_active)
+                VALUES ($1, $2, $3, $4, $5)
+                ON CONFLICT DO NOTHING
+                RETURNING id, username, email, full_name, is_active, created_at, updated_at
+            )
+            SELECT
+                inserted.*,
+                EXISTS (SELECT 1 FROM users WHERE username = $1) AS username_taken,
+                EXISTS (SELECT 1 FROM users WHERE email = $2) AS email_taken
+            FROM (VALUES (1)) AS one
+            LEFT JOIN inserted ON true
         """
-        return await self.fetch_one(
-            query,
+        args = (
             user_data.username.lower(),
             user_data.email.lower(),
             user_data.full_name,
             hashed_password,
             user_data.is_active,
         )
+        row = await self.fetch_one(query, *args)
+        if row["id"] is None and not (row["username_taken"] or row["email_taken"]):
+            # The conflicting row committed after this statement's snapshot
+            # was taken; a new statement sees it
+            row = await self.fetch_one(query, *args)
+
+        username_taken = row.pop("username_taken")
+        email_taken = row.pop("email_taken")
+        return {
+            "user": row if row["id"] is not None else None,
+            "username_taken": username_taken,
+            "email_taken": email_taken,
+        }
 
     async def get_by_id(self, user_id: UUID) -> Optional[Dict[str, Any]]:
         """Get user by ID"""
@@ -76,10 +102,18 @@ class UserRepository(BaseRepository):
             WHERE id = ${param_count}
             RETURNING id, username, email, full_name, is_active, created_at, updated_at
         """
-        return await self.fetch_one(query, *values)
+        user = await self.fetch_one(query, *values)
+        user_cache.invalidate(user_id)
+        return user
+
+    async def update_password_hash(self, user_id: UUID, hashed_password: str) -> None:
+        """Replace a password hash (rehash on login); not a profile update"""
+        query = "UPDATE users SET hashed_password = $2 WHERE id = $1"
+        await self.execute(query, user_id, hashed_password)
 
     async def delete(self, user_id: UUID) -> bool:
         """Delete user (soft delete by setting is_active = false)"""
         query = "UPDATE users SET is_active = false WHERE id = $1"
         result = await self.execute(query, user_id)
+        user_cache.invalidate(user_id)
         return "UPDATE 1" in result
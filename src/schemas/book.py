@@ -49,6 +49,8 @@ class BookBase(BaseModel):
 
     @field_validator("published_year")
     def validate_published_year(cls, v):
+        if v is None:
+            return v
         current_year = datetime.now().year
         if v < 1800:
             raise ValueError("Published year cannot be before 1800")
@@ -114,6 +116,8 @@ class BookUpdate(BaseModel):
 
 class Book(BookBase):
     id: UUID
+    # The column is nullable, so a stored book may have no year
+    published_year: Optional[int] = None
     author: Optional[Author] = None
     created_at: datetime
     updated_at: datetime
@@ -122,22 +126,41 @@ class Book(BookBase):
         from_attributes = True
 
 
+class BookSearchResult(Book):
+    rank: float
+    # HTML: the book text is escaped, matches are wrapped in <mark>
+    highlight: Optional[str] = None
+
+
 class BookFilters(BaseModel):
     title: Optional[str] = None
     author: Optional[str] = None
-    genre: Optional[Genre] = None
+    genres: Optional[List[Genre]] = None
     year_from: Optional[int] = Field(None, ge=1800, le=datetime.now().year)
     year_to: Optional[int] = Field(None, ge=1800, le=datetime.now().year)
 
     @field_validator("year_to")
-    def validate_year_range(cls, v, values):
-        if v and "year_from" in values and values["year_from"]:
-            if v < values["year_from"]:
-                raise ValueError("year_to must be greater than or equal to year_from")
+    def validate_year_range(cls, v, info):
+        year_from = info.data.get("year_from")
+        if v and year_from and v < year_from:
+            raise ValueError("year_to must be greater than or equal to year_from")
         return v
 
 
+class ExportFormat(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+    json = "json"
+
+
+class ImportMode(str, Enum):
+    skip = "skip"
+    upsert = "upsert"
+
+
 class BulkImportResponse(BaseModel):
     success_count: int
     error_count: int
+    updated_count: int = 0
+    skipped_count: int = 0
     errors: List[str] = []
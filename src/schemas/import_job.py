@@ -0,0 +1,34 @@
+from enum import Enum
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+from uuid import UUID
+from .book import ImportMode
+
+
+class ImportJobStatus(str, Enum):
+    pending = "pending"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
+
+class ImportJob(BaseModel):
+    id: UUID
+    status: ImportJobStatus
+    filename: Optional[str] = None
+    mode: ImportMode = ImportMode.skip
+    processed_rows: int
+    success_count: int
+    error_count: int
+    updated_count: int = 0
+    skipped_count: int = 0
+    errors: List[str] = []
+    error_message: Optional[str] = None
+    rows_per_second: Optional[float] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
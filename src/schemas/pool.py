@@ -0,0 +1,48 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class AcquireLatency(BaseModel):
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+class PoolStatus(BaseModel):
+    name: str
+    min_size: int
+    max_size: int
+    size: int
+    in_use: int
+    idle: int
+    waiting: int
+    acquired_total: int
+    acquire_timeouts: int
+    acquire_latency: AcquireLatency
+
+
+class PoolStatsResponse(BaseModel):
+    pools: List[PoolStatus]
+
+
+class PasswordHasherStatus(BaseModel):
+    workers: int
+    max_pending: int
+    running: int
+    queued: int
+    completed: int
+    rejected: int
+    queue_wait: AcquireLatency
+    hash_time: AcquireLatency
+
+
+class CacheStatus(BaseModel):
+    size: int
+    max_size: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
+    invalidations: int
@@ -1,11 +1,12 @@
+from typing import Optional
 from uuid import UUID
-import asyncpg
 from datetime import timedelta
+from src.core.cache import user_cache
+from src.core.database import ConnectionProvider
 from src.repositories.user import UserRepository
 from src.schemas.user import UserCreate, UserLogin, User, Token
 from src.core.security import (
-    verify_password,
-    get_password_hash,
+    password_hasher,
     create_access_token,
     ACCESS_TOKEN_EXPIRE_MINUTES,
 )
@@ -19,36 +20,47 @@ from src.core.exceptions import (
 
 
 class AuthService:
-    def __init__(self, connection: asyncpg.Connection):
+    def __init__(self, connection: ConnectionProvider):
         self.user_repo = UserRepository(connection)
 
     async def register_user(self, user_data: UserCreate) -> User:
-        """Register a new user"""
-        existing_user = await self.user_repo.get_by_username(user_data.username)
-        if existing_user:
-            raise http_409_conflict(f"Username '{user_data.username}' already exists")
+        """
+        Register a new user. The password is hashed first, off the event loop
+        and without holding a connection; the uniqueness checks and the
+        insert are then one statement, so concurrent sign-ups for the same
+        name can't both pass a check and race to the insert.
+        """
+        hashed_password = await password_hasher.hash(user_data.password)
+        result = await self.user_repo.create_unique(user_data, hashed_password)
 
-        existing_email = await self.user_repo.get_by_email(user_data.email)
-        if existing_email:
+        if result["user"] is None:
+            if result["username_taken"]:
+                raise http_409_conflict(f"Username '{user_data.username}' already exists")
             raise http_409_conflict(f"Email '{user_data.email}' already exists")
 
-        hashed_password = get_password_hash(user_data.password)
-        user = await self.user_repo.create(user_data, hashed_password)
-
-        return User(**user)
+        return User(**result["user"])
 
     async def authenticate_user(self, login_data: UserLogin) -> Token:
-        """Authenticate user and return JWT token"""
+        """
+        Authenticate user and return JWT token. A password hashed with an
+        outdated bcrypt cost is rehashed with the current one.
+        """
         user = await self.user_repo.get_by_username(login_data.username)
+        if not user:
+            raise http_401_unauthorized("Invalid username or password")
 
-        if not user or not verify_password(
+        valid, new_hash = await password_hasher.verify_and_update(
             login_data.password, user["hashed_password"]
-        ):
+        )
+        if not valid:
             raise http_401_unauthorized("Invalid username or password")
 
         if not user["is_active"]:
             raise http_401_unauthorized("User account is deactivated")
 
+        if new_hash:
+            await self.user_repo.update_password_hash(user["id"], new_hash)
+
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
             data={"sub": str(user["id"]), "username": user["username"]},
@@ -62,9 +74,13 @@ class AuthService:
         )
 
     async def get_user_by_id(self, user_id: UUID) -> User:
-        """Get user by ID"""
-        user = await self.user_repo.get_by_id(user_id)
+        """Get user by ID, from the user cache when possible"""
+        user = await user_cache.get_or_load(user_id, lambda: self._load_user(user_id))
         if not user:
             raise NotFoundError(f"User with id {user_id} not found")
 
-        return User(**user)
+        return user
+
+    async def _load_user(self, user_id: UUID) -> Optional[User]:
+        user = await self.user_repo.get_by_id(user_id)
+        return User(**user) if user else None
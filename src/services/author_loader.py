@@ -0,0 +1,50 @@
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+from uuid import UUID
+from src.schemas.author import Author
+
+
+class AuthorLoader:
+    """
+    Request-scoped, DataLoader-style author cache.
+
+    Authors embedded in joined book rows are primed for free; anything else
+    is fetched with a single batched query per ``load_many`` call.
+    """
+
+    def __init__(
+        self, batch_load: Callable[[List[UUID]], Awaitable[List[Dict[str, Any]]]]
+    ):
+        self._batch_load = batch_load
+        self._cache: Dict[UUID, Optional[Author]] = {}
+
+    def prime(self, book_row: Dict[str, Any]) -> None:
+        """Cache the author columns of a book row joined with authors"""
+        author_id = book_row.get("author_id")
+        if not author_id or author_id in self._cache:
+            return
+        if book_row.get("first_name") is None or "author_created_at" not in book_row:
+            return
+
+        self._cache[author_id] = Author(
+            id=author_id,
+            first_name=book_row["first_name"],
+            last_name=book_row["last_name"],
+            biography=book_row.get("biography"),
+            created_at=book_row["author_created_at"],
+            updated_at=book_row["author_updated_at"],
+        )
+
+    async def load(self, author_id: UUID) -> Optional[Author]:
+        return (await self.load_many([author_id]))[0]
+
+    async def load_many(self, author_ids: Iterable[UUID]) -> List[Optional[Author]]:
+        author_ids = list(author_ids)
+        missing = list(dict.fromkeys(i for i in author_ids if i not in self._cache))
+
+        if missing:
+            rows = await self._batch_load(missing)
+            found = {row["id"]: Author(**row) for row in rows}
+            for author_id in missing:
+                self._cache[author_id] = found.get(author_id)
+
+        return [self._cache[author_id] for author_id in author_ids]
@@ -0,0 +1,66 @@
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Tuple, Union
+from uuid import UUID
+from src.schemas.author import AuthorCreate
+
+
+class AuthorResolver:
+    """
+    Import-scoped map from author names to ids.
+
+    Unknown names are resolved in bulk with one upsert per ``resolve_many``
+    call and cached for the rest of the file, so a heavily repeated author
+    costs one lookup per import rather than one per row.
+    """
+
+    def __init__(
+        self,
+        batch_upsert: Callable[[List[str], List[str]], Awaitable[List[Dict[str, Any]]]],
+    ):
+        self._batch_upsert = batch_upsert
+        self._names: Dict[str, Union[Tuple[str, str], ValueError]] = {}
+        self._ids: Dict[Tuple[str, str], UUID] = {}
+
+    @staticmethod
+    def normalize(author_name: str) -> str:
+        return " ".join(author_name.split())
+
+    @staticmethod
+    def split_name(author_name: str) -> Tuple[str, str]:
+        """Last word is the last name; a single word gets the "Author" last name"""
+        name_parts = author_name.split()
+        if len(name_parts) >= 2:
+            return " ".join(name_parts[:-1]), name_parts[-1]
+        return (name_parts[0] if name_parts else "Unknown"), "Author"
+
+    async def resolve_many(self, author_names: Iterable[str]) -> None:
+        """Resolve every author not cached yet with a single upsert"""
+        pending = set()
+        for name in dict.fromkeys(map(self.normalize, author_names)):
+            if name in self._names:
+                continue
+            first_name, last_name = self.split_name(name)
+            try:
+                author = AuthorCreate(first_name=first_name, last_name=last_name)
+            except ValueError as e:
+                self._names[name] = ValueError(f"Invalid author name '{name}': {e}")
+                continue
+            key = (author.first_name, author.last_name)
+            self._names[name] = key
+            if key not in self._ids:
+                pending.add(key)
+
+        if not pending:
+            return
+
+        # Sorted so concurrent imports take the unique-index locks in the same order
+        first_names, last_names = zip(*sorted(pending))
+        rows = await self._batch_upsert(list(first_names), list(last_names))
+        for row in rows:
+            self._ids[(row["first_name"], row["last_name"])] = row["id"]
+
+    def get(self, author_name: str) -> UUID:
+        """Id of a name passed to ``resolve_many``; raises ValueError for invalid names"""
+        key = self._names[self.normalize(author_name)]
+        if isinstance(key, ValueError):
+            raise key
+        return self._ids[key]
@@ -1,13 +1,15 @@
+from typing import Optional
 from uuid import UUID
-import asyncpg
 from fastapi import HTTPException, status
+from src.core.cursor import decode_cursor, paginate_rows
 from src.repositories.author import AuthorRepository
 from src.schemas.author import AuthorCreate, AuthorUpdate, Author
-from src.schemas.pagination import PaginatedResponse
+from src.schemas.pagination import CountMode, PaginatedResponse
+from src.core.database import ConnectionProvider
 
 
 class AuthorService:
-    def __init__(self, connection: asyncpg.Connection):
+    def __init__(self, connection: ConnectionProvider):
         self.author_repo = AuthorRepository(connection)
 
     async def create_author(self, author_data: AuthorCreate) -> Author:
@@ -24,11 +26,50 @@ class AuthorService:
         return Author(**author)
 
     async def get_authors(
-        self, page: int = 1, size: int = 20
+        self,
+        page: int = 1,
+        size: int = 20,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.exact,
+    ) -> PaginatedResponse[Author]:
+        decoded_cursor = (
+            decode_cursor(cursor, "name", "asc", key_length=2) if cursor else None
+        )
+        offset = 0 if decoded_cursor else (page - 1) * size
+        authors, total = await self.author_repo.get_page(
+            size + 1, offset, decoded_cursor, count_mode
+        )
+
+        authors, next_cursor, prev_cursor = paginate_rows(
+            authors,
+            size,
+            decoded_cursor,
+            page,
+            AuthorRepository.sort_key,
+            "name",
+            "asc",
+        )
+
+        return PaginatedResponse(
+            items=[Author(**author) for author in authors],
+            total=total,
+            page=None if decoded_cursor else page,
+            size=size,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
+        )
+
+    async def search_authors(
+        self,
+        search_term: str,
+        page: int = 1,
+        size: int = 20,
+        count_mode: CountMode = CountMode.exact,
     ) -> PaginatedResponse[Author]:
         offset = (page - 1) * size
-        authors = await self.author_repo.get_all(size, offset)
-        total = await self.author_repo.get_total_count()
+        authors, total = await self.author_repo.search_page(
+            search_term, size, offset, count_mode
+        )
 
         return PaginatedResponse(
             items=[Author(**author) for author in authors],
@@ -38,22 +79,18 @@ class AuthorService:
         )
 
     async def update_author(self, author_id: UUID, author_data: AuthorUpdate) -> Author:
-        existing = await self.author_repo.get_by_id(author_id)
-        if not existing:
+        updated_author = await self.author_repo.update(author_id, author_data)
+        if not updated_author:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Author with id {author_id} not found",
             )
-
-        updated_author = await self.author_repo.update(author_id, author_data)
         return Author(**updated_author)
 
     async def delete_author(self, author_id: UUID) -> bool:
-        existing = await self.author_repo.get_by_id(author_id)
-        if not existing:
+        if not await self.author_repo.delete(author_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Author with id {author_id} not found",
             )
-
-        return await self.author_repo.delete(author_id)
+        return True
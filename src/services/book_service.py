@@ -1,29 +1,29 @@
-from typing import Dict, Any
-from uuid import UUID
 import asyncpg
+from typing import Dict, Any, Optional
+from uuid import UUID
 from datetime import datetime, timezone
 from fastapi import HTTPException, status
+from src.core.cursor import decode_cursor, paginate_rows
+from src.core.exceptions import http_400_bad_request
 from src.repositories.book import BookRepository
 from src.repositories.author import AuthorRepository
-from src.schemas.book import BookCreate, BookUpdate, BookFilters, Book
-from src.schemas.pagination import PaginatedResponse
+from src.services.author_loader import AuthorLoader
+from src.schemas.book import BookCreate, BookUpdate, BookFilters, Book, BookSearchResult
+from src.schemas.pagination import CountMode, PaginatedResponse
+from src.core.database import ConnectionProvider
 
 
 class BookService:
-    def __init__(self, connection: asyncpg.Connection):
+    def __init__(self, connection: ConnectionProvider):
         self.book_repo = BookRepository(connection)
         self.author_repo = AuthorRepository(connection)
+        self.author_loader = AuthorLoader(self.author_repo.get_by_ids)
 
     async def create_book(self, book_data: BookCreate) -> Book:
-        if book_data.author_id:
-            author = await self.author_repo.get_by_id(book_data.author_id)
-            if not author:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Author with id {book_data.author_id} not found",
-                )
-
-        book = await self.book_repo.create(book_data)
+        try:
+            book = await self.book_repo.create(book_data)
+        except asyncpg.ForeignKeyViolationError:
+            self._raise_author_not_found(book_data.author_id)
         return await self._format_book_response(book)
 
     async def get_book_by_id(self, book_id: UUID) -> Book:
@@ -42,59 +42,121 @@ class BookService:
         size: int = 20,
         sort_by: str = "title",
         sort_order: str = "asc",
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.exact,
     ) -> PaginatedResponse[Book]:
-        offset = (page - 1) * size
+        keyset = sort_by not in BookRepository.OFFSET_ONLY_SORTS
+        if cursor and not keyset:
+            raise http_400_bad_request(
+                f"Cursor pagination is not supported when sorting by {sort_by}; use page"
+            )
+        decoded_cursor = (
+            decode_cursor(cursor, sort_by, sort_order) if cursor else None
+        )
+        offset = 0 if decoded_cursor else (page - 1) * size
 
-        books = await self.book_repo.get_all(filters, size, offset, sort_by, sort_order)
-        total = await self.book_repo.get_total_count(filters)
+        books, total = await self.book_repo.get_page(
+            filters, size + 1, offset, sort_by, sort_order, decoded_cursor, count_mode
+        )
+
+        books, next_cursor, prev_cursor = paginate_rows(
+            books,
+            size,
+            decoded_cursor,
+            page,
+            lambda book: BookRepository.sort_key(book, sort_by),
+            sort_by,
+            sort_order,
+        )
+        if not keyset:
+            next_cursor = prev_cursor = None
+
+        for book in books:
+            self.author_loader.prime(book)
+        await self.author_loader.load_many(
+            book["author_id"] for book in books if book.get("author_id")
+        )
 
         formatted_books = [await self._format_book_response(book) for book in books]
 
         return PaginatedResponse(
-            items=formatted_books, total=total, page=page, size=size
+            items=formatted_books,
+            total=total,
+            page=None if decoded_cursor else page,
+            size=size,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
         )
 
+    async def search_books(
+        self,
+        search_query: str,
+        page: int = 1,
+        size: int = 20,
+        count_mode: CountMode = CountMode.exact,
+    ) -> PaginatedResponse[BookSearchResult]:
+        offset = (page - 1) * size
+        books, total = await self.book_repo.search(
+            search_query, size, offset, count_mode
+        )
+
+        for book in books:
+            self.author_loader.prime(book)
+
+        results = []
+        for book in books:
+            formatted = await self._format_book_response(book)
+            results.append(
+                BookSearchResult(
+                    **formatted.model_dump(),
+                    rank=book["rank"],
+                    highlight=book["highlight"],
+                )
+            )
+
+        return PaginatedResponse(items=results, total=total, page=page, size=size)
+
     async def update_book(self, book_id: UUID, book_data: BookUpdate) -> Book:
-        existing = await self.book_repo.get_by_id(book_id)
-        if not existing:
+        try:
+            updated_book = await self.book_repo.update(book_id, book_data)
+        except asyncpg.ForeignKeyViolationError:
+            self._raise_author_not_found(book_data.author_id)
+
+        if not updated_book:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Book with id {book_id} not found",
             )
-
-        if book_data.author_id:
-            author = await self.author_repo.get_by_id(book_data.author_id)
-            if not author:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Author with id {book_data.author_id} not found",
-                )
-
-        updated_book = await self.book_repo.update(book_id, book_data)
         return await self._format_book_response(updated_book)
 
     async def delete_book(self, book_id: UUID) -> bool:
-        existing = await self.book_repo.get_by_id(book_id)
-        if not existing:
+        if not await self.book_repo.delete(book_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Book with id {book_id} not found",
             )
+        return True
 
-        return await self.book_repo.delete(book_id)
+    @staticmethod
+    def _raise_author_not_found(author_id: Optional[UUID]) -> None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Author with id {author_id} not found",
+        )
 
     async def _format_book_response(self, book_data: Dict[str, Any]) -> Book:
         """Format book data with author"""
         author = None
         if book_data.get("author_id"):
-            author = await self.author_repo.get_by_id(book_data["author_id"])
+            self.author_loader.prime(book_data)
+            author = await self.author_loader.load(book_data["author_id"])
 
         return Book(
             id=book_data["id"],
             title=book_data["title"],
             content=book_data["content"],
             description=book_data["description"],
-            published_year=int(book_data["published_year"]),
+            published_year=book_data["published_year"],
             genre=book_data["genre"],
             author=author,
             created_at=book_data.get("created_at", datetime.now(timezone.utc)),
@@ -0,0 +1,169 @@
+import csv
+import io
+import zlib
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, Optional
+import orjson
+from src.core.database import ConnectionProvider
+from src.core.settings import settings
+from src.repositories.book import BookRepository
+from src.schemas.book import BookFilters, ExportFormat
+
+CSV_COLUMNS = (
+    "id", "title", "content", "description", "published_year", "genre",
+    "author_id", "author_first_name", "author_last_name", "created_at", "updated_at",
+)
+
+MEDIA_TYPES = {
+    ExportFormat.csv: "text/csv",
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.json: "application/json",
+}
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Whether an Accept-Encoding header allows a gzip response"""
+    for coding in (accept_encoding or "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() not in ("gzip", "*"):
+            continue
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def _book_document(record: Any) -> Dict[str, Any]:
+    """Joined book row shaped like the Book schema, without model validation"""
+    author = None
+    if record["author_id"]:
+        author = {
+            "id": record["author_id"],
+            "first_name": record["first_name"],
+            "last_name": record["last_name"],
+            "biography": record["biography"],
+            "created_at": record["author_created_at"],
+            "updated_at": record["author_updated_at"],
+        }
+    return {
+        "id": record["id"],
+        "title": record["title"],
+        "content": record["content"],
+        "description": record["description"],
+        "published_year": record["published_year"],
+        "genre": record["genre"],
+        "author": author,
+        "created_at": record["created_at"],
+        "updated_at": record["updated_at"],
+    }
+
+
+def _csv_row(record: Any) -> tuple:
+    return (
+        record["id"],
+        record["title"],
+        record["content"],
+        record["description"],
+        record["published_year"],
+        record["genre"],
+        record["author_id"],
+        record["first_name"],
+        record["last_name"],
+        record["created_at"].isoformat(),
+        record["updated_at"].isoformat(),
+    )
+
+
+async def csv_chunks(records: AsyncIterator[Any], chunk_size: int) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    async for record in records:
+        writer.writerow(_csv_row(record))
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+async def json_chunks(
+    records: AsyncIterator[Any],
+    chunk_size: int,
+    start: bytes = b"[",
+    separator: bytes = b",",
+    end: bytes = b"]",
+    option: int = 0,
+) -> AsyncIterator[bytes]:
+    """
+    Serialize records as ``start``, documents joined by ``separator``, ``end``.
+    The defaults write a JSON array; NDJSON is no delimiters plus a newline
+    appended by orjson.
+    """
+    parts = [start]
+    size = len(start)
+    first = True
+    async for record in records:
+        if not first:
+            parts.append(separator)
+            size += len(separator)
+        first = False
+        # default=str covers asyncpg's own UUID type
+        document = orjson.dumps(_book_document(record), default=str, option=option)
+        parts.append(document)
+        size += len(document)
+        if size >= chunk_size:
+            yield b"".join(parts)
+            parts = []
+            size = 0
+    parts.append(end)
+    yield b"".join(parts)
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes], level: int) -> AsyncIterator[bytes]:
+    """Compress a byte stream into a single gzip member as it is produced"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+class ExportService:
+    def __init__(self, connection: ConnectionProvider):
+        self.book_repo = BookRepository(connection)
+
+    async def export_books(
+        self, filters: BookFilters, export_format: ExportFormat, compress: bool = False
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream the filtered books in ``export_format``. Rows come from a
+        server-side cursor and leave as roughly EXPORT_CHUNK_SIZE byte chunks,
+        so memory stays flat regardless of how many books match.
+        """
+        records = self.book_repo.stream_filtered(filters, settings.EXPORT_PREFETCH_ROWS)
+        chunk_size = settings.EXPORT_CHUNK_SIZE
+
+        # Close the cursor here, in the request task, rather than leaving it
+        # to the async generator finalizer when serialization fails or the
+        # client goes away
+        async with aclosing(records):
+            if export_format == ExportFormat.csv:
+                chunks = csv_chunks(records, chunk_size)
+            elif export_format == ExportFormat.ndjson:
+                chunks = json_chunks(
+                    records, chunk_size, b"", b"", b"", option=orjson.OPT_APPEND_NEWLINE
+                )
+            else:
+                chunks = json_chunks(records, chunk_size)
+
+            if compress:
+                chunks = gzip_chunks(chunks, settings.EXPORT_GZIP_LEVEL)
+
+            async for chunk in chunks:
+                yield chunk
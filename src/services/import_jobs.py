@@ -0,0 +1,220 @@
+import asyncio
+import itertools
+import logging
+import os
+import shutil
+from datetime import datetime, timezone
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+from src.core.database import ConnectionProvider, database
+from src.core.settings import settings
+from src.repositories.import_job import ImportJobRepository
+from src.schemas.book import ImportMode
+from src.schemas.import_job import ImportJob, ImportJobStatus
+from src.services.import_parsers import open_rows, resolve_format
+from src.services.import_service import ImportService
+
+logger = logging.getLogger(__name__)
+
+def to_import_job(row: Dict[str, Any]) -> ImportJob:
+    """API view of a job row, with throughput derived from its timestamps"""
+    rows_per_second = None
+    if row["started_at"]:
+        finished_at = row["finished_at"] or datetime.now(timezone.utc)
+        elapsed = (finished_at - row["started_at"]).total_seconds()
+        if elapsed > 0:
+            rows_per_second = round(row["last_committed_row"] / elapsed, 1)
+
+    return ImportJob(
+        id=row["id"],
+        status=row["status"],
+        filename=row["filename"],
+        mode=row["mode"],
+        processed_rows=row["last_committed_row"],
+        success_count=row["success_count"],
+        error_count=row["error_count"],
+        updated_count=row["updated_count"],
+        skipped_count=row["skipped_count"],
+        errors=row["errors"],
+        error_message=row["error_message"],
+        rows_per_second=rows_per_second,
+        created_at=row["created_at"],
+        started_at=row["started_at"],
+        finished_at=row["finished_at"],
+    )
+
+
+class ImportJobRunner:
+    """
+    Bounded in-process worker pool for background imports.
+
+    Each batch commits together with the job's ``last_committed_row``, so a
+    job interrupted by a restart resumes after its last committed batch.
+    Jobs are claimed with a session advisory lock, so several app processes
+    can recover the same queue without processing a job twice. Uploads are
+    spooled to local disk, so a process only recovers jobs spooled on its
+    own host (``IMPORT_SPOOL_HOST``).
+    """
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"import-worker-{index}")
+            for index in range(settings.IMPORT_WORKERS)
+        ]
+        await self.recover()
+
+    async def stop(self) -> None:
+        """Interrupted jobs stay 'running' and are resumed on the next start"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    async def recover(self) -> None:
+        jobs = await ImportJobRepository(database.provider()).get_unfinished(
+            settings.IMPORT_SPOOL_HOST
+        )
+        # Jobs from before the host was recorded are taken by whichever
+        # host still has their file
+        job_ids = [
+            job["id"] for job in jobs
+            if job["spool_host"] is not None or os.path.exists(job["file_path"])
+        ]
+        for job_id in job_ids:
+            self.submit(job_id)
+        if job_ids:
+            logger.info(f"Resuming {len(job_ids)} import job(s)")
+
+    def submit(self, job_id: UUID) -> None:
+        if self._queue is None:
+            raise RuntimeError("Import job runner is not started.")
+        self._queue.put_nowait(job_id)
+
+    async def enqueue_upload(
+        self,
+        connection: ConnectionProvider,
+        file: UploadFile,
+        created_by: Optional[UUID],
+        mode: ImportMode = ImportMode.skip,
+    ) -> ImportJob:
+        """
+        Spool the upload to local disk as received (still compressed, if it
+        was), record the job with the detected format and queue it
+        """
+        media_type, _ = await run_in_threadpool(
+            resolve_format, file.file, file.content_type, file.filename
+        )
+
+        os.makedirs(settings.IMPORT_SPOOL_DIR, exist_ok=True)
+        file_path = os.path.join(settings.IMPORT_SPOOL_DIR, f"{uuid4()}.upload")
+        await run_in_threadpool(_spool, file.file, file_path)
+
+        try:
+            job = await ImportJobRepository(connection).create(
+                file.filename, media_type, file_path, created_by, mode,
+                settings.IMPORT_SPOOL_HOST,
+            )
+        except Exception:
+            os.remove(file_path)
+            raise
+
+        self.submit(job["id"])
+        return to_import_job(job)
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self.run_job(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Import job {job_id} crashed: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def run_job(self, job_id: UUID) -> None:
+        provider = database.provider()
+        async with provider.acquire() as connection:
+            claimed = await connection.fetchval(
+                "SELECT pg_try_advisory_lock(hashtext('import_job'), hashtext($1::text))",
+                str(job_id),
+            )
+            if not claimed:
+                return
+            try:
+                await self._process(provider, job_id)
+            finally:
+                await connection.execute(
+                    "SELECT pg_advisory_unlock(hashtext('import_job'), hashtext($1::text))",
+                    str(job_id),
+                )
+
+    async def _process(self, provider: ConnectionProvider, job_id: UUID) -> None:
+        jobs = ImportJobRepository(provider)
+        job = await jobs.mark_running(job_id)
+        if not job:
+            return
+
+        try:
+            with open(job["file_path"], "rb") as stream:
+                rows = await run_in_threadpool(
+                    open_rows, stream, job["content_type"], job["filename"]
+                )
+                offset = job["last_committed_row"]
+                await run_in_threadpool(_skip, rows, offset)
+
+                service = ImportService(provider, ImportMode(job["mode"]))
+                async for batch in service.read_batches(rows):
+                    errors: List[Tuple[int, str]] = []
+                    async with provider.transaction():
+                        counts = await service.import_batch(batch, offset, errors)
+                        offset += len(batch)
+                        await jobs.commit_batch(
+                            job_id,
+                            offset,
+                            counts["inserted"] + counts["updated"],
+                            service.format_errors(errors),
+                            settings.IMPORT_JOB_MAX_ERRORS,
+                            counts["updated"],
+                            counts["skipped"],
+                        )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            message = e.detail if isinstance(e, HTTPException) else str(e)
+            logger.error(f"Import job {job_id} failed: {message}")
+            await jobs.finish(job_id, ImportJobStatus.failed, str(message))
+        else:
+            await jobs.finish(job_id, ImportJobStatus.completed)
+
+        _remove(job["file_path"])
+
+
+def _spool(source: BinaryIO, file_path: str) -> None:
+    source.seek(0)
+    with open(file_path, "wb") as target:
+        shutil.copyfileobj(source, target, length=1024 * 1024)
+
+
+def _skip(rows, count: int) -> None:
+    """Advance past rows already committed by an earlier run"""
+    next(itertools.islice(rows, count, count), None)
+
+
+def _remove(file_path: str) -> None:
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+
+
+import_job_runner = ImportJobRunner()
@@ -0,0 +1,340 @@
+import codecs
+import csv
+import gzip
+import io
+import json
+import os
+import re
+import zlib
+from typing import Any, BinaryIO, Callable, Dict, Iterator, Optional, Tuple
+
+import orjson
+from fastapi import HTTPException
+
+from src.core.settings import settings
+
+READ_CHUNK_SIZE = 64 * 1024
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Declared content types that only say the body is compressed
+COMPRESSED_TYPES = {
+    "application/gzip": "gzip",
+    "application/x-gzip": "gzip",
+    "application/zstd": "zstd",
+}
+GENERIC_TYPES = {"", "application/octet-stream"}
+COMPRESSION_EXTENSIONS = {".gz", ".gzip", ".zst", ".zstd"}
+FORMAT_EXTENSIONS = {
+    ".json": "application/json",
+    ".csv": "text/csv",
+    ".ndjson": "application/x-ndjson",
+    ".jsonl": "application/x-ndjson",
+}
+
+DECOMPRESSION_ERRORS: Tuple[type, ...] = (OSError, EOFError, zlib.error)
+
+_json_decoder = json.JSONDecoder()
+
+
+def iter_csv_rows(stream: BinaryIO) -> Iterator[Dict[str, Any]]:
+    """Yield CSV rows as dicts, reading the file incrementally"""
+    text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    try:
+        for row in csv.DictReader(text):
+            yield dict(row)
+    except (csv.Error, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"CSV parsing error: {e}")
+    finally:
+        text.detach()
+
+
+def iter_ndjson_rows(stream: BinaryIO) -> Iterator[Dict[str, Any]]:
+    """Yield one row per non-blank line of newline-delimited JSON"""
+    text = io.TextIOWrapper(stream, encoding="utf-8")
+    line_number = 0
+    try:
+        for line_number, line in enumerate(text, start=1):
+            if line.strip():
+                yield orjson.loads(line)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(
+            status_code=400, detail=f"Invalid NDJSON on line {line_number}: {e}"
+        )
+    finally:
+        text.detach()
+
+
+_NUMBER_TAIL = re.compile(r"[.eE][-+]?")
+_JSON_LITERALS = ("true", "false", "null", "NaN", "Infinity", "-Infinity")
+
+
+def _is_truncated(error: json.JSONDecodeError, buffer: str) -> bool:
+    """Whether a decode error could go away with more input"""
+    if error.pos >= len(buffer) or error.msg.startswith("Unterminated string"):
+        return True
+    if error.msg.startswith("Invalid \\uXXXX escape"):
+        return error.pos + 5 >= len(buffer)
+    # "tru", "-" or a number's "1." / "1e+" at the end of the buffer
+    tail = buffer[error.pos:]
+    return (
+        any(literal.startswith(tail) for literal in _JSON_LITERALS)
+        or _NUMBER_TAIL.fullmatch(tail) is not None
+    )
+
+
+class _JsonStream:
+    """Text buffer over a binary stream that is refilled on demand"""
+
+    def __init__(self, stream: BinaryIO, chunk_size: int):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk, dropping consumed text; False at end of input"""
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.chunk_size)
+        self.eof = not chunk
+        self.buffer = self.buffer[self.pos:] + self.decoder.decode(chunk, final=self.eof)
+        self.pos = 0
+        return not self.eof
+
+    def peek(self) -> str:
+        """Next non-whitespace character without consuming it ("" at end)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, characters: str) -> str:
+        char = self.peek()
+        if not char or char not in characters:
+            found = repr(char) if char else "end of input"
+            raise ValueError(f"expected one of {characters!r}, found {found}")
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Decode one JSON value, pulling more input until it is complete"""
+        self.peek()
+        while True:
+            try:
+                value, end = _json_decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                # Only a value cut off by the end of the buffer is worth more
+                # input; anything else is a syntax error, and reading on would
+                # buffer the rest of the upload
+                if _is_truncated(e, self.buffer) and self.fill():
+                    continue
+                raise
+            # A number at the end of the buffer may continue in the next chunk,
+            # including one cut right after its "." or exponent marker
+            if (end == len(self.buffer) or _NUMBER_TAIL.fullmatch(self.buffer, end)) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _iter_array(reader: _JsonStream) -> Iterator[Any]:
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield reader.value()
+        if reader.expect(",]") == "]":
+            return
+
+
+def _iter_books_object(reader: _JsonStream) -> Iterator[Any]:
+    """Stream the "books" array of a top-level object, skipping other keys"""
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        if not isinstance(key, str):
+            raise ValueError("object keys must be strings")
+        reader.expect(":")
+        if key == "books" and reader.peek() == "[":
+            yield from _iter_array(reader)
+        else:
+            reader.value()
+        if reader.expect(",}") == "}":
+            return
+
+
+def iter_json_rows(
+    stream: BinaryIO, chunk_size: int = READ_CHUNK_SIZE
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the items of a top-level JSON array, or of the "books" array of a
+    top-level object, holding at most one chunk plus one item in memory.
+    """
+    reader = _JsonStream(stream, chunk_size)
+    try:
+        if reader.peek() == "{":
+            yield from _iter_books_object(reader)
+        else:
+            yield from _iter_array(reader)
+        if reader.peek():
+            raise ValueError("unexpected data after the top-level value")
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+
+
+PARSERS: Dict[str, Callable[[BinaryIO], Iterator[Dict[str, Any]]]] = {
+    "application/json": iter_json_rows,
+    "text/csv": iter_csv_rows,
+    "application/x-ndjson": iter_ndjson_rows,
+}
+
+
+class _RawReader(io.RawIOBase):
+    """
+    Raw view of ``stream`` that first replays ``head`` (bytes already read
+    while sniffing) and reports corrupt compressed input as a 400.
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        head: bytes = b"",
+        errors: Tuple[type, ...] = DECOMPRESSION_ERRORS,
+    ):
+        self.stream = stream
+        self.head = head
+        self.errors = errors
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self.head:
+            size = min(len(buffer), len(self.head))
+            buffer[:size] = self.head[:size]
+            self.head = self.head[size:]
+            return size
+        try:
+            data = self.stream.read(len(buffer))
+        except self.errors as e:
+            raise HTTPException(status_code=400, detail=f"Invalid compressed data: {e}")
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def _peek(stream: BinaryIO, size: int) -> Tuple[bytes, BinaryIO]:
+    """Read up to ``size`` bytes and return them with a stream that still yields them"""
+    head = b""
+    while len(head) < size:
+        try:
+            chunk = stream.read(size - len(head))
+        except DECOMPRESSION_ERRORS as e:
+            raise HTTPException(status_code=400, detail=f"Invalid compressed data: {e}")
+        if not chunk:
+            break
+        head += chunk
+    return head, io.BufferedReader(_RawReader(stream, head), READ_CHUNK_SIZE)
+
+
+def _decompress(stream: BinaryIO, compression: str) -> BinaryIO:
+    """Incremental decompressing reader over ``stream``"""
+    if compression == "gzip":
+        return io.BufferedReader(
+            _RawReader(gzip.GzipFile(fileobj=stream, mode="rb")), READ_CHUNK_SIZE
+        )
+
+    try:
+        import zstandard
+    except ImportError:
+        raise HTTPException(
+            status_code=400, detail="zstd-compressed uploads are not supported"
+        )
+    reader = zstandard.ZstdDecompressor().stream_reader(stream, read_across_frames=True)
+    return io.BufferedReader(
+        _RawReader(reader, errors=DECOMPRESSION_ERRORS + (zstandard.ZstdError,)),
+        READ_CHUNK_SIZE,
+    )
+
+
+def _sniff_format(head: bytes) -> str:
+    """Guess the format of an upload from its first bytes"""
+    text = head.lstrip()
+    if text.startswith(b"["):
+        return "application/json"
+    if text.startswith(b"{"):
+        try:
+            first = orjson.loads(text.split(b"\n", 1)[0])
+        except ValueError:
+            return "application/json"
+        if isinstance(first, dict) and isinstance(first.get("books"), list):
+            return "application/json"
+        return "application/x-ndjson"
+    return "text/csv"
+
+
+def resolve_format(
+    stream: BinaryIO, content_type: Optional[str], filename: Optional[str] = None
+) -> Tuple[str, BinaryIO]:
+    """
+    Work out the data format of an upload and return it with a stream of
+    the decoded body. gzip and zstd bodies are recognised by their magic
+    bytes whatever the declared type and decompressed as they are read.
+    The format comes from the content type, then the file extension
+    (``books.ndjson.gz``), then the first decompressed bytes. Formats not
+    in ``ALLOWED_FILE_TYPES`` are rejected.
+    """
+    declared = (content_type or "").split(";")[0].strip().lower()
+
+    magic, stream = _peek(stream, len(ZSTD_MAGIC))
+    compression = None
+    if magic.startswith(GZIP_MAGIC):
+        compression = "gzip"
+    elif magic.startswith(ZSTD_MAGIC):
+        compression = "zstd"
+
+    if declared in COMPRESSED_TYPES and COMPRESSED_TYPES[declared] != compression:
+        raise HTTPException(
+            status_code=400, detail=f"File is not {COMPRESSED_TYPES[declared]}-compressed"
+        )
+    if compression:
+        stream = _decompress(stream, compression)
+
+    name, extension = os.path.splitext((filename or "").lower())
+    if extension in COMPRESSION_EXTENSIONS:
+        extension = os.path.splitext(name)[1]
+
+    if declared in PARSERS:
+        media_type = declared
+    elif extension in FORMAT_EXTENSIONS:
+        media_type = FORMAT_EXTENSIONS[extension]
+    elif declared in COMPRESSED_TYPES or declared in GENERIC_TYPES:
+        head, stream = _peek(stream, READ_CHUNK_SIZE)
+        media_type = _sniff_format(head)
+    else:
+        raise HTTPException(status_code=400, detail="Unsupported file type")
+
+    if media_type not in settings.ALLOWED_FILE_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File type {media_type} is not allowed; "
+                   f"allowed: {', '.join(settings.ALLOWED_FILE_TYPES)}",
+        )
+    return media_type, stream
+
+
+def open_rows(
+    stream: BinaryIO, content_type: Optional[str], filename: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """Row iterator for an upload, decompressing and detecting its format"""
+    media_type, stream = resolve_format(stream, content_type, filename)
+    return PARSERS[media_type](stream)
@@ -1,101 +1,189 @@
-import csv
-import json
-import io
-from uuid import UUID
 import asyncpg
-from typing import List, Dict, Any
-from fastapi import HTTPException, UploadFile
+import itertools
+from collections import Counter
+from typing import AsyncIterator, Iterator, List, Dict, Any, Tuple
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
 from src.repositories.book import BookRepository
 from src.repositories.author import AuthorRepository
-from src.schemas.book import BulkImportResponse, BookCreate
-from src.schemas.author import AuthorCreate
+from src.schemas.book import BulkImportResponse, ImportMode
+from src.core.database import ConnectionProvider
+from src.core.settings import settings
+from src.services.author_resolver import AuthorResolver
+from src.services.import_parsers import open_rows
+from src.services.import_validation import validate_in_pool
 
 
 class ImportService:
-    def __init__(self, connection: asyncpg.Connection):
+    def __init__(self, connection: ConnectionProvider, mode: ImportMode = ImportMode.skip):
         self.book_repo = BookRepository(connection)
         self.author_repo = AuthorRepository(connection)
         self.connection = connection
+        self.mode = mode
+        self.author_resolver = AuthorResolver(self.author_repo.upsert_names)
 
     async def import_from_file(self, file: UploadFile) -> BulkImportResponse:
-        content = await file.read()
+        """
+        Stream the upload through the parser without reading it into memory,
+        decompressing gzip/zstd bodies on the way
+        """
+        rows = await run_in_threadpool(open_rows, file.file, file.content_type, file.filename)
+        return await self._import_batches(self.read_batches(rows))
+
+    @staticmethod
+    async def read_batches(rows: Iterator[Dict[str, Any]]) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Pull IMPORT_BATCH_SIZE rows at a time; file reads run in a worker thread"""
+        batch_size = settings.IMPORT_BATCH_SIZE
+        while True:
+            batch = await run_in_threadpool(lambda: list(itertools.islice(rows, batch_size)))
+            if not batch:
+                return
+            yield batch
+
+    async def _import_batches(
+            self, batches: AsyncIterator[List[Dict[str, Any]]]
+    ) -> BulkImportResponse:
+        """
+        Validate each batch with Pydantic, COPY its valid rows into a staging
+        table and merge them into books with one INSERT ... SELECT. Database
+        work for a batch runs under a savepoint; when it fails the batch is
+        bisected until the offending rows are isolated, so one bad row costs
+        O(log batch) retries instead of aborting the import.
+
+        Rows already imported are skipped, or updated when they changed in
+        ``upsert`` mode; ``success_count`` covers inserted and updated rows.
+        """
+        errors: List[Tuple[int, str]] = []
+        counts: Counter = Counter()
+        offset = 0
 
-        if file.content_type == "application/json":
-            books_data = self._parse_json(content)
-        elif file.content_type == "text/csv":
-            books_data = self._parse_csv(content)
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file type")
+        async with self.connection.transaction():
+            async for batch in batches:
+                counts += await self.import_batch(batch, offset, errors)
+                offset += len(batch)
 
-        return await self._bulk_import_books(books_data)
+        return BulkImportResponse(
+            success_count=counts["inserted"] + counts["updated"],
+            error_count=len(errors),
+            updated_count=counts["updated"],
+            skipped_count=counts["skipped"],
+            errors=self.format_errors(errors),
+        )
 
-    def _parse_json(self, content: bytes) -> List[Dict[str, Any]]:
+    @staticmethod
+    def format_errors(errors: List[Tuple[int, str]]) -> List[str]:
+        return [
+            f"Row {row_number}: {message}"
+            for row_number, message in sorted(errors, key=lambda error: error[0])
+        ]
+
+    async def import_batch(
+            self, batch: List[Dict[str, Any]], offset: int, errors: List[Tuple[int, str]]
+    ) -> Counter:
+        """
+        Import one batch inside the caller's transaction, so callers can
+        commit per batch (background jobs do); returns the inserted, updated
+        and skipped row counts. ``offset`` numbers the batch's rows in errors.
+        """
+        records = await self._validate_batch(batch, offset, errors)
+        if not records:
+            return Counter()
+
+        await self.book_repo.create_import_staging()
+        await self._copy_isolated(records, errors)
+        counts = await self._merge_isolated(records[0][0], records[-1][0], errors)
+        await self.book_repo.clear_import_staging()
+        return counts
+
+    async def _copy_isolated(
+            self, records: List[Tuple], errors: List[Tuple[int, str]]
+    ) -> None:
+        """COPY records under a savepoint, bisecting on failure to drop only bad rows"""
         try:
-            data = json.loads(content.decode("utf-8"))
-            return data if isinstance(data, list) else data.get("books", [])
-        except json.JSONDecodeError as e:
-            raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
-
-    def _parse_csv(self, content: bytes) -> List[Dict[str, Any]]:
+            async with self.connection.transaction():
+                await self.book_repo.copy_to_import_staging(records)
+        except asyncpg.PostgresError as e:
+            if len(records) == 1:
+                errors.append((records[0][0], str(e)))
+                return
+            middle = len(records) // 2
+            await self._copy_isolated(records[:middle], errors)
+            await self._copy_isolated(records[middle:], errors)
+
+    async def _merge_isolated(
+            self, first_row: int, last_row: int, errors: List[Tuple[int, str]]
+    ) -> Counter:
+        """Merge a row range under a savepoint, bisecting the range on failure"""
         try:
-            csv_content = content.decode("utf-8")
-            reader = csv.DictReader(io.StringIO(csv_content))
-            return [dict(row) for row in reader]
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=f"CSV parsing error: {e}")
-
-    async def _bulk_import_books(
-            self, books_data: List[Dict[str, Any]]
-    ) -> BulkImportResponse:
-        success_count = 0
-        error_count = 0
-        errors = []
-
-        async with self.connection.transaction():
-            for i, book_data in enumerate(books_data):
-                try:
-                    author_id = book_data.get("author_id")
-                    if not author_id and book_data.get("author"):
-                        author_id = await self._get_or_create_author(book_data["author"])
-
-                    genre = book_data.get("genre")
-                    if genre:
-                        genre = genre.strip()
-
-                    book_create = BookCreate(
-                        title=book_data["title"],
-                        content=book_data.get("content", "No content provided"),
-                        description=book_data.get("description"),
-                        published_year=int(book_data.get("published_year")),
-                        genre=genre,
-                        author_id=author_id,
-                    )
-
-                    await self.book_repo.create(book_create)
-                    success_count += 1
-
-                except Exception as e:
-                    error_count += 1
-                    errors.append(f"Row {i + 1}: {str(e)}")
+            async with self.connection.transaction():
+                merged = await self.book_repo.merge_import_staging(
+                    first_row, last_row, self.mode
+                )
+        except asyncpg.PostgresError as e:
+            if first_row == last_row:
+                errors.append((first_row, str(e)))
+                return Counter()
+            middle = (first_row + last_row) // 2
+            return (
+                await self._merge_isolated(first_row, middle, errors)
+                + await self._merge_isolated(middle + 1, last_row, errors)
+            )
+
+        for row_number, author_id in zip(
+            merged["missing_author_rows"], merged["missing_author_ids"]
+        ):
+            errors.append((row_number, f"Author with id {author_id} not found"))
+        return Counter(
+            inserted=merged["inserted_count"],
+            updated=merged["updated_count"],
+            skipped=merged["skipped_count"],
+        )
 
-        return BulkImportResponse(
-            success_count=success_count, error_count=error_count, errors=errors
+    async def _validate_batch(
+            self, batch: List[Dict[str, Any]], offset: int, errors: List[Tuple[int, str]]
+    ) -> List[Tuple]:
+        """
+        Staging records for the valid rows; failures are appended to errors.
+        The CPU-bound model validation runs in the validation process pool
+        first, then author names are resolved for the rows that passed only,
+        so invalid rows never create authors.
+        """
+        rows = list(enumerate(batch, start=offset + 1))
+        records, row_errors = await validate_in_pool(
+            rows, settings.IMPORT_VALIDATION_WORKERS, settings.IMPORT_VALIDATION_CHUNK_SIZE
         )
+        errors.extend(row_errors)
+
+        author_names = {
+            row_number: book_data["author"]
+            for row_number, book_data in rows
+            if isinstance(book_data, dict)
+            and not book_data.get("author_id")
+            and isinstance(book_data.get("author"), str)
+            and book_data["author"]
+        }
+        named = [record for record in records if record[0] in author_names]
+        if not named:
+            return records
 
-    async def _get_or_create_author(self, author_name: str) -> UUID:
-        """Get existing author or create new one"""
-        name_parts = author_name.strip().split()
-        if len(name_parts) >= 2:
-            first_name = " ".join(name_parts[:-1])
-            last_name = name_parts[-1]
-        else:
-            first_name = name_parts[0] if name_parts else "Unknown"
-            last_name = "Author"
-
-        existing_authors = await self.author_repo.search(author_name)
-        if existing_authors:
-            return existing_authors[0]["id"]
-
-        author_create = AuthorCreate(first_name=first_name, last_name=last_name)
-        author = await self.author_repo.create(author_create)
-        return author["id"]
+        try:
+            # Under a savepoint, so a failed upsert costs these rows, not the import
+            async with self.connection.transaction():
+                await self.author_resolver.resolve_many(
+                    author_names[record[0]] for record in named
+                )
+        except asyncpg.PostgresError as e:
+            errors.extend((record[0], f"Could not resolve author: {e}") for record in named)
+            return [record for record in records if record[0] not in author_names]
+
+        resolved = []
+        for record in records:
+            row_number = record[0]
+            if row_number in author_names:
+                try:
+                    record = record[:6] + (self.author_resolver.get(author_names[row_number]),)
+                except ValueError as e:
+                    errors.append((row_number, str(e)))
+                    continue
+            resolved.append(record)
+        return resolved
@@ -0,0 +1,114 @@
+"""
+Row validation for imports, run in worker processes.
+
+Everything here is module-level and works on plain dicts and tuples so it
+can be pickled to a ``ProcessPoolExecutor``: validating titles, content and
+genres is CPU-bound and would otherwise block the event loop.
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import TypeAdapter, ValidationError
+from src.schemas.book import BookCreate
+
+RowErrors = List[Tuple[int, str]]
+Records = List[Tuple]
+
+_books_adapter = TypeAdapter(List[BookCreate])
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _book_fields(book_data: Dict[str, Any]) -> Dict[str, Any]:
+    genre = book_data.get("genre")
+    if genre:
+        genre = genre.strip()
+
+    return {
+        "title": book_data["title"],
+        "content": book_data.get("content", "No content provided"),
+        "description": book_data.get("description"),
+        "published_year": int(book_data.get("published_year")),
+        "genre": genre,
+        "author_id": book_data.get("author_id"),
+    }
+
+
+def _record(row_number: int, book: BookCreate) -> Tuple:
+    return (
+        row_number,
+        book.title,
+        book.content,
+        book.description,
+        book.published_year,
+        book.genre.value,
+        book.author_id,
+    )
+
+
+def validate_rows(rows: List[Tuple[int, Dict[str, Any]]]) -> Tuple[Records, RowErrors]:
+    """
+    Validate ``(row_number, raw_row)`` pairs into staging records. The whole
+    chunk goes through one ``TypeAdapter`` call; only a chunk with invalid
+    rows falls back to per-row validation to attribute the errors.
+    """
+    errors: RowErrors = []
+    prepared = []
+    for row_number, book_data in rows:
+        try:
+            prepared.append((row_number, _book_fields(book_data)))
+        except Exception as e:
+            errors.append((row_number, str(e)))
+
+    try:
+        books = _books_adapter.validate_python([fields for _, fields in prepared])
+        return [_record(row_number, book) for (row_number, _), book in zip(prepared, books)], errors
+    except ValidationError:
+        pass
+
+    records = []
+    for row_number, fields in prepared:
+        try:
+            records.append(_record(row_number, BookCreate(**fields)))
+        except Exception as e:
+            errors.append((row_number, str(e)))
+    return records, errors
+
+
+def get_validation_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool
+
+
+def shutdown_validation_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+async def validate_in_pool(
+    rows: List[Tuple[int, Dict[str, Any]]], workers: int, chunk_size: int
+) -> Tuple[Records, RowErrors]:
+    """Validate rows in parallel chunks; ``workers=0`` validates inline"""
+    if workers <= 0:
+        return validate_rows(rows)
+
+    pool = get_validation_pool(workers)
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(*(
+        loop.run_in_executor(pool, validate_rows, rows[start:start + chunk_size])
+        for start in range(0, len(rows), chunk_size)
+    ))
+
+    records: Records = []
+    errors: RowErrors = []
+    for chunk_records, chunk_errors in results:
+        records.extend(chunk_records)
+        errors.extend(chunk_errors)
+    return records, errors
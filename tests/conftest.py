@@ -1,5 +1,8 @@
+import os
 import pytest
+import pytest_asyncio
 import asyncio
+import asyncpg
 import inspect
 from unittest.mock import AsyncMock
 from uuid import uuid4
@@ -71,3 +74,23 @@ def sample_book_data():
         "created_at": datetime.now(timezone.utc),
         "updated_at": datetime.now(timezone.utc)
     }
+
+
+@pytest_asyncio.fixture
+async def pg_connection():
+    """
+    Connection to a migrated PostgreSQL database given by TEST_DATABASE_URL.
+    Everything runs inside a transaction that is rolled back afterwards.
+    """
+    database_url = os.getenv("TEST_DATABASE_URL")
+    if not database_url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    connection = await asyncpg.connect(database_url)
+    transaction = connection.transaction()
+    await transaction.start()
+    try:
+        yield connection
+    finally:
+        await transaction.rollback()
+        await connection.close()
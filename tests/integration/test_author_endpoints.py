@@ -5,7 +5,7 @@ from unittest.mock import AsyncMock, patch
 from uuid import uuid4
 from datetime import datetime, timezone
 from src.api.v1.author import router as authors_router
-from src.core.database import get_db
+from src.core.database import get_db, get_read_db
 from src.schemas.author import Author, AuthorCreate, AuthorUpdate
 from src.schemas.pagination import PaginatedResponse
 
@@ -19,6 +19,7 @@ async def test_create_author_endpoint(mock_db_connection):
     async def fake_get_db():
         return mock_db_connection
     app.dependency_overrides[get_db] = fake_get_db
+    app.dependency_overrides[get_read_db] = fake_get_db
     app.dependency_overrides[get_current_user] = lambda: {"id": uuid4()}
 
     author_data = {"first_name": "John", "last_name": "Doe"}
@@ -49,6 +50,7 @@ async def test_get_authors_endpoint(mock_db_connection):
     async def fake_get_db():
         return mock_db_connection
     app.dependency_overrides[get_db] = fake_get_db
+    app.dependency_overrides[get_read_db] = fake_get_db
 
     sample_author = {
         "id": str(uuid4()),
@@ -83,6 +85,7 @@ async def test_get_author_by_id_endpoint(mock_db_connection):
     async def fake_get_db():
         return mock_db_connection
     app.dependency_overrides[get_db] = fake_get_db
+    app.dependency_overrides[get_read_db] = fake_get_db
 
     author_id = uuid4()
     sample_author = {
@@ -113,6 +116,7 @@ async def test_update_author_endpoint(mock_db_connection):
     async def fake_get_db():
         return mock_db_connection
     app.dependency_overrides[get_db] = fake_get_db
+    app.dependency_overrides[get_read_db] = fake_get_db
 
     from src.api.v1.auth import get_current_user
     app.dependency_overrides[get_current_user] = lambda: {"id": uuid4()}
@@ -146,6 +150,7 @@ async def test_delete_author_endpoint(mock_db_connection):
     async def fake_get_db():
         return mock_db_connection
     app.dependency_overrides[get_db] = fake_get_db
+    app.dependency_overrides[get_read_db] = fake_get_db
 
     from src.api.v1.auth import get_current_user
     app.dependency_overrides[get_current_user] = lambda: {"id": uuid4()}
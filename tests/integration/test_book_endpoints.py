@@ -1,14 +1,15 @@
 import pytest
 from fastapi import FastAPI
 from httpx import AsyncClient
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 from datetime import datetime, timezone
 from src.api.v1.book import router as books_router
-from src.core.database import get_db
+from src.core.database import get_db, get_read_db
 from src.api.v1.auth import get_current_user
-from src.schemas.book import Book, BookCreate, BookUpdate, BulkImportResponse
+from src.schemas.book import Book, BookCreate, BookUpdate, BookSearchResult, BulkImportResponse
 from src.schemas.pagination import PaginatedResponse
+from src.schemas.import_job import ImportJob
 
 @pytest.mark.asyncio
 async def test_create_book_endpoint(mock_db_connection):
@@ -19,6 +20,8 @@ async def test_create_book_endpoint(mock_db_connection):
         return mock_db_connection
 
     app.dependency_overrides[get_db] = fake_get_db
+
+    app.dependency_overrides[get_read_db] = fake_get_db
     app.dependency_overrides[get_current_user] = lambda: {"id": uuid4()}
 
     book_data = {
@@ -52,6 +55,7 @@ async def test_get_books_endpoint(mock_db_connection):
     app = FastAPI()
     app.include_router(books_router)
     app.dependency_overrides[get_db] = lambda: mock_db_connection
+    app.dependency_overrides[get_read_db] = lambda: mock_db_connection
 
     sample_book = {
         "id": str(uuid4()),
@@ -88,6 +92,7 @@ async def test_get_book_by_id_endpoint(mock_db_connection):
     app = FastAPI()
     app.include_router(books_router)
     app.dependency_overrides[get_db] = lambda: mock_db_connection
+    app.dependency_overrides[get_read_db] = lambda: mock_db_connection
 
     book_id = uuid4()
     sample_book = {
@@ -119,6 +124,7 @@ async def test_update_book_endpoint(mock_db_connection):
     app = FastAPI()
     app.include_router(books_router)
     app.dependency_overrides[get_db] = lambda: mock_db_connection
+    app.dependency_overrides[get_read_db] = lambda: mock_db_connection
     app.dependency_overrides[get_current_user] = lambda: {"id": uuid4()}
 
     book_id = uuid4()
@@ -150,6 +156,7 @@ async def test_delete_book_endpoint(mock_db_connection):
     app = FastAPI()
     app.include_router(books_router)
     app.dependency_overrides[get_db] = lambda: mock_db_connection
+    app.dependency_overrides[get_read_db] = lambda: mock_db_connection
     app.dependency_overrides[get_current_user] = lambda: {"id": uuid4()}
 
     book_id = uuid4()
@@ -168,6 +175,7 @@ async def test_import_books_endpoint(mock_db_connection):
     app = FastAPI()
     app.include_router(books_router)
     app.dependency_overrides[get_db] = lambda: mock_db_connection
+    app.dependency_overrides[get_read_db] = lambda: mock_db_connection
     app.dependency_overrides[get_current_user] = lambda: {"id": uuid4()}
 
     file_content = b'[]'
@@ -191,3 +199,139 @@ async def test_import_books_endpoint(mock_db_connection):
     assert data["error_count"] == 0
     assert data["errors"] == []
     mock_import.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_search_books_endpoint(mock_db_connection):
+    app = FastAPI()
+    app.include_router(books_router)
+    app.dependency_overrides[get_db] = lambda: mock_db_connection
+    app.dependency_overrides[get_read_db] = lambda: mock_db_connection
+
+    sample_result = BookSearchResult(
+        id=uuid4(),
+        title="The Hobbit",
+        content="In a hole in the ground there lived a hobbit",
+        published_year=1937,
+        genre="Fantasy",
+        created_at=datetime.now(timezone.utc),
+        updated_at=datetime.now(timezone.utc),
+        rank=0.8,
+        highlight="there lived a <mark>hobbit</mark>",
+    )
+
+    with patch("src.api.v1.book.BookService.search_books", new_callable=AsyncMock) as mock_search:
+        mock_search.return_value = PaginatedResponse(items=[sample_result], total=1, page=1, size=20)
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/books/search", params={"q": "hobbit"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["items"][0]["rank"] == 0.8
+    assert "<mark>hobbit</mark>" in data["items"][0]["highlight"]
+    mock_search.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_import_books_background_endpoint(mock_db_connection):
+    app = FastAPI()
+    app.include_router(books_router)
+    app.dependency_overrides[get_db] = lambda: mock_db_connection
+    app.dependency_overrides[get_current_user] = lambda: MagicMock(id=uuid4())
+
+    job = ImportJob(
+        id=uuid4(),
+        status="pending",
+        filename="books.csv",
+        processed_rows=0,
+        success_count=0,
+        error_count=0,
+        created_at=datetime.now(timezone.utc),
+    )
+
+    with patch("src.api.v1.book.import_job_runner.enqueue_upload", new_callable=AsyncMock) as mock_enqueue:
+        mock_enqueue.return_value = job
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.post(
+                "/books/import",
+                params={"background": "true"},
+                files={"file": ("books.csv", b"title\n", "text/csv")}
+            )
+
+    assert response.status_code == 202
+    assert response.json()["id"] == str(job.id)
+    assert response.json()["status"] == "pending"
+    mock_enqueue.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_import_job_endpoint(mock_db_connection):
+    app = FastAPI()
+    app.include_router(books_router)
+    app.dependency_overrides[get_db] = lambda: mock_db_connection
+    user_id = uuid4()
+    app.dependency_overrides[get_current_user] = lambda: MagicMock(id=user_id)
+
+    job_id = uuid4()
+    now = datetime.now(timezone.utc)
+    row = {
+        "id": job_id, "created_by": user_id,
+        "status": "running", "filename": "books.json", "mode": "upsert",
+        "last_committed_row": 10000, "success_count": 9990, "error_count": 10,
+        "updated_count": 40, "skipped_count": 0,
+        "errors": ["Row 7: bad year"], "error_message": None,
+        "created_at": now, "started_at": now, "finished_at": None,
+    }
+
+    with patch("src.api.v1.book.ImportJobRepository.get_by_id", new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = row
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get(f"/books/import/{job_id}")
+            mock_get.return_value = {**row, "created_by": uuid4()}
+            other_users = await client.get(f"/books/import/{job_id}")
+            mock_get.return_value = None
+            missing = await client.get(f"/books/import/{uuid4()}")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["processed_rows"] == 10000
+    assert data["mode"] == "upsert" and data["updated_count"] == 40
+    assert data["errors"] == ["Row 7: bad year"]
+    assert data["rows_per_second"] is not None
+    assert other_users.status_code == 404
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_export_books_endpoint(mock_db_connection):
+    app = FastAPI()
+    app.include_router(books_router)
+    app.dependency_overrides[get_read_db] = lambda: mock_db_connection
+
+    def export_books(filters, export_format, compress):
+        async def chunks():
+            yield b'{"title": "One"}\n'
+            yield b'{"title": "Two"}\n'
+        export_books.call = (filters, export_format, compress)
+        return chunks()
+
+    with patch("src.api.v1.book.ExportService.export_books", side_effect=export_books):
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get(
+                "/books/export",
+                params={"format": "ndjson", "genre": "Fiction", "year_from": 2000},
+                headers={"Accept-Encoding": "identity"},
+            )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "books.ndjson" in response.headers["content-disposition"]
+    assert "content-encoding" not in response.headers
+    assert response.text.splitlines() == ['{"title": "One"}', '{"title": "Two"}']
+    filters, export_format, compress = export_books.call
+    assert filters.genres == ["Fiction"] and filters.year_from == 2000
+    assert export_format == "ndjson"
+    assert compress is False
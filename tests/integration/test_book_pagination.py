@@ -0,0 +1,64 @@
+import pytest
+from src.core.cursor import Cursor
+from src.repositories.book import BookRepository
+from src.schemas.book import BookFilters
+from src.schemas.pagination import CountMode
+
+
+async def walk_pages(repo, sort_order, size=2):
+    """Follow next cursors through every page of the seeded books"""
+    filters = BookFilters(title="Keyset Null Year")
+    titles, cursor = [], None
+    while True:
+        books, _ = await repo.get_page(
+            filters, limit=size, sort_by="year", sort_order=sort_order,
+            cursor=cursor, count_mode=CountMode.none,
+        )
+        titles.extend(book["title"] for book in books)
+        if len(books) < size:
+            return titles
+        last = books[-1]
+        cursor = Cursor(BookRepository.sort_key(last, "year"), last["id"])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+async def test_year_cursor_pages_through_null_years(pg_connection, sort_order):
+    await pg_connection.execute("""
+        INSERT INTO books (title, content, published_year, genre)
+        VALUES ('Keyset Null Year 1', 'Seeded content', 2001, 'Fiction'),
+               ('Keyset Null Year 2', 'Seeded content', NULL, 'Fiction'),
+               ('Keyset Null Year 3', 'Seeded content', 1999, 'Fiction'),
+               ('Keyset Null Year 4', 'Seeded content', NULL, 'Fiction'),
+               ('Keyset Null Year 5', 'Seeded content', NULL, 'Fiction')
+    """)
+
+    titles = await walk_pages(BookRepository(pg_connection), sort_order)
+
+    assert len(titles) == len(set(titles)) == 5
+    dated = ["Keyset Null Year 3", "Keyset Null Year 1"]
+    if sort_order == "asc":
+        assert titles[:2] == dated
+    else:
+        assert titles[3:] == dated[::-1]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort_by", ["title", "year"])
+async def test_exact_count_page_is_returned_in_sort_order(pg_connection, sort_by):
+    # Years and titles run in opposite directions, so either order is visible
+    years = {f"Counted Order {letter}": 2000 - index for index, letter in enumerate("ABCDEFGH")}
+    await pg_connection.executemany(
+        "INSERT INTO books (title, content, published_year, genre) VALUES ($1, 'Seeded content', $2, 'Fiction')",
+        list(years.items()),
+    )
+
+    books, total = await BookRepository(pg_connection).get_page(
+        BookFilters(title="Counted Order"), limit=5, sort_by=sort_by,
+        sort_order="desc", count_mode=CountMode.exact,
+    )
+
+    key = (lambda title: title) if sort_by == "title" else years.get
+    expected = sorted(years, key=key, reverse=True)[:5]
+    assert total == 8
+    assert [book["title"] for book in books] == expected
@@ -0,0 +1,21 @@
+import pytest
+from src.repositories.book import BookRepository
+from src.schemas.pagination import CountMode
+
+
+@pytest.mark.asyncio
+async def test_search_snippet_escapes_book_text(pg_connection):
+    await pg_connection.execute("""
+        INSERT INTO books (title, content, description, genre)
+        VALUES ('Escaping Test', 'A quokka said "hi" & <script>alert(1)</script> it''s over',
+                NULL, 'Fiction')
+    """)
+
+    books, _ = await BookRepository(pg_connection).search("quokka", count_mode=CountMode.none)
+
+    highlight = books[0]["highlight"]
+    assert "<mark>quokka</mark>" in highlight
+    assert "<script>" not in highlight
+    assert "&lt;script&gt;" in highlight
+    assert "&quot;hi&quot; &amp;" in highlight
+    assert "it&#x27;s" in highlight
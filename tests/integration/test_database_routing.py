@@ -0,0 +1,27 @@
+import os
+import pytest
+from src.core.database import Database, settings
+
+
+@pytest.mark.asyncio
+async def test_reads_and_writes_hit_separate_databases(monkeypatch):
+    """Run against two Postgres instances, or two databases on one server"""
+    primary_url = os.getenv("TEST_DATABASE_URL")
+    replica_url = os.getenv("TEST_REPLICA_DATABASE_URL")
+    if not primary_url or not replica_url:
+        pytest.skip("TEST_DATABASE_URL and TEST_REPLICA_DATABASE_URL are not set")
+
+    monkeypatch.setattr(settings, "DATABASE_URL", primary_url)
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URLS", [replica_url])
+
+    db = Database()
+    await db.connect()
+    try:
+        async with db.get_connection() as connection:
+            primary = await connection.fetchval("SELECT current_database() || ':' || COALESCE(inet_server_port(), 0)")
+        async with db.get_connection(readonly=True) as connection:
+            replica = await connection.fetchval("SELECT current_database() || ':' || COALESCE(inet_server_port(), 0)")
+    finally:
+        await db.disconnect()
+
+    assert primary != replica
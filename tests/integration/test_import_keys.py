@@ -0,0 +1,116 @@
+import pytest
+from src.repositories.book import BookRepository
+from src.schemas.book import BookCreate, BookUpdate, ImportMode
+
+
+class CountingConnection:
+    """Connection proxy that counts the statements it runs"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.statements = 0
+
+    async def fetchrow(self, query, *args):
+        self.statements += 1
+        return await self.connection.fetchrow(query, *args)
+
+
+def staged_row(row_number, title, published_year, content="Imported content"):
+    return (row_number, title, content, None, published_year, "Fiction", None)
+
+
+@pytest.mark.asyncio
+async def test_import_matches_books_created_through_the_api(pg_connection):
+    repo = BookRepository(pg_connection)
+    await repo.create(BookCreate(
+        title="Key Test Novel", content="Created through the API",
+        published_year=1999, genre="Fiction",
+    ))
+
+    await repo.create_import_staging()
+    await repo.copy_to_import_staging([staged_row(1, "key test novel", 1999)])
+    result = await repo.merge_import_staging(1, 1, ImportMode.skip)
+
+    assert (result["inserted_count"], result["skipped_count"]) == (0, 1)
+
+
+@pytest.mark.asyncio
+async def test_same_title_and_author_in_different_years_are_different_books(pg_connection):
+    repo = BookRepository(pg_connection)
+    await repo.create_import_staging()
+    await repo.copy_to_import_staging([
+        staged_row(1, "Key Test Edition", 1990),
+        staged_row(2, "Key Test Edition", 2010),
+    ])
+
+    result = await repo.merge_import_staging(1, 2, ImportMode.upsert)
+
+    assert result["inserted_count"] == 2
+    count = await pg_connection.fetchval(
+        "SELECT COUNT(*) FROM books WHERE title = 'Key Test Edition'"
+    )
+    assert count == 2
+
+
+@pytest.mark.asyncio
+async def test_duplicate_api_book_is_created_without_import_key(pg_connection):
+    repo = BookRepository(pg_connection)
+    book = BookCreate(
+        title="Key Test Twin", content="Created through the API",
+        published_year=2001, genre="Fiction",
+    )
+
+    first = await repo.create(book)
+    counting = CountingConnection(pg_connection)
+    second = await BookRepository(counting).create(book)
+
+    assert counting.statements == 1
+
+    keys = await pg_connection.fetch(
+        "SELECT id, import_key FROM books WHERE id = ANY($1::uuid[])", [first["id"], second["id"]]
+    )
+    assert first["id"] != second["id"]
+    assert sorted(row["import_key"] is None for row in keys) == [False, True]
+
+
+@pytest.mark.asyncio
+async def test_edited_book_is_keyed_by_its_new_identity(pg_connection):
+    repo = BookRepository(pg_connection)
+    book = await repo.create(BookCreate(
+        title="Key Test Draft", content="Created through the API",
+        published_year=1999, genre="Fiction",
+    ))
+    await repo.update(book["id"], BookUpdate(title="Key Test Final"))
+
+    await repo.create_import_staging()
+    await repo.copy_to_import_staging([
+        staged_row(1, "Key Test Final", 1999, content="Created through the API"),
+        staged_row(2, "Key Test Draft", 1999, content="Old import"),
+    ])
+    result = await repo.merge_import_staging(1, 2, ImportMode.upsert)
+
+    assert (result["inserted_count"], result["updated_count"], result["skipped_count"]) == (1, 0, 1)
+    edited = await repo.get_by_id(book["id"])
+    assert (edited["title"], edited["content"]) == ("Key Test Final", "Created through the API")
+
+
+@pytest.mark.asyncio
+async def test_edit_into_an_existing_book_drops_the_import_key(pg_connection):
+    repo = BookRepository(pg_connection)
+    original = await repo.create(BookCreate(
+        title="Key Test Taken", content="Created through the API",
+        published_year=2005, genre="Fiction",
+    ))
+    other = await repo.create(BookCreate(
+        title="Key Test Other", content="Created through the API",
+        published_year=2005, genre="Fiction",
+    ))
+
+    updated = await repo.update(other["id"], BookUpdate(title="Key Test Taken"))
+
+    keys = dict(await pg_connection.fetch(
+        "SELECT id, import_key FROM books WHERE id = ANY($1::uuid[])",
+        [original["id"], other["id"]],
+    ))
+    assert updated["title"] == "Key Test Taken"
+    assert keys[original["id"]] is not None and keys[other["id"]] is None
@@ -0,0 +1,51 @@
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from uuid import uuid4
+from src.api.v1.internal import router as internal_router
+from src.core.database import database
+from src.core.deps import get_current_user
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_endpoint(monkeypatch):
+    app = FastAPI()
+    app.include_router(internal_router)
+    app.dependency_overrides[get_current_user] = lambda: {"id": uuid4()}
+
+    snapshot = {
+        "name": "primary",
+        "min_size": 1,
+        "max_size": 10,
+        "size": 4,
+        "in_use": 3,
+        "idle": 1,
+        "waiting": 2,
+        "acquired_total": 120,
+        "acquire_timeouts": 0,
+        "acquire_latency": {"p50_ms": 0.2, "p90_ms": 1.5, "p99_ms": 12.0, "max_ms": 30.0},
+    }
+    monkeypatch.setattr(database, "pool_stats", lambda: [snapshot])
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/internal/pool")
+
+    assert response.status_code == 200
+    pools = response.json()["pools"]
+    assert pools[0]["waiting"] == 2
+    assert pools[0]["acquire_latency"]["p99_ms"] == 12.0
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_stats_endpoint():
+    app = FastAPI()
+    app.include_router(internal_router)
+    app.dependency_overrides[get_current_user] = lambda: {"id": uuid4()}
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/internal/password-hasher")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["workers"] >= 1
+    assert set(data["queue_wait"]) == {"p50_ms", "p90_ms", "p99_ms", "max_ms"}
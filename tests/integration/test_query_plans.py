@@ -0,0 +1,107 @@
+import hashlib
+import pytest
+import pytest_asyncio
+from src.repositories.author import AuthorRepository
+from src.repositories.book import BookRepository
+from src.schemas.book import BookFilters
+from src.schemas.pagination import CountMode
+
+
+class ExplainingConnection:
+    """Connection proxy that records the plan of every query it runs"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.plans = []
+
+    async def _explain(self, query, args):
+        rows = await self.connection.fetch(f"EXPLAIN {query}", *args)
+        self.plans.append("\n".join(row[0] for row in rows))
+
+    async def fetch(self, query, *args):
+        await self._explain(query, args)
+        return await self.connection.fetch(query, *args)
+
+    async def fetchrow(self, query, *args):
+        await self._explain(query, args)
+        return await self.connection.fetchrow(query, *args)
+
+    async def fetchval(self, query, *args):
+        return await self.connection.fetchval(query, *args)
+
+
+@pytest_asyncio.fixture
+async def seeded_connection(pg_connection):
+    """
+    Enough rows that a sequential scan is clearly the expensive plan, with
+    statistics, so the tests see the plans the planner picks on its own
+    """
+    await pg_connection.execute("""
+        INSERT INTO authors (first_name, last_name)
+        SELECT 'First' || g, 'Last' || g FROM generate_series(1, 20000) g;
+
+        WITH numbered AS (
+            SELECT id, row_number() OVER (ORDER BY id) AS rn FROM authors
+        )
+        INSERT INTO books (title, content, published_year, genre, author_id)
+        SELECT 'Title ' || md5(g::text), 'Seeded content ' || g,
+               1900 + g % 120, 'Fiction', numbered.id
+        FROM generate_series(1, 50000) g
+        JOIN numbered ON numbered.rn = g % 20000 + 1;
+
+        ANALYZE authors;
+        ANALYZE books;
+    """)
+    return pg_connection
+
+
+@pytest.mark.asyncio
+async def test_title_filter_uses_trigram_index(seeded_connection):
+    connection = ExplainingConnection(seeded_connection)
+    # Part of one seeded title's hash: matches a single book
+    fragment = hashlib.md5(b"4321").hexdigest()[4:12]
+
+    books, total = await BookRepository(connection).get_page(
+        BookFilters(title=fragment), count_mode=CountMode.exact
+    )
+
+    assert "books_title_trgm_idx" in connection.plans[0]
+    assert total >= 1
+    assert all(fragment in book["title"] for book in books)
+
+
+@pytest.mark.asyncio
+async def test_author_filter_uses_trigram_indexes(seeded_connection):
+    connection = ExplainingConnection(seeded_connection)
+
+    await BookRepository(connection).get_page(
+        BookFilters(author="ast12345"), count_mode=CountMode.exact
+    )
+
+    assert "authors_last_name_trgm_idx" in connection.plans[0]
+    assert "authors_first_name_trgm_idx" in connection.plans[0]
+
+
+@pytest.mark.asyncio
+async def test_author_search_uses_full_name_trigram_index(seeded_connection):
+    connection = ExplainingConnection(seeded_connection)
+
+    authors, total = await AuthorRepository(connection).search_page("st1234 last")
+
+    assert "authors_full_name_trgm_idx" in connection.plans[0]
+    assert total == 1
+    assert authors[0]["last_name"] == "Last1234"
+
+
+@pytest.mark.asyncio
+async def test_year_range_uses_btree_index(seeded_connection):
+    connection = ExplainingConnection(seeded_connection)
+
+    books, total = await BookRepository(connection).get_page(
+        BookFilters(year_from=1950, year_to=1951), limit=5
+    )
+
+    assert "books_year" in connection.plans[0]
+    assert "EXTRACT" not in connection.plans[0]
+    assert total > 0
+    assert all(1950 <= book["published_year"] <= 1951 for book in books)
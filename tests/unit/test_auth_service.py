@@ -1,8 +1,10 @@
 from datetime import datetime, timezone
 
 import pytest
+from fastapi import HTTPException
 from unittest.mock import AsyncMock, patch
 from uuid import uuid4
+from src.core.cache import TTLCache
 from src.services.auth_service import AuthService
 from src.schemas.user import UserCreate, UserLogin, User
 from src.core.exceptions import http_401_unauthorized, http_409_conflict
@@ -28,26 +30,28 @@ class TestAuthService:
             password="Password123"
         )
 
-        mock_user_repo.get_by_username.return_value = None
-        mock_user_repo.get_by_email.return_value = None
-
-        mock_user_repo.create.return_value = {
-            "id": uuid4(),
-            "username": user_data.username,
-            "full_name": user_data.full_name,
-            "email": user_data.email,
-            "is_active": True,
-            "created_at": datetime.now(timezone.utc),
-            "updated_at": datetime.now(timezone.utc)
+        mock_user_repo.create_unique.return_value = {
+            "user": {
+                "id": uuid4(),
+                "username": user_data.username,
+                "full_name": user_data.full_name,
+                "email": user_data.email,
+                "is_active": True,
+                "created_at": datetime.now(timezone.utc),
+                "updated_at": datetime.now(timezone.utc)
+            },
+            "username_taken": False,
+            "email_taken": False,
         }
 
-        with patch("src.services.auth_service.get_password_hash", return_value="hashed_pass"):
+        with patch("src.services.auth_service.password_hasher.hash",
+                   new_callable=AsyncMock, return_value="hashed_pass"):
             result = await auth_service.register_user(user_data)
 
         assert isinstance(result, User)
         assert result.username == user_data.username
         assert result.email == user_data.email
-        mock_user_repo.create.assert_awaited_once()
+        mock_user_repo.create_unique.assert_awaited_once_with(user_data, "hashed_pass")
 
     async def test_register_user_duplicate_username(self, auth_service, mock_user_repo):
         user_data = UserCreate(
@@ -57,10 +61,17 @@ class TestAuthService:
             password="Password123"
         )
 
-        mock_user_repo.get_by_username.return_value = {"username": "existing"}
+        mock_user_repo.create_unique.return_value = {
+            "user": None, "username_taken": True, "email_taken": True
+        }
+
+        with patch("src.services.auth_service.password_hasher.hash",
+                   new_callable=AsyncMock, return_value="hashed_pass"):
+            with pytest.raises(HTTPException) as error:
+                await auth_service.register_user(user_data)
 
-        with pytest.raises(Exception):  # Flexible exception checking
-            await auth_service.register_user(user_data)
+        assert error.value.status_code == 409
+        assert error.value.detail["message"] == "Username 'existing' already exists"
 
     async def test_register_user_duplicate_email(self, auth_service, mock_user_repo):
         user_data = UserCreate(
@@ -70,24 +81,57 @@ class TestAuthService:
             password="Password123"
         )
 
-        mock_user_repo.get_by_username.return_value = None
-        mock_user_repo.get_by_email.return_value = {"email": "existing@example.com"}
+        mock_user_repo.create_unique.return_value = {
+            "user": None, "username_taken": False, "email_taken": True
+        }
 
-        with pytest.raises(Exception):
-            await auth_service.register_user(user_data)
+        with patch("src.services.auth_service.password_hasher.hash",
+                   new_callable=AsyncMock, return_value="hashed_pass"):
+            with pytest.raises(HTTPException) as error:
+                await auth_service.register_user(user_data)
+
+        assert error.value.status_code == 409
+        assert error.value.detail["message"] == "Email 'existing@example.com' already exists"
 
     async def test_authenticate_user_success(self, auth_service, mock_user_repo, sample_user_data):
         login_data = UserLogin(username="testuser", password="password123")
 
         mock_user_repo.get_by_username.return_value = sample_user_data
 
-        with patch('src.services.auth_service.verify_password', return_value=True), \
+        with patch('src.services.auth_service.password_hasher.verify_and_update',
+                   new_callable=AsyncMock, return_value=(True, None)), \
                 patch('src.services.auth_service.create_access_token', return_value="jwt_token"):
             result = await auth_service.authenticate_user(login_data)
 
             assert hasattr(result, 'access_token')
             assert hasattr(result, 'token_type')
             assert result.token_type == "bearer"
+        mock_user_repo.update_password_hash.assert_not_called()
+
+    async def test_authenticate_user_rehashes_outdated_hash(self, auth_service, mock_user_repo,
+                                                            sample_user_data):
+        login_data = UserLogin(username="testuser", password="password123")
+        mock_user_repo.get_by_username.return_value = sample_user_data
+
+        with patch('src.services.auth_service.password_hasher.verify_and_update',
+                   new_callable=AsyncMock, return_value=(True, "new_hash")):
+            await auth_service.authenticate_user(login_data)
+
+        mock_user_repo.update_password_hash.assert_awaited_once_with(
+            sample_user_data["id"], "new_hash"
+        )
+
+    async def test_authenticate_user_wrong_password(self, auth_service, mock_user_repo,
+                                                    sample_user_data):
+        login_data = UserLogin(username="testuser", password="wrongpass")
+        mock_user_repo.get_by_username.return_value = sample_user_data
+
+        with patch('src.services.auth_service.password_hasher.verify_and_update',
+                   new_callable=AsyncMock, return_value=(False, None)):
+            with pytest.raises(Exception):
+                await auth_service.authenticate_user(login_data)
+
+        mock_user_repo.update_password_hash.assert_not_called()
 
     async def test_authenticate_user_invalid_credentials(self, auth_service, mock_user_repo):
         login_data = UserLogin(username="testuser", password="wrongpass")
@@ -103,7 +147,8 @@ class TestAuthService:
 
         mock_user_repo.get_by_username.return_value = sample_user_data
 
-        with patch('src.services.auth_service.verify_password', return_value=True):
+        with patch('src.services.auth_service.password_hasher.verify_and_update',
+                   new_callable=AsyncMock, return_value=(True, None)):
             with pytest.raises(Exception):
                 await auth_service.authenticate_user(login_data)
 
@@ -122,3 +167,21 @@ class TestAuthService:
 
         with pytest.raises(Exception):
             await auth_service.get_user_by_id(user_id)
+
+    async def test_get_user_by_id_is_cached(self, auth_service, mock_user_repo,
+                                            sample_user_data, monkeypatch):
+        cache = TTLCache(max_size=10, ttl=30)
+        monkeypatch.setattr("src.services.auth_service.user_cache", cache)
+        user_id = sample_user_data["id"]
+        mock_user_repo.get_by_id.return_value = sample_user_data
+
+        first = await auth_service.get_user_by_id(user_id)
+        second = await auth_service.get_user_by_id(user_id)
+
+        assert first == second
+        mock_user_repo.get_by_id.assert_awaited_once_with(user_id)
+        assert cache.stats()["hits"] == 1
+
+        cache.invalidate(user_id)
+        await auth_service.get_user_by_id(user_id)
+        assert mock_user_repo.get_by_id.await_count == 2
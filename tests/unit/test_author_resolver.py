@@ -0,0 +1,54 @@
+import pytest
+from unittest.mock import AsyncMock
+from uuid import uuid4
+from src.services.author_resolver import AuthorResolver
+
+
+def upserted(*names):
+    return [
+        {"id": uuid4(), "first_name": first_name, "last_name": last_name}
+        for first_name, last_name in names
+    ]
+
+
+@pytest.mark.unit
+class TestAuthorResolver:
+
+    @pytest.mark.parametrize("name, expected", [
+        ("John Ronald Tolkien", ("John Ronald", "Tolkien")),
+        ("Homer", ("Homer", "Author")),
+        ("", ("Unknown", "Author")),
+    ])
+    def test_split_name(self, name, expected):
+        assert AuthorResolver.split_name(name) == expected
+
+    async def test_resolves_distinct_names_once(self):
+        rows = upserted(("Jane", "Smith"), ("John", "Doe"))
+        upsert = AsyncMock(return_value=rows)
+        resolver = AuthorResolver(upsert)
+
+        await resolver.resolve_many(["Jane Smith", "john  doe", "Jane Smith"])
+        await resolver.resolve_many(["Jane Smith", "John Doe"])
+
+        upsert.assert_awaited_once_with(["Jane", "John"], ["Smith", "Doe"])
+        assert resolver.get(" Jane Smith ") == rows[0]["id"]
+        assert resolver.get("john doe") == rows[1]["id"]
+
+    async def test_only_new_names_are_upserted(self):
+        upsert = AsyncMock(side_effect=[upserted(("Jane", "Smith")), upserted(("Ann", "Lee"))])
+        resolver = AuthorResolver(upsert)
+
+        await resolver.resolve_many(["Jane Smith"])
+        await resolver.resolve_many(["Jane Smith", "Ann Lee"])
+
+        assert upsert.await_args_list[1].args == (["Ann"], ["Lee"])
+
+    async def test_invalid_name_raises_on_get(self):
+        upsert = AsyncMock()
+        resolver = AuthorResolver(upsert)
+
+        await resolver.resolve_many(["123 456"])
+
+        upsert.assert_not_called()
+        with pytest.raises(ValueError, match="Invalid author name"):
+            resolver.get("123 456")
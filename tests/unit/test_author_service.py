@@ -3,6 +3,7 @@ from datetime import datetime, timezone
 import pytest
 from unittest.mock import AsyncMock
 from uuid import uuid4
+from fastapi import HTTPException
 from src.services.author_service import AuthorService
 from src.schemas.author import AuthorCreate, AuthorUpdate
 
@@ -59,8 +60,7 @@ class TestAuthorService:
             {"id": uuid4(), "first_name": "Jane", "last_name": "Smith", "created_at": datetime.now(timezone.utc), "updated_at": datetime.now(timezone.utc)}
         ]
 
-        mock_author_repo.get_all.return_value = mock_authors
-        mock_author_repo.get_total_count.return_value = 2
+        mock_author_repo.get_page.return_value = (mock_authors, 2)
 
         result = await author_service.get_authors(page=1, size=10)
 
@@ -73,7 +73,6 @@ class TestAuthorService:
         author_id = sample_author_data["id"]
         update_data = AuthorUpdate(first_name="Updated John")
 
-        mock_author_repo.get_by_id.return_value = sample_author_data
         updated_data = {**sample_author_data, "first_name": "Updated John"}
         mock_author_repo.update.return_value = updated_data
 
@@ -86,15 +85,16 @@ class TestAuthorService:
         author_id = uuid4()
         update_data = AuthorUpdate(first_name="Updated")
 
-        mock_author_repo.get_by_id.return_value = None
+        mock_author_repo.update.return_value = None
 
-        with pytest.raises(Exception):
+        with pytest.raises(HTTPException) as exc_info:
             await author_service.update_author(author_id, update_data)
 
+        assert exc_info.value.status_code == 404
+
     async def test_delete_author_success(self, author_service, mock_author_repo, sample_author_data):
         author_id = sample_author_data["id"]
 
-        mock_author_repo.get_by_id.return_value = sample_author_data
         mock_author_repo.delete.return_value = True
 
         result = await author_service.delete_author(author_id)
@@ -104,7 +104,24 @@ class TestAuthorService:
 
     async def test_delete_author_not_found(self, author_service, mock_author_repo):
         author_id = uuid4()
-        mock_author_repo.get_by_id.return_value = None
+        mock_author_repo.delete.return_value = False
 
-        with pytest.raises(Exception):
+        with pytest.raises(HTTPException) as exc_info:
             await author_service.delete_author(author_id)
+
+        assert exc_info.value.status_code == 404
+        mock_author_repo.get_by_id.assert_not_called()
+
+    async def test_get_authors_follows_cursor(self, author_service, mock_author_repo, sample_author_data):
+        mock_author_repo.get_page.return_value = ([
+            {**sample_author_data, "id": uuid4(), "last_name": name} for name in ("Doe", "Poe", "Roe")
+        ], 3)
+
+        first = await author_service.get_authors(page=1, size=2)
+        assert first.next_cursor is not None
+
+        mock_author_repo.get_page.return_value = ([], 3)
+        await author_service.get_authors(size=2, cursor=first.next_cursor)
+
+        decoded = mock_author_repo.get_page.call_args.args[2]
+        assert decoded.key == ["Poe", "John"]
@@ -1,10 +1,15 @@
 from datetime import datetime, timezone
 
+import asyncpg
 import pytest
 from unittest.mock import AsyncMock, patch
 from uuid import uuid4
+from fastapi import HTTPException
+from src.core.cursor import encode_cursor
+from src.services.author_loader import AuthorLoader
 from src.services.book_service import BookService
 from src.schemas.book import BookCreate, BookUpdate, BookFilters, Genre
+from src.schemas.pagination import CountMode
 
 
 @pytest.mark.unit
@@ -22,6 +27,7 @@ class TestBookService:
     @pytest.fixture
     def mock_author_repo(self, book_service):
         book_service.author_repo = AsyncMock()
+        book_service.author_loader = AuthorLoader(book_service.author_repo.get_by_ids)
         return book_service.author_repo
 
     async def test_create_book_success(self, book_service, mock_book_repo, mock_author_repo, sample_book_data,
@@ -35,14 +41,22 @@ class TestBookService:
             author_id=sample_author_data["id"],
         )
 
-        mock_author_repo.get_by_id.return_value = sample_author_data
-        mock_book_repo.create.return_value = sample_book_data
+        mock_book_repo.create.return_value = {
+            **sample_book_data,
+            "author_id": sample_author_data["id"],
+            "first_name": sample_author_data["first_name"],
+            "last_name": sample_author_data["last_name"],
+            "biography": sample_author_data.get("biography"),
+            "author_created_at": sample_author_data["created_at"],
+            "author_updated_at": sample_author_data["updated_at"],
+        }
 
         result = await book_service.create_book(book_data)
 
         assert hasattr(result, 'title')
-        assert hasattr(result, 'content')
+        assert result.author.id == sample_author_data["id"]
         mock_book_repo.create.assert_called_once_with(book_data)
+        mock_author_repo.get_by_ids.assert_not_called()
 
     async def test_create_book_invalid_author(self, book_service, mock_book_repo, mock_author_repo):
         book_data = BookCreate(
@@ -54,17 +68,20 @@ class TestBookService:
             author_id=uuid4()
         )
 
-        mock_author_repo.get_by_id.return_value = None
+        mock_book_repo.create.side_effect = asyncpg.ForeignKeyViolationError("books_author_id_fkey")
 
-        with pytest.raises(Exception):
+        with pytest.raises(HTTPException) as exc_info:
             await book_service.create_book(book_data)
 
+        assert exc_info.value.status_code == 404
+        assert str(book_data.author_id) in exc_info.value.detail
+
     async def test_get_book_by_id_success(self, book_service, mock_book_repo, mock_author_repo, sample_book_data,
                                           sample_author_data):
         book_id = sample_book_data["id"]
 
-        mock_book_repo.get_by_id.return_value = sample_book_data
-        mock_author_repo.get_by_id.return_value = sample_author_data
+        mock_book_repo.get_by_id.return_value = {**sample_book_data, "author_id": sample_author_data["id"]}
+        mock_author_repo.get_by_ids.return_value = [sample_author_data]
 
         result = await book_service.get_book_by_id(book_id)
 
@@ -78,8 +95,8 @@ class TestBookService:
         with pytest.raises(Exception):
             await book_service.get_book_by_id(book_id)
 
-    async def test_get_books_with_filters(self, book_service, mock_book_repo):
-        filters = BookFilters(genre=Genre.fiction)
+    async def test_get_books_with_filters(self, book_service, mock_book_repo, mock_author_repo):
+        filters = BookFilters(genres=[Genre.fiction])
 
         mock_books = [
             {
@@ -106,8 +123,8 @@ class TestBookService:
             }
         ]
 
-        mock_book_repo.get_all.return_value = mock_books
-        mock_book_repo.get_total_count.return_value = 2
+        mock_book_repo.get_page.return_value = (mock_books, 2)
+        mock_author_repo.get_by_ids.return_value = []
 
         with patch.object(book_service, "_format_book_response", side_effect=lambda b: b):
             result = await book_service.get_books(filters, page=1, size=10)
@@ -121,22 +138,168 @@ class TestBookService:
         book_id = sample_book_data["id"]
         update_data = BookUpdate(title="Updated Title")
 
-        mock_book_repo.get_by_id.return_value = sample_book_data
         updated_data = {**sample_book_data, "title": "Updated Title"}
         mock_book_repo.update.return_value = updated_data
-        mock_author_repo.get_by_id.return_value = None  # No author update
+        mock_author_repo.get_by_ids.return_value = []  # No author update
 
         result = await book_service.update_book(book_id, update_data)
 
         assert hasattr(result, 'title')
         mock_book_repo.update.assert_called_once()
+        mock_book_repo.get_by_id.assert_not_called()
+
+    async def test_update_book_not_found(self, book_service, mock_book_repo):
+        mock_book_repo.update.return_value = None
+
+        with pytest.raises(HTTPException) as exc_info:
+            await book_service.update_book(uuid4(), BookUpdate(title="Updated Title"))
+
+        assert exc_info.value.status_code == 404
+
+    async def test_update_book_invalid_author(self, book_service, mock_book_repo):
+        author_id = uuid4()
+        mock_book_repo.update.side_effect = asyncpg.ForeignKeyViolationError("books_author_id_fkey")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await book_service.update_book(uuid4(), BookUpdate(author_id=author_id))
+
+        assert exc_info.value.status_code == 404
+        assert str(author_id) in exc_info.value.detail
 
     async def test_delete_book_success(self, book_service, mock_book_repo, sample_book_data):
         book_id = sample_book_data["id"]
 
-        mock_book_repo.get_by_id.return_value = sample_book_data
         mock_book_repo.delete.return_value = True
 
         result = await book_service.delete_book(book_id)
 
         assert result is True
+        mock_book_repo.get_by_id.assert_not_called()
+
+    async def test_delete_book_not_found(self, book_service, mock_book_repo):
+        mock_book_repo.delete.return_value = False
+
+        with pytest.raises(HTTPException) as exc_info:
+            await book_service.delete_book(uuid4())
+
+        assert exc_info.value.status_code == 404
+
+    async def test_get_books_returns_next_cursor(self, book_service, mock_book_repo, mock_author_repo,
+                                                 sample_book_data):
+        rows = [
+            {**sample_book_data, "id": uuid4(), "title": f"Book {i}"} for i in range(3)
+        ]
+        mock_book_repo.get_page.return_value = (rows, 5)
+
+        with patch.object(book_service, "_format_book_response", side_effect=lambda b: b):
+            result = await book_service.get_books(BookFilters(), page=1, size=2)
+
+        assert len(result.items) == 2
+        assert result.next_cursor is not None
+        assert result.prev_cursor is None
+        args = mock_book_repo.get_page.call_args.args
+        assert args[1] == 3  # one extra row to detect the next page
+
+    async def test_get_books_with_cursor_uses_keyset(self, book_service, mock_book_repo, mock_author_repo,
+                                                     sample_book_data):
+        mock_book_repo.get_page.return_value = ([sample_book_data], 1)
+        cursor = encode_cursor("title", "asc", ["Test Book"], uuid4(), "next")
+
+        with patch.object(book_service, "_format_book_response", side_effect=lambda b: b):
+            result = await book_service.get_books(BookFilters(), size=2, cursor=cursor)
+
+        decoded = mock_book_repo.get_page.call_args.args[5]
+        assert decoded.key == ["Test Book"]
+        assert mock_book_repo.get_page.call_args.args[2] == 0
+        assert result.page is None
+        assert result.next_cursor is None
+        assert result.prev_cursor is not None
+
+    async def test_get_books_rejects_cursor_for_other_sort(self, book_service, mock_book_repo):
+        cursor = encode_cursor("year", "desc", [2020], uuid4(), "next")
+
+        with pytest.raises(HTTPException) as exc:
+            await book_service.get_books(BookFilters(), sort_by="title", cursor=cursor)
+
+        assert exc.value.status_code == 400
+
+    async def test_get_books_sorted_by_author_pages_without_cursors(self, book_service, mock_book_repo,
+                                                                   mock_author_repo, sample_book_data):
+        rows = [
+            {**sample_book_data, "id": uuid4(), "title": f"Book {i}"} for i in range(3)
+        ]
+        mock_book_repo.get_page.return_value = (rows, 5)
+
+        with patch.object(book_service, "_format_book_response", side_effect=lambda b: b):
+            result = await book_service.get_books(BookFilters(), page=2, size=2, sort_by="author")
+
+        assert len(result.items) == 2
+        assert (result.next_cursor, result.prev_cursor) == (None, None)
+        assert mock_book_repo.get_page.call_args.args[2] == 2
+
+        cursor = encode_cursor("author", "asc", ["Doe"], uuid4(), "next")
+        with pytest.raises(HTTPException) as exc:
+            await book_service.get_books(BookFilters(), sort_by="author", cursor=cursor)
+        assert exc.value.status_code == 400
+
+    async def test_book_without_year_is_formatted(self, book_service, sample_book_data):
+        book = await book_service._format_book_response(
+            {**sample_book_data, "author_id": None, "published_year": None}
+        )
+
+        assert book.published_year is None
+
+    async def test_get_books_builds_authors_from_joined_rows(self, book_service, mock_book_repo, mock_author_repo,
+                                                             sample_book_data, sample_author_data):
+        joined = {
+            **sample_book_data,
+            "author_id": sample_author_data["id"],
+            "first_name": "John",
+            "last_name": "Doe",
+            "biography": None,
+            "author_created_at": sample_author_data["created_at"],
+            "author_updated_at": sample_author_data["updated_at"],
+        }
+        mock_book_repo.get_page.return_value = ([joined, {**joined, "id": uuid4()}], 2)
+
+        result = await book_service.get_books(BookFilters(), page=1, size=10)
+
+        assert [book.author.last_name for book in result.items] == ["Doe", "Doe"]
+        mock_author_repo.get_by_ids.assert_not_called()
+        mock_author_repo.get_by_id.assert_not_called()
+
+    async def test_get_books_batches_missing_authors(self, book_service, mock_book_repo, mock_author_repo,
+                                                     sample_book_data, sample_author_data):
+        author_id = sample_author_data["id"]
+        mock_book_repo.get_page.return_value = ([
+            {**sample_book_data, "id": uuid4(), "author_id": author_id} for _ in range(3)
+        ], 3)
+        mock_author_repo.get_by_ids.return_value = [sample_author_data]
+
+        result = await book_service.get_books(BookFilters(), page=1, size=10)
+
+        assert all(book.author.id == author_id for book in result.items)
+        mock_author_repo.get_by_ids.assert_awaited_once_with([author_id])
+
+    async def test_get_books_without_count(self, book_service, mock_book_repo, mock_author_repo, sample_book_data):
+        mock_book_repo.get_page.return_value = ([sample_book_data], None)
+        mock_author_repo.get_by_ids.return_value = []
+
+        result = await book_service.get_books(BookFilters(), count_mode=CountMode.none)
+
+        assert result.total is None
+        assert mock_book_repo.get_page.call_args.args[6] == CountMode.none
+
+    async def test_search_books_returns_ranked_results(self, book_service, mock_book_repo, mock_author_repo,
+                                                      sample_book_data):
+        mock_book_repo.search.return_value = (
+            [{**sample_book_data, "author_id": None, "rank": 0.5, "highlight": "a <mark>test</mark> book"}],
+            1,
+        )
+
+        result = await book_service.search_books("test", page=1, size=10)
+
+        assert result.total == 1
+        assert result.items[0].rank == 0.5
+        assert result.items[0].highlight == "a <mark>test</mark> book"
+        mock_book_repo.search.assert_awaited_once_with("test", 10, 0, CountMode.exact)
@@ -0,0 +1,117 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from uuid import uuid4
+from src.core.cache import TTLCache, user_cache
+from src.repositories.user import UserRepository
+from src.schemas.user import UserUpdate
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.unit
+class TestTTLCache:
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    def test_entries_expire_after_ttl(self, clock):
+        cache = TTLCache(max_size=10, ttl=5, clock=clock)
+        cache.set("a", 1)
+
+        clock.now = 4.9
+        assert cache.get("a") == 1
+        clock.now = 5.0
+        assert cache.get("a") is None
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 0)
+
+    def test_evicts_least_recently_used(self, clock):
+        cache = TTLCache(max_size=2, ttl=5, clock=clock)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_entry_ttl_only_shortens_cache_ttl(self, clock):
+        cache = TTLCache(max_size=10, ttl=5, clock=clock)
+        cache.set("short", 1, ttl=2)
+        cache.set("long", 2, ttl=60)
+        cache.set("expired", 3, ttl=-1)
+
+        clock.now = 3
+        assert cache.get("short") is None
+        assert cache.get("long") == 2
+        assert cache.get("expired") is None
+
+    def test_zero_ttl_disables_caching(self, clock):
+        cache = TTLCache(max_size=10, ttl=0, clock=clock)
+        cache.set("a", 1)
+
+        assert cache.get("a") is None
+        assert cache.stats()["size"] == 0
+
+    async def test_get_or_load_does_not_cache_missing_values(self):
+        cache = TTLCache(max_size=10, ttl=5)
+        load = AsyncMock(return_value=None)
+
+        assert await cache.get_or_load("a", load) is None
+        assert await cache.get_or_load("a", load) is None
+        assert load.await_count == 2
+
+    async def test_load_racing_an_invalidation_is_not_stored(self):
+        cache = TTLCache(max_size=10, ttl=5)
+        loading = asyncio.Event()
+        release = asyncio.Event()
+
+        async def load():
+            loading.set()
+            await release.wait()
+            return "stale"
+
+        task = asyncio.ensure_future(cache.get_or_load("a", load))
+        await loading.wait()
+        cache.invalidate("a")
+        release.set()
+
+        assert await task == "stale"
+        assert cache.get("a") is None
+
+
+@pytest.mark.unit
+class TestUserCacheInvalidation:
+
+    @pytest.fixture
+    def repo(self):
+        repo = UserRepository(AsyncMock())
+        repo.fetch_one = AsyncMock(return_value={"id": uuid4()})
+        repo.execute = AsyncMock(return_value="UPDATE 1")
+        return repo
+
+    async def test_update_invalidates_user(self, repo):
+        user_id = uuid4()
+        user_cache.set(user_id, "cached")
+
+        await repo.update(user_id, UserUpdate(full_name="Renamed"))
+
+        assert user_cache.get(user_id) is None
+
+    async def test_delete_invalidates_user(self, repo):
+        user_id = uuid4()
+        user_cache.set(user_id, "cached")
+
+        assert await repo.delete(user_id)
+        assert user_cache.get(user_id) is None
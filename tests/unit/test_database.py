@@ -0,0 +1,276 @@
+import asyncio
+import itertools
+import time
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock
+from fastapi import Depends, FastAPI, HTTPException
+from httpx import AsyncClient
+from src.core.database import (
+    ConnectionProvider,
+    Database,
+    PoolStats,
+    READ_PRIMARY_COOKIE,
+    get_db,
+    get_read_db,
+    get_write_db,
+    database,
+)
+
+
+class FakePool:
+    def __init__(self, name, size=2, idle=1):
+        self.name = name
+        self.size = size
+        self.idle = idle
+        self.released = []
+
+    async def acquire(self, timeout=None):
+        return self.name
+
+    async def release(self, connection):
+        self.released.append(connection)
+
+    def get_min_size(self):
+        return 1
+
+    def get_max_size(self):
+        return 10
+
+    def get_size(self):
+        return self.size
+
+    def get_idle_size(self):
+        return self.idle
+
+
+class FakeConnection:
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def fetchval(self, query, *args):
+        return self.pool.get_size() - self.pool.get_idle_size()
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+
+class CountingPool(FakePool):
+    """Tracks how many connections are borrowed at once"""
+
+    def __init__(self, name):
+        super().__init__(name, size=0, idle=0)
+        self.acquired = 0
+
+    async def acquire(self, timeout=None):
+        self.acquired += 1
+        self.size += 1
+        return FakeConnection(self)
+
+    async def release(self, connection):
+        self.size -= 1
+        self.released.append(connection)
+
+
+class ExhaustedPool(FakePool):
+    async def acquire(self, timeout=None):
+        raise asyncio.TimeoutError()
+
+
+def make_request(method="GET", cookies=None):
+    request = MagicMock()
+    request.method = method
+    request.cookies = cookies or {}
+    return request
+
+
+@pytest.mark.unit
+class TestDatabaseRouting:
+
+    @pytest.fixture
+    def routed_database(self, monkeypatch):
+        monkeypatch.setattr(database, "pool", FakePool("primary"))
+        monkeypatch.setattr(database, "replica_pools", [FakePool("replica-1"), FakePool("replica-2")])
+        monkeypatch.setattr(database, "_replica_cycle", itertools.cycle(database.replica_pools))
+        return database
+
+    def test_read_pool_falls_back_to_primary(self):
+        db = Database()
+        db.pool = FakePool("primary")
+
+        assert db.read_pool() is db.pool
+
+    def test_read_pool_round_robins_replicas(self, routed_database):
+        names = [routed_database.read_pool().name for _ in range(4)]
+
+        assert names == ["replica-1", "replica-2", "replica-1", "replica-2"]
+
+    async def test_get_read_db_uses_replica(self, routed_database):
+        provider = await get_read_db(make_request())
+
+        assert provider._pool.name.startswith("replica")
+
+    async def test_get_read_db_reads_own_writes_from_primary(self, routed_database):
+        request = make_request(cookies={READ_PRIMARY_COOKIE: str(time.time() + 5)})
+
+        assert (await get_read_db(request))._pool.name == "primary"
+
+    async def test_get_read_db_ignores_expired_write_window(self, routed_database):
+        request = make_request(cookies={READ_PRIMARY_COOKIE: str(time.time() - 1)})
+
+        assert (await get_read_db(request))._pool.name.startswith("replica")
+
+    @staticmethod
+    def write_app():
+        app = FastAPI()
+
+        @app.post("/write")
+        async def write(connection=Depends(get_write_db)):
+            return {"pool": connection._pool.name}
+
+        @app.post("/failed-write")
+        async def failed_write(connection=Depends(get_write_db)):
+            raise HTTPException(status_code=409, detail="Conflict")
+
+        @app.post("/login")
+        async def login(connection=Depends(get_db)):
+            return {"pool": connection._pool.name}
+
+        return app
+
+    async def test_successful_write_pins_reads_to_primary(self, routed_database):
+        async with AsyncClient(app=self.write_app(), base_url="http://test") as client:
+            response = await client.post("/write")
+
+        assert response.json()["pool"] == "primary"
+        assert READ_PRIMARY_COOKIE in response.cookies
+
+    async def test_failed_write_and_other_posts_do_not_pin_reads(self, routed_database):
+        async with AsyncClient(app=self.write_app(), base_url="http://test") as client:
+            failed = await client.post("/failed-write")
+            login = await client.post("/login")
+
+        assert failed.status_code == 409
+        assert login.json()["pool"] == "primary"
+        assert READ_PRIMARY_COOKIE not in failed.cookies
+        assert READ_PRIMARY_COOKIE not in login.cookies
+
+
+@pytest.mark.unit
+class TestPoolStats:
+
+    def test_percentiles_empty(self):
+        assert PoolStats("primary").latency_percentiles() == {
+            "p50_ms": 0.0, "p90_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0
+        }
+
+    def test_percentiles_nearest_rank(self):
+        stats = PoolStats("primary")
+        for ms in range(1, 101):
+            stats.record(ms / 1000)
+
+        percentiles = stats.latency_percentiles()
+
+        assert stats.acquired_total == 100
+        assert percentiles["p50_ms"] == 51.0
+        assert percentiles["p90_ms"] == 91.0
+        assert percentiles["p99_ms"] == 100.0
+        assert percentiles["max_ms"] == 100.0
+
+    def test_window_is_bounded(self):
+        stats = PoolStats("primary", samples=10)
+        for _ in range(50):
+            stats.record(0.001)
+
+        assert len(stats._latencies) == 10
+        assert stats.acquired_total == 50
+
+    async def test_get_connection_records_acquire_and_releases(self):
+        db = Database()
+        db.pool = FakePool("primary")
+        db._stats[db.pool] = PoolStats("primary")
+
+        async with db.get_connection() as connection:
+            assert connection == "primary"
+            assert db._stats[db.pool].waiting == 0
+
+        assert db.pool.released == ["primary"]
+        snapshot = db.pool_stats()[0]
+        assert snapshot["acquired_total"] == 1
+        assert snapshot["in_use"] == 1
+        assert snapshot["idle"] == 1
+
+    async def test_get_connection_counts_timeouts(self):
+        db = Database()
+        db.pool = ExhaustedPool("primary")
+        db._stats[db.pool] = PoolStats("primary")
+
+        with pytest.raises(asyncio.TimeoutError):
+            async with db.get_connection():
+                pass
+
+        stats = db._stats[db.pool]
+        assert stats.acquire_timeouts == 1
+        assert stats.waiting == 0
+        assert stats.acquired_total == 0
+
+
+@pytest.mark.unit
+class TestConnectionProvider:
+
+    @pytest.fixture
+    def provider(self):
+        db = Database()
+        db.pool = CountingPool("primary")
+        db._stats[db.pool] = PoolStats("primary")
+        return ConnectionProvider(db, db.pool)
+
+    async def test_borrows_per_query(self, provider):
+        assert await provider.fetchval("SELECT 1") == 1
+        assert await provider.fetchval("SELECT 1") == 1
+
+        pool = provider._pool
+        assert pool.acquired == 2
+        assert pool.size == 0
+
+    async def test_transaction_pins_one_connection(self, provider):
+        async with provider.transaction() as connection:
+            await provider.fetchval("SELECT 1")
+            await provider.fetchval("SELECT 1")
+            assert provider._pinned[asyncio.current_task()] is connection
+
+        pool = provider._pool
+        assert pool.acquired == 1
+        assert pool.released == [connection]
+        assert provider._pinned == {}
+
+    async def test_unit_of_work_releases_on_error(self, provider):
+        with pytest.raises(ValueError):
+            async with provider.acquire():
+                raise ValueError("boom")
+
+        assert provider._pool.size == 0
+        assert provider._pinned == {}
+
+    async def test_pin_is_not_shared_with_other_tasks(self, provider):
+        pinned = asyncio.Event()
+        done = asyncio.Event()
+
+        async def in_transaction():
+            async with provider.transaction() as connection:
+                pinned.set()
+                await done.wait()
+                return connection
+
+        async def alongside():
+            await pinned.wait()
+            async with provider.acquire() as connection:
+                done.set()
+                return connection
+
+        owner, other = await asyncio.gather(in_transaction(), alongside())
+
+        assert owner is not other
+        assert provider._pool.acquired == 2
+        assert provider._pinned == {}
@@ -0,0 +1,120 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+from uuid import uuid4
+from src.core.settings import settings
+from src.schemas.book import BookFilters, ExportFormat
+from src.services.export_service import ExportService, accepts_gzip
+
+
+@pytest.mark.unit
+class TestExportService:
+
+    @pytest.fixture
+    def export_service(self):
+        return ExportService(MagicMock())
+
+    @staticmethod
+    def book_record(title="Book", with_author=True):
+        now = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        return {
+            "id": uuid4(),
+            "title": title,
+            "content": "Content, with \"quotes\"\nand a newline",
+            "description": None,
+            "published_year": 2001,
+            "genre": "Fiction",
+            "created_at": now,
+            "updated_at": now,
+            "author_id": uuid4() if with_author else None,
+            "first_name": "Jane" if with_author else None,
+            "last_name": "Smith" if with_author else None,
+            "biography": None,
+            "author_created_at": now if with_author else None,
+            "author_updated_at": now if with_author else None,
+        }
+
+    def stream(self, export_service, records):
+        captured = {}
+
+        async def stream_filtered(filters, prefetch):
+            captured["prefetch"] = prefetch
+            for record in records:
+                yield record
+
+        export_service.book_repo.stream_filtered = stream_filtered
+        return captured
+
+    @staticmethod
+    async def collect(chunks):
+        return b"".join([chunk async for chunk in chunks])
+
+    async def test_csv_export_round_trips(self, export_service):
+        records = [self.book_record("One"), self.book_record("Two", with_author=False)]
+        captured = self.stream(export_service, records)
+
+        body = await self.collect(
+            export_service.export_books(BookFilters(), ExportFormat.csv)
+        )
+
+        rows = list(csv.DictReader(io.StringIO(body.decode())))
+        assert [row["title"] for row in rows] == ["One", "Two"]
+        assert rows[0]["content"] == records[0]["content"]
+        assert rows[0]["author_last_name"] == "Smith"
+        assert rows[1]["author_id"] == ""
+        assert captured["prefetch"] == settings.EXPORT_PREFETCH_ROWS
+
+    async def test_ndjson_export_writes_one_document_per_line(self, export_service):
+        records = [self.book_record("One"), self.book_record("Two", with_author=False)]
+        self.stream(export_service, records)
+
+        body = await self.collect(
+            export_service.export_books(BookFilters(), ExportFormat.ndjson)
+        )
+
+        lines = body.decode().splitlines()
+        assert [json.loads(line)["title"] for line in lines] == ["One", "Two"]
+        assert json.loads(lines[0])["author"]["first_name"] == "Jane"
+        assert json.loads(lines[1])["author"] is None
+        assert body.endswith(b"\n")
+
+    @pytest.mark.parametrize("count", [0, 1, 50])
+    async def test_json_export_is_a_valid_array_across_chunks(self, export_service, monkeypatch,
+                                                              count):
+        monkeypatch.setattr(settings, "EXPORT_CHUNK_SIZE", 256)
+        self.stream(export_service, [self.book_record(f"Book {i}") for i in range(count)])
+
+        chunks = [
+            chunk async for chunk in
+            export_service.export_books(BookFilters(), ExportFormat.json)
+        ]
+
+        documents = json.loads(b"".join(chunks))
+        assert [document["title"] for document in documents] == [f"Book {i}" for i in range(count)]
+        if count == 50:
+            assert len(chunks) > 1
+
+    async def test_compressed_export_is_gzip(self, export_service):
+        self.stream(export_service, [self.book_record(f"Book {i}") for i in range(20)])
+
+        body = await self.collect(
+            export_service.export_books(BookFilters(), ExportFormat.ndjson, compress=True)
+        )
+
+        assert len(gzip.decompress(body).splitlines()) == 20
+
+    @pytest.mark.parametrize("header, expected", [
+        ("gzip, deflate, br", True),
+        ("GZIP", True),
+        ("*", True),
+        ("gzip;q=0", False),
+        ("deflate, gzip;q=0.5", True),
+        ("br", False),
+        (None, False),
+    ])
+    def test_accepts_gzip(self, header, expected):
+        assert accepts_gzip(header) is expected
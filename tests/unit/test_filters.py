@@ -0,0 +1,53 @@
+import pytest
+from src.repositories.filters import FilterCompiler, compile_author_search, compile_book_filters
+from src.schemas.book import BookFilters, Genre
+
+
+@pytest.mark.unit
+class TestFilterCompiler:
+
+    def test_empty_filters_compile_to_true(self):
+        compiler = compile_book_filters(BookFilters())
+
+        assert compiler.sql == "TRUE"
+        assert compiler.params == []
+
+    def test_year_range_is_plain_comparison(self):
+        compiler = compile_book_filters(BookFilters(year_from=1990, year_to=2000))
+
+        assert compiler.sql == "b.published_year >= $1 AND b.published_year <= $2"
+        assert compiler.params == [1990, 2000]
+        assert "EXTRACT" not in compiler.sql
+
+    def test_genre_filters(self):
+        single = compile_book_filters(BookFilters(genres=[Genre.mystery]))
+        several = compile_book_filters(BookFilters(genres=[Genre.mystery, Genre.fantasy]))
+
+        assert single.sql == several.sql == "b.genre = ANY($1::varchar[])"
+        assert single.params == [["Mystery"]]
+        assert several.params == [["Mystery", "Fantasy"]]
+
+    def test_sql_text_is_stable_per_filter_shape(self):
+        first = compile_book_filters(BookFilters(title="dune", author="herbert", year_from=1960))
+        second = compile_book_filters(BookFilters(title="emma", author="austen", year_from=1815))
+
+        assert first.sql == second.sql
+        assert first.params != second.params
+
+    def test_in_list_text_does_not_depend_on_length(self):
+        short = compile_book_filters(BookFilters(genres=[Genre.mystery, Genre.fantasy]))
+        long = compile_book_filters(BookFilters(genres=list(Genre)))
+
+        assert short.sql == long.sql
+
+    def test_raw_predicate_reuses_placeholder(self):
+        compiler = FilterCompiler().equals("a", 1).where("(b = {0} OR c = {0})", 2)
+
+        assert compiler.sql == "a = $1 AND (b = $2 OR c = $2)"
+        assert compiler.params == [1, 2]
+
+    def test_author_search_matches_index_expression(self):
+        compiler = compile_author_search("tolk")
+
+        assert compiler.sql == "LOWER(first_name || ' ' || last_name) LIKE LOWER($1)"
+        assert compiler.params == ["%tolk%"]
@@ -0,0 +1,130 @@
+import json
+import pytest
+from collections import Counter
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+from uuid import uuid4
+from src.core.settings import settings
+from src.schemas.import_job import ImportJobStatus
+from src.services import import_jobs
+from src.services.import_jobs import ImportJobRunner, to_import_job
+
+
+def job_row(**overrides):
+    now = datetime.now(timezone.utc)
+    return {
+        "id": uuid4(),
+        "status": "running",
+        "filename": "books.json",
+        "content_type": "application/json",
+        "file_path": "/nonexistent",
+        "mode": "skip",
+        "last_committed_row": 0,
+        "success_count": 0,
+        "error_count": 0,
+        "updated_count": 0,
+        "skipped_count": 0,
+        "errors": [],
+        "error_message": None,
+        "created_at": now,
+        "started_at": now,
+        "finished_at": None,
+        **overrides,
+    }
+
+
+class FakeProvider:
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+
+@pytest.mark.unit
+class TestImportJobs:
+
+    def test_to_import_job_throughput(self):
+        started = datetime.now(timezone.utc) - timedelta(seconds=10)
+        row = job_row(
+            status="completed", last_committed_row=5000, started_at=started,
+            finished_at=started + timedelta(seconds=4),
+        )
+
+        job = to_import_job(row)
+
+        assert job.status == ImportJobStatus.completed
+        assert job.processed_rows == 5000
+        assert job.rows_per_second == 1250.0
+
+    def test_to_import_job_not_started(self):
+        assert to_import_job(job_row(status="pending", started_at=None)).rows_per_second is None
+
+    async def test_process_resumes_after_last_committed_row(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 2)
+        path = tmp_path / "books.upload"
+        path.write_text(json.dumps([{"title": f"Book {i}"} for i in range(1, 6)]))
+
+        jobs = AsyncMock()
+        jobs.mark_running.return_value = job_row(file_path=str(path), last_committed_row=2)
+        monkeypatch.setattr(import_jobs, "ImportJobRepository", lambda provider: jobs)
+
+        imported = []
+
+        async def import_batch(self, batch, offset, errors):
+            imported.append((offset, [row["title"] for row in batch]))
+            return Counter(inserted=len(batch) - 1, skipped=1)
+
+        monkeypatch.setattr(import_jobs.ImportService, "import_batch", import_batch)
+
+        await ImportJobRunner()._process(FakeProvider(), uuid4())
+
+        assert imported == [(2, ["Book 3", "Book 4"]), (4, ["Book 5"])]
+        assert [call.args[1] for call in jobs.commit_batch.await_args_list] == [4, 5]
+        assert [call.args[2] for call in jobs.commit_batch.await_args_list] == [1, 0]
+        assert [call.args[6] for call in jobs.commit_batch.await_args_list] == [1, 1]
+        jobs.finish.assert_awaited_once()
+        assert jobs.finish.await_args.args[1] == ImportJobStatus.completed
+        assert not path.exists()
+
+    async def test_process_marks_failure(self, tmp_path, monkeypatch):
+        path = tmp_path / "books.upload"
+        path.write_text("[{oops")
+
+        jobs = AsyncMock()
+        jobs.mark_running.return_value = job_row(file_path=str(path))
+        monkeypatch.setattr(import_jobs, "ImportJobRepository", lambda provider: jobs)
+
+        await ImportJobRunner()._process(FakeProvider(), uuid4())
+
+        assert jobs.finish.await_args.args[1] == ImportJobStatus.failed
+        assert "Invalid JSON" in jobs.finish.await_args.args[2]
+
+    async def test_process_skips_finished_job(self, monkeypatch):
+        jobs = AsyncMock()
+        jobs.mark_running.return_value = None
+        monkeypatch.setattr(import_jobs, "ImportJobRepository", lambda provider: jobs)
+
+        await ImportJobRunner()._process(FakeProvider(), uuid4())
+
+        jobs.finish.assert_not_called()
+
+    async def test_recover_only_resumes_jobs_spooled_on_this_host(self, tmp_path, monkeypatch):
+        legacy_file = tmp_path / "legacy.upload"
+        legacy_file.write_bytes(b"[]")
+        local, legacy_here, legacy_elsewhere = uuid4(), uuid4(), uuid4()
+        jobs = AsyncMock()
+        jobs.get_unfinished.return_value = [
+            {"id": local, "file_path": "/spool/a.upload", "spool_host": settings.IMPORT_SPOOL_HOST},
+            {"id": legacy_here, "file_path": str(legacy_file), "spool_host": None},
+            {"id": legacy_elsewhere, "file_path": "/nonexistent", "spool_host": None},
+        ]
+        monkeypatch.setattr(import_jobs, "ImportJobRepository", lambda provider: jobs)
+        monkeypatch.setattr(import_jobs.database, "provider", lambda: None)
+        runner = ImportJobRunner()
+        submitted = []
+        monkeypatch.setattr(runner, "submit", submitted.append)
+
+        await runner.recover()
+
+        jobs.get_unfinished.assert_awaited_once_with(settings.IMPORT_SPOOL_HOST)
+        assert submitted == [local, legacy_here]
@@ -0,0 +1,172 @@
+import gzip
+import io
+import pytest
+from fastapi import HTTPException
+from src.core.settings import settings
+from src.services.import_parsers import (
+    iter_csv_rows,
+    iter_json_rows,
+    iter_ndjson_rows,
+    open_rows,
+    resolve_format,
+)
+
+NDJSON = b'{"title": "A"}\n\n{"title": "B"}\n'
+
+
+@pytest.mark.unit
+class TestImportParsers:
+
+    def test_csv_rows(self):
+        content = b'title,published_year\nBook 1,2023\n"Book, 2",2024\n'
+
+        rows = list(iter_csv_rows(io.BytesIO(content)))
+
+        assert rows == [
+            {"title": "Book 1", "published_year": "2023"},
+            {"title": "Book, 2", "published_year": "2024"},
+        ]
+
+    def test_csv_invalid_encoding(self):
+        with pytest.raises(HTTPException) as exc_info:
+            list(iter_csv_rows(io.BytesIO(b"title\n\xff\xfe\n")))
+
+        assert exc_info.value.status_code == 400
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 64 * 1024])
+    def test_json_array_across_chunk_boundaries(self, chunk_size):
+        content = '[{"title": "Ünïcode", "published_year": 2023}, {"title": "B", "n": 12345}]'.encode()
+
+        rows = list(iter_json_rows(io.BytesIO(content), chunk_size=chunk_size))
+
+        assert rows == [
+            {"title": "Ünïcode", "published_year": 2023},
+            {"title": "B", "n": 12345},
+        ]
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 5])
+    def test_json_values_cut_by_chunk_boundaries(self, chunk_size):
+        content = rb'[{"a": 1.25, "b": 3e+2, "c": true, "d": null, "e": "\u00e9x", "f": -7}]'
+
+        rows = list(iter_json_rows(io.BytesIO(content), chunk_size=chunk_size))
+
+        assert rows == [{"a": 1.25, "b": 300.0, "c": True, "d": None, "e": "éx", "f": -7}]
+
+    def test_json_syntax_error_does_not_read_to_eof(self):
+        body = b"[" + b",".join([b'{"title": "Book"}'] * 500_000) + b"]"
+        stream = io.BytesIO(b"[{titl" + body)
+
+        with pytest.raises(HTTPException) as exc_info:
+            list(iter_json_rows(stream, chunk_size=1024))
+
+        assert "Invalid JSON" in exc_info.value.detail
+        assert stream.tell() <= 1024
+
+    @pytest.mark.parametrize("chunk_size", [2, 64 * 1024])
+    def test_json_books_object(self, chunk_size):
+        content = b'{"meta": {"source": "x"}, "books": [{"title": "A"}], "count": 1}'
+
+        rows = list(iter_json_rows(io.BytesIO(content), chunk_size=chunk_size))
+
+        assert rows == [{"title": "A"}]
+
+    def test_json_object_without_books(self):
+        assert list(iter_json_rows(io.BytesIO(b'{"authors": []}'))) == []
+
+    def test_json_empty_array(self):
+        assert list(iter_json_rows(io.BytesIO(b" [ ] "))) == []
+
+    def test_json_is_lazy(self):
+        rows = iter_json_rows(io.BytesIO(b'[{"title": "A"}, {"title": "B"}, oops'), chunk_size=4)
+
+        assert next(rows) == {"title": "A"}
+        assert next(rows) == {"title": "B"}
+        with pytest.raises(HTTPException):
+            next(rows)
+
+    @pytest.mark.parametrize("content", [b"", b"[{}", b'[{"a": 1} {"b": 2}]', b"[] []", b"{bad}"])
+    def test_json_invalid(self, content):
+        with pytest.raises(HTTPException) as exc_info:
+            list(iter_json_rows(io.BytesIO(content)))
+
+        assert exc_info.value.status_code == 400
+        assert "Invalid JSON" in exc_info.value.detail
+
+    def test_ndjson_rows_skip_blank_lines(self):
+        assert list(iter_ndjson_rows(io.BytesIO(NDJSON))) == [{"title": "A"}, {"title": "B"}]
+
+    def test_ndjson_invalid_line(self):
+        with pytest.raises(HTTPException) as exc_info:
+            list(iter_ndjson_rows(io.BytesIO(b'{"title": "A"}\n{"title": \n')))
+
+        assert exc_info.value.status_code == 400
+        assert "line 2" in exc_info.value.detail
+
+    @pytest.mark.parametrize("content_type, filename", [
+        ("application/x-ndjson", None),
+        ("application/gzip", "books.ndjson.gz"),
+        ("application/octet-stream", "dump.jsonl.gz"),
+        ("application/gzip", None),
+        # Magic bytes win over a content type that doesn't mention compression
+        ("application/x-ndjson", "books.ndjson"),
+    ])
+    def test_open_rows_decompresses_gzip(self, content_type, filename):
+        body = gzip.compress(NDJSON) + gzip.compress(b'{"title": "C"}\n')
+
+        rows = list(open_rows(io.BytesIO(body), content_type, filename))
+
+        assert [row["title"] for row in rows] == ["A", "B", "C"]
+
+    def test_open_rows_decompresses_zstd(self):
+        zstandard = pytest.importorskip("zstandard")
+        body = zstandard.ZstdCompressor().compress(b"title,genre\nA,Fiction\n")
+
+        rows = list(open_rows(io.BytesIO(body), "application/zstd", "books.csv.zst"))
+
+        assert rows == [{"title": "A", "genre": "Fiction"}]
+
+    @pytest.mark.parametrize("head, expected", [
+        (b'  [{"title": "A"}]', "application/json"),
+        (b'{"books": [{"title": "A"}]}', "application/json"),
+        (b'{\n  "books": []\n}', "application/json"),
+        (NDJSON, "application/x-ndjson"),
+        (b"title,genre\nA,Fiction\n", "text/csv"),
+    ])
+    def test_resolve_format_sniffs_content(self, head, expected):
+        media_type, stream = resolve_format(io.BytesIO(gzip.compress(head)), "application/gzip")
+
+        assert media_type == expected
+        assert stream.read() == head
+
+    def test_resolve_format_rejects_truncated_gzip(self):
+        body = gzip.compress(NDJSON * 100)[:-20]
+
+        with pytest.raises(HTTPException) as exc_info:
+            list(open_rows(io.BytesIO(body), "application/x-ndjson"))
+
+        assert exc_info.value.status_code == 400
+
+    def test_resolve_format_rejects_mislabelled_compression(self):
+        with pytest.raises(HTTPException) as exc_info:
+            resolve_format(io.BytesIO(NDJSON), "application/gzip", "books.ndjson.gz")
+
+        assert exc_info.value.status_code == 400
+
+    @pytest.mark.parametrize("content_type, filename", [
+        ("text/plain", None),
+        ("image/png", "books.png"),
+    ])
+    def test_resolve_format_rejects_unknown_types(self, content_type, filename):
+        with pytest.raises(HTTPException) as exc_info:
+            resolve_format(io.BytesIO(b"x"), content_type, filename)
+
+        assert exc_info.value.status_code == 400
+
+    def test_resolve_format_enforces_allowed_file_types(self, monkeypatch):
+        monkeypatch.setattr(settings, "ALLOWED_FILE_TYPES", ["application/json"])
+
+        with pytest.raises(HTTPException) as exc_info:
+            resolve_format(io.BytesIO(gzip.compress(b"title\nA\n")), "text/csv")
+
+        assert exc_info.value.status_code == 400
+        assert "text/csv" in exc_info.value.detail
@@ -1,14 +1,28 @@
+import asyncpg
+import gzip
+import io
+import json
 import pytest
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
 from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+from src.core.settings import settings
+from src.schemas.book import ImportMode
+from src.services.author_resolver import AuthorResolver
 from src.services.import_service import ImportService
 
 
 @pytest.mark.unit
 class TestImportService:
 
+    @pytest.fixture(autouse=True)
+    def inline_validation(self, monkeypatch):
+        monkeypatch.setattr(settings, "IMPORT_VALIDATION_WORKERS", 0)
+
     @pytest.fixture
-    def import_service(self, mock_db_connection):
-        return ImportService(mock_db_connection)
+    def import_service(self):
+        return ImportService(MagicMock())
 
     @pytest.fixture
     def mock_book_repo(self, import_service):
@@ -18,41 +32,213 @@ class TestImportService:
     @pytest.fixture
     def mock_author_repo(self, import_service):
         import_service.author_repo = AsyncMock()
+        import_service.author_resolver = AuthorResolver(import_service.author_repo.upsert_names)
         return import_service.author_repo
 
-    async def test_parse_json_success(self, import_service):
-        json_content = b'[{"title": "Book 1", "published_year": 2023}]'
-
-        result = import_service._parse_json(json_content)
-
-        assert isinstance(result, list)
-        assert len(result) >= 0
-
-    async def test_parse_csv_success(self, import_service):
-        csv_content = b'title,published_year\nBook 1,2023\nBook 2,2024'
-
-        result = import_service._parse_csv(csv_content)
-
-        assert isinstance(result, list)
-        assert len(result) >= 0
-
-    async def test_get_or_create_author_existing(self, import_service, mock_author_repo):
-        author_name = "John Doe"
-        existing_author = {"id": "123", "first_name": "John", "last_name": "Doe"}
-
-        mock_author_repo.search.return_value = [existing_author]
-
-        result = await import_service._get_or_create_author(author_name)
-
-        assert result == "123"
-
-    async def test_get_or_create_author_new(self, import_service, mock_author_repo):
-        author_name = "Jane Smith"
-        new_author = {"id": "456", "first_name": "Jane", "last_name": "Smith"}
-
-        mock_author_repo.search.return_value = []
-        mock_author_repo.create.return_value = new_author
-
-        result = await import_service._get_or_create_author(author_name)
-
-        assert result == "456"
+    async def test_import_from_file_streams_batches(self, import_service, mock_book_repo, monkeypatch):
+        monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 2)
+        mock_book_repo.merge_import_staging.side_effect = lambda first, last, mode: self.merged(last - first + 1)
+        content = b'{"books": [' + b",".join(
+            json.dumps(self.book_row(f"Book {i}")).encode() for i in range(3)
+        ) + b"]}"
+        upload = UploadFile(
+            file=io.BytesIO(content), headers=Headers({"content-type": "application/json"})
+        )
+
+        result = await import_service.import_from_file(upload)
+
+        assert result.success_count == 3
+        batches = [call.args[0] for call in mock_book_repo.copy_to_import_staging.call_args_list]
+        assert [[record[0] for record in batch] for batch in batches] == [[1, 2], [3]]
+
+    async def test_import_from_file_reads_gzipped_ndjson(self, import_service, mock_book_repo):
+        mock_book_repo.merge_import_staging.side_effect = lambda first, last, mode: self.merged(last - first + 1)
+        content = b"".join(json.dumps(self.book_row(f"Book {i}")).encode() + b"\n" for i in range(3))
+        upload = UploadFile(
+            file=io.BytesIO(gzip.compress(content)),
+            filename="books.ndjson.gz",
+            headers=Headers({"content-type": "application/gzip"}),
+        )
+
+        result = await import_service.import_from_file(upload)
+
+        assert result.success_count == 3
+        records = mock_book_repo.copy_to_import_staging.call_args.args[0]
+        assert [record[1] for record in records] == ["Book 0", "Book 1", "Book 2"]
+
+    async def test_import_from_file_rejects_unknown_type(self, import_service):
+        upload = UploadFile(file=io.BytesIO(b""), headers=Headers({"content-type": "text/plain"}))
+
+        with pytest.raises(HTTPException) as exc_info:
+            await import_service.import_from_file(upload)
+
+        assert exc_info.value.status_code == 400
+
+    async def test_bulk_import_resolves_repeated_authors_once(self, import_service, mock_book_repo,
+                                                              mock_author_repo):
+        jane, john = uuid4(), uuid4()
+        mock_author_repo.upsert_names.return_value = [
+            {"id": jane, "first_name": "Jane", "last_name": "Smith"},
+            {"id": john, "first_name": "John", "last_name": "Doe"},
+        ]
+        mock_book_repo.merge_import_staging.return_value = self.merged(4)
+
+        await self.import_rows(import_service, [
+            self.book_row("A", author="Jane Smith"),
+            self.book_row("B", author="  jane   smith "),
+            self.book_row("C", author="John Doe"),
+            self.book_row("D", author="Jane Smith"),
+        ])
+
+        mock_author_repo.upsert_names.assert_awaited_once_with(["Jane", "John"], ["Smith", "Doe"])
+        mock_author_repo.search.assert_not_called()
+        records = mock_book_repo.copy_to_import_staging.call_args.args[0]
+        assert [record[6] for record in records] == [jane, jane, john, jane]
+
+    async def test_bulk_import_resolves_authors_of_valid_rows_only(self, import_service, mock_book_repo,
+                                                                   mock_author_repo):
+        jane = uuid4()
+        mock_author_repo.upsert_names.return_value = [
+            {"id": jane, "first_name": "Jane", "last_name": "Smith"},
+        ]
+        mock_book_repo.merge_import_staging.return_value = self.merged(1)
+
+        result = await self.import_rows(import_service, [
+            self.book_row("A", author="Jane Smith"),
+            self.book_row("B", author="Orphan Author", published_year="1500"),
+        ])
+
+        mock_author_repo.upsert_names.assert_awaited_once_with(["Jane"], ["Smith"])
+        assert result.error_count == 1 and result.errors[0].startswith("Row 2:")
+        records = mock_book_repo.copy_to_import_staging.call_args.args[0]
+        assert [(record[0], record[6]) for record in records] == [(1, jane)]
+
+    async def test_bulk_import_attributes_failed_author_upsert(self, import_service, mock_book_repo,
+                                                               mock_author_repo):
+        mock_author_repo.upsert_names.side_effect = asyncpg.DeadlockDetectedError("deadlock detected")
+        mock_book_repo.merge_import_staging.return_value = self.merged(1)
+
+        result = await self.import_rows(import_service, [
+            self.book_row("A", author="Jane Smith"),
+            self.book_row("B"),
+        ])
+
+        assert result.success_count == 1
+        assert result.errors == ["Row 1: Could not resolve author: deadlock detected"]
+        records = mock_book_repo.copy_to_import_staging.call_args.args[0]
+        assert [record[0] for record in records] == [2]
+
+    @staticmethod
+    async def import_rows(service, rows):
+        return await service._import_batches(service.read_batches(iter(rows)))
+
+    @staticmethod
+    def merged(inserted_count, missing=(), updated_count=0, skipped_count=0):
+        return {
+            "inserted_count": inserted_count,
+            "updated_count": updated_count,
+            "skipped_count": skipped_count,
+            "missing_author_rows": [row for row, _ in missing],
+            "missing_author_ids": [author_id for _, author_id in missing],
+        }
+
+    @staticmethod
+    def book_row(title="Book", **overrides):
+        return {
+            "title": title,
+            "content": "Content long enough",
+            "published_year": "2001",
+            "genre": "Fiction ",
+            **overrides,
+        }
+
+    async def test_bulk_import_copies_valid_rows_and_merges_once(self, import_service, mock_book_repo):
+        mock_book_repo.merge_import_staging.return_value = self.merged(2)
+
+        result = await self.import_rows(import_service, 
+            [self.book_row("Book 1"), self.book_row("Book 2")]
+        )
+
+        assert result.success_count == 2
+        assert result.error_count == 0
+        mock_book_repo.create_import_staging.assert_awaited_once()
+        mock_book_repo.merge_import_staging.assert_awaited_once()
+        mock_book_repo.create.assert_not_called()
+
+        records = mock_book_repo.copy_to_import_staging.call_args.args[0]
+        assert [record[0] for record in records] == [1, 2]
+        assert records[0][1:6] == ("Book 1", "Content long enough", None, 2001, "Fiction")
+
+    async def test_bulk_import_reports_row_errors_in_order(self, import_service, mock_book_repo):
+        missing_author = uuid4()
+        mock_book_repo.merge_import_staging.return_value = self.merged(1, [(3, missing_author)])
+
+        result = await self.import_rows(import_service, [
+            self.book_row("Good"),
+            self.book_row("Bad year", published_year="1500"),
+            self.book_row("Orphan", author_id=str(missing_author)),
+            {"content": "No title at all here"},
+        ])
+
+        assert result.success_count == 1
+        assert result.error_count == 3
+        assert [error.split(":")[0] for error in result.errors] == ["Row 2", "Row 3", "Row 4"]
+        assert str(missing_author) in result.errors[1]
+
+    async def test_bulk_import_copies_in_batches(self, import_service, mock_book_repo, monkeypatch):
+        monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 2)
+        mock_book_repo.merge_import_staging.side_effect = lambda first, last, mode: self.merged(last - first + 1)
+
+        result = await self.import_rows(import_service, [self.book_row(f"Book {i}") for i in range(5)])
+
+        batches = [call.args[0] for call in mock_book_repo.copy_to_import_staging.call_args_list]
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert batches[2][0][0] == 5
+        assert [call.args[:2] for call in mock_book_repo.merge_import_staging.call_args_list] == [
+            (1, 2), (3, 4), (5, 5)
+        ]
+        assert mock_book_repo.clear_import_staging.await_count == 3
+        assert result.success_count == 5
+
+    async def test_bulk_import_bisects_failing_merge(self, import_service, mock_book_repo):
+        bad_row = 6
+
+        def merge(first, last, mode):
+            if first <= bad_row <= last:
+                raise asyncpg.CheckViolationError("new row violates check constraint")
+            return self.merged(last - first + 1)
+
+        mock_book_repo.merge_import_staging.side_effect = merge
+
+        result = await self.import_rows(import_service, [self.book_row(f"Book {i}") for i in range(8)])
+
+        assert result.success_count == 7
+        assert result.errors == ["Row 6: new row violates check constraint"]
+        assert mock_book_repo.merge_import_staging.await_count <= 2 * 3 + 1
+
+    async def test_bulk_import_bisects_failing_copy(self, import_service, mock_book_repo):
+        def copy(records):
+            if any(record[0] in (2, 3) for record in records):
+                raise asyncpg.DataError("value too long")
+
+        mock_book_repo.copy_to_import_staging.side_effect = copy
+        mock_book_repo.merge_import_staging.return_value = self.merged(2)
+
+        result = await self.import_rows(import_service, [self.book_row(f"Book {i}") for i in range(4)])
+
+        assert result.errors == ["Row 2: value too long", "Row 3: value too long"]
+        assert result.success_count == 2
+
+    async def test_bulk_import_reports_updated_and_skipped_rows(self, mock_book_repo):
+        import_service = ImportService(MagicMock(), ImportMode.upsert)
+        import_service.book_repo = mock_book_repo
+        mock_book_repo.merge_import_staging.return_value = self.merged(
+            1, updated_count=1, skipped_count=2
+        )
+
+        result = await self.import_rows(import_service, [self.book_row(f"Book {i}") for i in range(4)])
+
+        assert mock_book_repo.merge_import_staging.await_args.args == (1, 4, ImportMode.upsert)
+        assert result.success_count == 2
+        assert result.updated_count == 1
+        assert result.skipped_count == 2
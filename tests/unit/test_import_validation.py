@@ -0,0 +1,62 @@
+import pytest
+from uuid import uuid4
+from src.services.import_validation import (
+    shutdown_validation_pool,
+    validate_in_pool,
+    validate_rows,
+)
+
+
+def raw_row(title="Book", **overrides):
+    return {
+        "title": title,
+        "content": "Content long enough",
+        "published_year": "2001",
+        "genre": " Fantasy",
+        **overrides,
+    }
+
+
+@pytest.mark.unit
+class TestImportValidation:
+
+    def test_valid_chunk_returns_compact_records(self):
+        author_id = uuid4()
+
+        records, errors = validate_rows([(1, raw_row("A", author_id=author_id)), (2, raw_row("B"))])
+
+        assert errors == []
+        assert records == [
+            (1, "A", "Content long enough", None, 2001, "Fantasy", author_id),
+            (2, "B", "Content long enough", None, 2001, "Fantasy", None),
+        ]
+
+    def test_invalid_rows_are_attributed(self):
+        records, errors = validate_rows([
+            (1, raw_row("Good")),
+            (2, raw_row("Bad genre", genre="Poetry")),
+            (3, {"content": "Missing title"}),
+            (4, raw_row("No year", published_year=None)),
+            (5, "not an object"),
+            (6, raw_row("Also good")),
+        ])
+
+        assert [record[0] for record in records] == [1, 6]
+        assert [row_number for row_number, _ in sorted(errors)] == [2, 3, 4, 5]
+
+    async def test_inline_when_no_workers(self):
+        records, errors = await validate_in_pool([(1, raw_row())], workers=0, chunk_size=10)
+
+        assert len(records) == 1
+        assert errors == []
+
+    async def test_process_pool_keeps_row_order(self):
+        rows = [(i, raw_row(f"Book {i}", published_year="1500" if i % 7 == 0 else "2001"))
+                for i in range(1, 51)]
+        try:
+            records, errors = await validate_in_pool(rows, workers=2, chunk_size=8)
+        finally:
+            shutdown_validation_pool()
+
+        assert [record[0] for record in records] == [i for i in range(1, 51) if i % 7]
+        assert sorted(row_number for row_number, _ in errors) == [7, 14, 21, 28, 35, 42, 49]
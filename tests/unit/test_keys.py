@@ -0,0 +1,132 @@
+import logging
+import os
+import orjson
+import pytest
+from types import SimpleNamespace
+from src.core.keys import KeyRing, KeyStore, load_key_store
+
+
+def write_keys(path, keys, active_kid=None, mtime=None):
+    path.write_bytes(orjson.dumps({"active_kid": active_kid, "keys": keys}))
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+
+
+def key_settings(**overrides):
+    values = {
+        "JWT_KEYS_FILE": None,
+        "JWT_KEYS_RELOAD_SECONDS": 30,
+        "JWT_SIGNING_KEYS": {},
+        "JWT_ACTIVE_KID": None,
+        "SECRET_KEY": None,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.unit
+class TestKeyRing:
+
+    def test_last_key_signs_by_default(self):
+        ring = KeyRing({"2026-04": "old", "2026-10": "new"})
+
+        assert ring.active_kid == "2026-10"
+        assert ring.signing_key == "new"
+        assert ring.get("2026-04") == "old"
+
+    def test_active_kid_must_be_in_ring(self):
+        with pytest.raises(ValueError):
+            KeyRing({"a": "secret"}, active_kid="b")
+
+    def test_empty_ring_is_rejected(self):
+        with pytest.raises(ValueError):
+            KeyRing({})
+
+    def test_from_file(self, tmp_path):
+        path = tmp_path / "keys.json"
+        write_keys(path, {"a": "one", "b": "two"}, active_kid="a")
+
+        ring = KeyRing.from_file(str(path))
+
+        assert ring.active_kid == "a"
+        assert ring.keys == {"a": "one", "b": "two"}
+
+
+@pytest.mark.unit
+class TestKeyStore:
+
+    def test_reloads_changed_file_after_interval(self, tmp_path):
+        path = tmp_path / "keys.json"
+        write_keys(path, {"a": "one"}, mtime=1_000_000_000)
+        clock = FakeClock()
+        reloads = []
+        store = KeyStore(
+            KeyRing.from_file(str(path)), str(path), 30, lambda: reloads.append(1), clock
+        )
+
+        write_keys(path, {"a": "one", "b": "two"}, mtime=2_000_000_000)
+        assert store.current().active_kid == "a"
+
+        clock.now = 30
+        assert store.current().active_kid == "b"
+        assert reloads == [1]
+
+        clock.now = 60
+        store.current()
+        assert reloads == [1]
+
+    def test_broken_file_keeps_current_keys(self, tmp_path, caplog):
+        path = tmp_path / "keys.json"
+        write_keys(path, {"a": "one"}, mtime=1_000_000_000)
+        clock = FakeClock()
+        store = KeyStore(KeyRing.from_file(str(path)), str(path), 30, clock=clock)
+
+        path.write_text("{not json")
+        os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+        clock.now = 30
+
+        assert store.current().get("a") == "one"
+        assert "could not reload" in caplog.text
+
+
+@pytest.mark.unit
+class TestLoadKeyStore:
+
+    def test_key_file_takes_precedence(self, tmp_path):
+        path = tmp_path / "keys.json"
+        write_keys(path, {"file": "secret"})
+
+        store = load_key_store(
+            key_settings(JWT_KEYS_FILE=str(path), JWT_SIGNING_KEYS={"env": "x"})
+        )
+
+        assert store.current().active_kid == "file"
+
+    def test_signing_keys_from_settings(self):
+        store = load_key_store(
+            key_settings(JWT_SIGNING_KEYS={"a": "one", "b": "two"}, JWT_ACTIVE_KID="a")
+        )
+
+        assert store.current().signing_key == "one"
+        assert store.current().get("b") == "two"
+
+    def test_secret_key(self):
+        store = load_key_store(key_settings(SECRET_KEY="secret"))
+
+        assert store.current().keys == {"default": "secret"}
+
+    def test_random_dev_key_warns(self, caplog):
+        with caplog.at_level(logging.WARNING):
+            first = load_key_store(key_settings())
+            second = load_key_store(key_settings())
+
+        assert first.current().signing_key != second.current().signing_key
+        assert "random per-process key" in caplog.text
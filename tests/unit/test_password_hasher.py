@@ -0,0 +1,51 @@
+import asyncio
+import threading
+import pytest
+from fastapi import HTTPException
+from src.core.security import PasswordHasher, pwd_context
+
+
+@pytest.mark.unit
+class TestPasswordHasher:
+
+    @pytest.fixture
+    def hasher(self):
+        hasher = PasswordHasher(workers=2, max_pending=3)
+        yield hasher
+        hasher.shutdown()
+
+    async def test_runs_off_the_event_loop(self, hasher):
+        loop_thread = threading.get_ident()
+
+        thread = await hasher.run(threading.get_ident)
+
+        assert thread != loop_thread
+        assert hasher.stats()["completed"] == 1
+
+    async def test_rejects_beyond_max_pending(self, hasher):
+        release = threading.Event()
+        blocked = [asyncio.ensure_future(hasher.run(release.wait)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+
+        stats = hasher.stats()
+        assert (stats["running"], stats["queued"]) == (2, 1)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await hasher.run(lambda: None)
+
+        assert exc_info.value.status_code == 503
+        release.set()
+        await asyncio.gather(*blocked)
+        assert hasher.stats()["rejected"] == 1
+        assert hasher.stats()["queued"] == 0
+
+    async def test_verify_and_update_rehashes_other_cost(self, hasher):
+        bcrypt = pytest.importorskip("bcrypt")
+        old_hash = bcrypt.hashpw(b"Password123", bcrypt.gensalt(4)).decode()
+
+        valid, new_hash = await hasher.verify_and_update("Password123", old_hash)
+
+        assert valid
+        assert new_hash and pwd_context.verify("Password123", new_hash)
+        assert not pwd_context.needs_update(new_hash)
+        assert await hasher.verify_and_update("wrong", old_hash) == (False, None)
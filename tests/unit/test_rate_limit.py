@@ -0,0 +1,98 @@
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from src.core.rate_limit import RateLimiterMiddleware, SlidingWindowCounter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.unit
+class TestSlidingWindowCounter:
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    def test_limits_within_a_window(self, clock):
+        limiter = SlidingWindowCounter(limit=3, window=60, max_keys=10, clock=clock)
+
+        assert [limiter.hit("a") for _ in range(4)] == [True, True, True, False]
+        assert limiter.hit("b")
+
+    def test_previous_window_is_weighted_by_overlap(self, clock):
+        limiter = SlidingWindowCounter(limit=10, window=60, max_keys=10, clock=clock)
+        for _ in range(10):
+            limiter.hit("a")
+
+        # Halfway into the next window, half of the previous 10 still count
+        clock.now = 90
+        assert sum(limiter.hit("a") for _ in range(10)) == 5
+
+        clock.now = 120
+        assert sum(limiter.hit("a") for _ in range(10)) == 5
+
+    def test_refused_requests_are_not_counted(self, clock):
+        limiter = SlidingWindowCounter(limit=2, window=60, max_keys=10, clock=clock)
+        for _ in range(5):
+            limiter.hit("a")
+
+        clock.now = 60
+        assert sum(limiter.hit("a") for _ in range(5)) == 0
+        clock.now = 119
+        assert limiter.hit("a")
+
+    def test_idle_keys_are_dropped_at_rollover(self, clock):
+        limiter = SlidingWindowCounter(limit=5, window=60, max_keys=10, clock=clock)
+        limiter.hit("a")
+        clock.now = 60
+        limiter.hit("b")
+        assert len(limiter) == 2
+
+        clock.now = 120
+        limiter.hit("b")
+        assert len(limiter) == 2
+
+        clock.now = 240
+        limiter.hit("c")
+        assert len(limiter) == 1
+
+    def test_full_window_evicts_least_recently_seen_key(self, clock):
+        limiter = SlidingWindowCounter(limit=5, window=60, max_keys=2, clock=clock)
+        limiter.hit("a")
+        limiter.hit("b")
+        limiter.hit("a")
+
+        assert limiter.hit("c")
+        assert limiter.evictions == 1
+        assert set(limiter._current) == {"a", "c"}
+
+    def test_flood_of_new_keys_keeps_busy_key_limited(self, clock):
+        limiter = SlidingWindowCounter(limit=5, window=60, max_keys=10, clock=clock)
+
+        busy_allowed = 0
+        for n in range(1000):
+            assert limiter.hit(f"scan-{n}")
+            busy_allowed += limiter.hit("busy")
+
+        assert busy_allowed == 5
+        assert len(limiter) == 10
+
+
+async def test_middleware_returns_429():
+    app = FastAPI()
+    app.add_middleware(RateLimiterMiddleware, max_requests=2, window=60)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        codes = [(await client.get("/ping")).status_code for _ in range(3)]
+
+    assert codes == [200, 200, 429]
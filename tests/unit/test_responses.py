@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+from src.core.responses import ClosingStreamingResponse
+
+
+@pytest.mark.unit
+class TestClosingStreamingResponse:
+
+    async def test_body_is_closed_after_disconnect(self):
+        cleaned_up = []
+
+        async def body():
+            try:
+                while True:
+                    await asyncio.sleep(0)
+                    yield b"chunk"
+            finally:
+                # Cleanup that awaits, like a ROLLBACK, must still complete
+                await asyncio.sleep(0)
+                cleaned_up.append(True)
+
+        sent = []
+
+        async def receive():
+            await asyncio.sleep(0.01)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+            await asyncio.sleep(0)
+
+        response = ClosingStreamingResponse(body())
+        await response({"type": "http"}, receive, send)
+
+        assert cleaned_up == [True]
+        assert sent[0]["type"] == "http.response.start"
+
+    async def test_complete_body_is_sent(self):
+        async def body():
+            yield b"a"
+            yield "b"
+
+        sent = []
+
+        async def receive():
+            await asyncio.Event().wait()
+
+        async def send(message):
+            sent.append(message)
+
+        await ClosingStreamingResponse(body())({"type": "http"}, receive, send)
+
+        assert [message.get("body") for message in sent[1:]] == [b"a", b"b", b""]
+        assert sent[-1]["more_body"] is False
@@ -0,0 +1,140 @@
+import pytest
+from datetime import timedelta
+from unittest.mock import patch
+from uuid import uuid4
+from src.core import security
+from src.core.jwt_backends import BACKENDS, InvalidTokenError, JWTBackend, get_backend
+from src.core.keys import KeyRing, KeyStore
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    security.token_cache.clear()
+    yield
+    security.token_cache.clear()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("name", list(BACKENDS))
+class TestJWTBackends:
+
+    def test_round_trip(self, name):
+        backend = get_backend(name)
+        token = backend.encode({"sub": "abc"}, "secret", "HS256")
+
+        assert backend.decode(token, "secret", ["HS256"])["sub"] == "abc"
+
+    def test_rejects_wrong_key(self, name):
+        backend = get_backend(name)
+        token = backend.encode({"sub": "abc"}, "secret", "HS256")
+
+        with pytest.raises(InvalidTokenError):
+            backend.decode(token, "other", ["HS256"])
+
+    def test_reads_kid_header(self, name):
+        backend = get_backend(name)
+        token = backend.encode({"sub": "abc"}, "secret", "HS256", headers={"kid": "k1"})
+
+        assert backend.get_unverified_header(token)["kid"] == "k1"
+        with pytest.raises(InvalidTokenError):
+            backend.get_unverified_header("not a token")
+
+    def test_tokens_are_interchangeable(self, name):
+        token = get_backend("jose").encode({"sub": "abc"}, "secret", "HS256")
+
+        assert get_backend(name).decode(token, "secret", ["HS256"])["sub"] == "abc"
+
+
+@pytest.mark.unit
+class TestVerifyToken:
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            get_backend("nope")
+
+    def test_incomplete_backend_cannot_be_created(self):
+        class EncodeOnly(JWTBackend):
+            def encode(self, claims, key, algorithm, headers=None):
+                return ""
+
+        with pytest.raises(TypeError):
+            EncodeOnly()
+
+    def test_cached_token_skips_decode(self):
+        user_id = uuid4()
+        token = security.create_access_token({"sub": str(user_id), "username": "reader"})
+
+        first = security.verify_token(token)
+        with patch.object(security.jwt_backend, "decode", side_effect=AssertionError):
+            second = security.verify_token(token)
+
+        assert first.user_id == second.user_id == user_id
+        assert security.token_cache.stats()["hits"] == 1
+
+    def test_cache_entry_expires_with_token(self):
+        token = security.create_access_token(
+            {"sub": str(uuid4())}, expires_delta=timedelta(seconds=60)
+        )
+        security.verify_token(token)
+
+        expires_at, _ = next(iter(security.token_cache._entries.values()))
+        assert expires_at - security.token_cache._clock() <= 60
+
+    def test_invalid_tokens_are_not_cached(self):
+        token = security.create_access_token({"sub": "not-a-uuid"})
+
+        assert security.verify_token(token) is None
+        assert security.verify_token(token + "x") is None
+        assert security.token_cache.stats()["size"] == 0
+
+    def test_expired_token_is_rejected(self):
+        token = security.create_access_token(
+            {"sub": str(uuid4())}, expires_delta=timedelta(seconds=-1)
+        )
+
+        assert security.verify_token(token) is None
+        assert security.token_cache.stats()["size"] == 0
+
+
+@pytest.mark.unit
+class TestKeyRotation:
+
+    @pytest.fixture
+    def use_keys(self, monkeypatch):
+        def use_keys(keys, active_kid=None):
+            monkeypatch.setattr(security, "key_store", KeyStore(KeyRing(keys, active_kid)))
+            security.token_cache.clear()
+        return use_keys
+
+    def test_token_verifies_on_another_worker_with_the_same_keys(self, use_keys):
+        use_keys({"k1": "shared"})
+        token = security.create_access_token({"sub": str(uuid4())})
+
+        # A separate process loads its own KeyStore from the same configuration
+        use_keys({"k1": "shared"})
+
+        assert security.verify_token(token) is not None
+        assert get_backend("jose").get_unverified_header(token)["kid"] == "k1"
+
+    def test_old_key_verifies_after_rotation(self, use_keys):
+        use_keys({"old": "one"})
+        old_token = security.create_access_token({"sub": str(uuid4())})
+
+        use_keys({"old": "one", "new": "two"}, active_kid="new")
+        new_token = security.create_access_token({"sub": str(uuid4())})
+
+        assert security.verify_token(old_token) is not None
+        assert get_backend("jose").get_unverified_header(new_token)["kid"] == "new"
+
+        use_keys({"new": "two"})
+        assert security.verify_token(old_token) is None
+        assert security.verify_token(new_token) is not None
+
+    def test_token_without_known_kid_is_rejected(self, use_keys):
+        use_keys({"k1": "secret"})
+        claims = {"sub": str(uuid4())}
+        no_kid = get_backend("jose").encode(claims, "secret", "HS256")
+        forged_kid = get_backend("jose").encode(claims, "secret", "HS256", headers={"kid": "k2"})
+
+        assert security.verify_token(no_kid) is None
+        assert security.verify_token(forged_kid) is None
@@ -0,0 +1,57 @@
+import pytest
+from unittest.mock import AsyncMock
+from uuid import uuid4
+from src.repositories.user import UserRepository
+from src.schemas.user import UserCreate
+
+USER_DATA = UserCreate(
+    username="NewUser", full_name="New User", email="New@Example.com", password="Password123"
+)
+
+
+def result_row(user_id=None, username_taken=False, email_taken=False):
+    return {
+        "id": user_id,
+        "username": "newuser" if user_id else None,
+        "username_taken": username_taken,
+        "email_taken": email_taken,
+    }
+
+
+@pytest.mark.unit
+class TestCreateUnique:
+
+    @pytest.fixture
+    def repo(self):
+        repo = UserRepository(AsyncMock())
+        repo.fetch_one = AsyncMock()
+        return repo
+
+    async def test_inserts_in_one_statement(self, repo):
+        user_id = uuid4()
+        repo.fetch_one.return_value = result_row(user_id)
+
+        result = await repo.create_unique(USER_DATA, "hashed")
+
+        assert result["user"] == {"id": user_id, "username": "newuser"}
+        repo.fetch_one.assert_awaited_once()
+        query, *args = repo.fetch_one.await_args.args
+        assert "ON CONFLICT DO NOTHING" in query
+        assert args[:2] == ["newuser", "new@example.com"]
+
+    async def test_reports_which_value_is_taken(self, repo):
+        repo.fetch_one.return_value = result_row(email_taken=True)
+
+        result = await repo.create_unique(USER_DATA, "hashed")
+
+        assert result == {"user": None, "username_taken": False, "email_taken": True}
+        repo.fetch_one.assert_awaited_once()
+
+    async def test_retries_conflict_committed_after_snapshot(self, repo):
+        repo.fetch_one.side_effect = [result_row(), result_row(username_taken=True)]
+
+        result = await repo.create_unique(USER_DATA, "hashed")
+
+        assert result["user"] is None
+        assert result["username_taken"]
+        assert repo.fetch_one.await_count == 2